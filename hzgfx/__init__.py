@@ -15,6 +15,8 @@ Graphics Programming Tools
 __version__ = '0.0.0'
 
 
-import cartmap
-import color
+from . import cartmap
+from . import color
+from . import ico
+from . import png
 
@@ -0,0 +1,49 @@
+#=============================================================================
+#
+# Optional Dependencies
+#
+#=============================================================================
+
+"""
+Optional Dependencies
+=====================
+
+Imports the optional dependencies shared by the modules in the package, and
+provides the helpers the batch (array) interfaces share.  NumPy is only
+needed by the batch interfaces, so it is set to `None` when it is not
+installed.
+"""
+
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+__version__ = '0.0.0'
+
+
+#=============================================================================
+def require_numpy( feature ):
+    """
+    Ensures NumPy is available before using one of the array interfaces.
+
+    @param feature The name of the feature requiring NumPy
+    @throws        ImportError if NumPy is not installed
+    """
+    if numpy is None:
+        raise ImportError( '{} requires NumPy.'.format( feature ) )
+
+
+#=============================================================================
+def round_nearest( values, out = None ):
+    """
+    Rounds an array of values to the nearest integer using the same "round
+    half to even" rule as the built-in `round()`.
+
+    @param values The array of values to round
+    @param out    Optional array to receive the rounded values
+    @return       The array of rounded (floating-point) values
+    """
+    return numpy.rint( values, out = out )
@@ -69,10 +69,16 @@ Cartesian Coordinate Mapping
 """
 
 
+import array
 import collections
 import math
+import multiprocessing
+import numbers
 
-import interval
+from ._optional import numpy
+from ._optional import require_numpy as _require_numpy
+from ._optional import round_nearest as _round_nearest
+from . import interval
 
 
 __version__ = '0.0.0'
@@ -84,6 +90,9 @@ AXIS_NONE       = 0
 AXIS_HORIZONTAL = 1
 AXIS_VERTICAL   = 2
 AXIS_BOTH       = ( AXIS_HORIZONTAL | AXIS_VERTICAL )
+FIT_STRETCH     = 0
+FIT_CONTAIN     = 1
+FIT_COVER       = 2
 
 
 #=============================================================================
@@ -93,6 +102,378 @@ Point     = collections.namedtuple( 'Point',     ( 'x', 'y' ) )
 Line      = collections.namedtuple( 'Line',      ( 'a', 'b' ) )
 
 
+#=============================================================================
+# A rectangular tile of coordinates within a plane:  `rows` and `columns` are
+# slices of the plane's grid of positions, and `x` and `y` are the coordinate
+# arrays for every position in the tile.
+Tile = collections.namedtuple( 'Tile', ( 'rows', 'columns', 'x', 'y' ) )
+
+
+#=============================================================================
+def _array_view( buffer ):
+    """
+    Creates a writable NumPy view onto an output buffer without copying it.
+
+    @param buffer A NumPy array, array.array, or other writable object
+                  supporting the buffer protocol
+    @return       A NumPy array sharing memory with the buffer
+    @throws       ValueError if the buffer can not be written
+    """
+    if isinstance( buffer, numpy.ndarray ):
+        view = buffer
+    elif isinstance( buffer, array.array ):
+        view = numpy.frombuffer( buffer, dtype = buffer.typecode )
+    else:
+        view = numpy.asarray( buffer )
+    if view.flags.writeable == False:
+        raise ValueError( 'Unable to write to read-only output buffer.' )
+    return view
+
+
+#=============================================================================
+def _extreme_array( planes ):
+    """
+    Arranges the extremes of a batch of planes into an (N,4) array.
+
+    @param planes A Plane, a sequence of Planes, or an (N,4) array of the
+                  (left,top,right,bottom) extremes of each plane
+    @return       An (N,4) array of floating-point extremes
+    @throws       ValueError if the extremes can not be arranged as
+                  (left,top,right,bottom) rows
+    """
+    if isinstance( planes, Plane ):
+        planes = ( planes, )
+    if hasattr( planes, '__len__' ) == False:
+        planes = list( planes )
+    if ( len( planes ) > 0 ) and isinstance( planes[ 0 ], Plane ):
+        planes = [
+            ( plane.left, plane.top, plane.right, plane.bottom )
+            for plane in planes
+        ]
+    extremes = numpy.asarray( planes, dtype = float )
+    if extremes.size == 0:
+        extremes = extremes.reshape( ( 0, 4 ) )
+    if ( extremes.ndim != 2 ) or ( extremes.shape[ 1 ] != 4 ):
+        raise ValueError(
+            'Unable to use extremes with shape {}.'.format( extremes.shape )
+        )
+    return extremes
+
+
+#=============================================================================
+def _fit_align( align ):
+    """
+    Checks and normalizes the alignment of a fitted plane.
+
+    @param align The (x,y) fractions of the unused (or cropped) space placed
+                 before the plane on each axis, or a number for both axes
+    @return      A two-tuple of horizontal and vertical fractions
+    """
+    if isinstance( align, numbers.Number ):
+        return ( float( align ), float( align ) )
+    return ( float( align[ 0 ] ), float( align[ 1 ] ) )
+
+
+#=============================================================================
+def _is_axis_pair( points ):
+    """
+    Tests a batch of points to see if it is given as separate arrays of
+    horizontal and vertical coordinates.
+
+    @param points The batch of points to test
+    @return       True if the points are given as a two-tuple of 1-D arrays
+    """
+    return isinstance( points, tuple ) \
+       and ( len( points ) == 2 ) \
+       and all(
+           ( isinstance( axis, ( tuple, list ) ) == False )
+           and ( numpy.ndim( axis ) == 1 )
+           for axis in points
+       )
+
+
+#=============================================================================
+def _lattice_axis( axis, line ):
+    """
+    Aligns the positions of a plane's axis to a lattice of evenly-spaced
+    positions anchored at zero (used to share tiles between views).
+
+    @param axis The Interval of the axis
+    @param line The Line that maps axis coordinates to lattice coordinates
+    @return     A tuple of the lattice's positive step, the lattice's phase
+                (the offset from zero as a fraction of the step), the lattice
+                index of the lowest position, the number of positions, and
+                True if the positions descend along the axis
+    """
+    values = axis.values().astype( float ) * line.a + line.b
+    step   = abs( float( axis.step ) * line.a )
+    count  = len( values )
+    index  = values.min() / step
+    low    = int( round( index ) )
+    phase  = round( index - low, 6 )
+    if phase == -0.5:
+        phase, low = 0.5, low - 1
+    descending = ( count > 1 ) and ( values[ -1 ] < values[ 0 ] )
+    return step, phase, low, count, descending
+
+
+#=============================================================================
+def _lattice_match( first, count, lattice, other ):
+    """
+    Finds the positions of a run of lattice indices that coincide with the
+    positions of another lattice.  Only lattices whose steps are integer
+    multiples of each other are considered.
+
+    @param first   The first lattice index of the run
+    @param count   The number of lattice indices in the run
+    @param lattice The ( step, phase ) of the run's lattice
+    @param other   The ( step, phase ) of the other lattice
+    @return        A two-tuple of arrays of the matching offsets within the
+                   run, and the matching indices of the other lattice;  None
+                   if no positions coincide
+    """
+    ratio = max( lattice[ 0 ], other[ 0 ] ) / min( lattice[ 0 ], other[ 0 ] )
+    if abs( ratio - round( ratio ) ) > 1e-9:
+        return None
+    index   = numpy.arange( first, first + count ) + lattice[ 1 ]
+    index   = index * ( lattice[ 0 ] / other[ 0 ] ) - other[ 1 ]
+    nearest = numpy.round( index )
+    match   = numpy.abs( index - nearest ) < 1e-6
+    if match.any() == False:
+        return None
+    return numpy.nonzero( match )[ 0 ], nearest[ match ].astype( numpy.int64 )
+
+
+#=============================================================================
+def _point_array( points ):
+    """
+    Arranges a batch of points into an (N,2) array of coordinates.
+
+    @param points The points as an (N,2) array, a two-tuple of 1-D arrays of
+                  horizontal and vertical coordinates, or any iterable of
+                  Points or two-tuples
+    @return       An (N,2) array of floating-point coordinates
+    @throws       ValueError if the points can not be arranged as (x,y)
+                  coordinate pairs
+    """
+
+    # Separate arrays for each axis.
+    if _is_axis_pair( points ):
+        source = numpy.empty( ( len( points[ 0 ] ), 2 ) )
+        source[ :, 0 ] = points[ 0 ]
+        source[ :, 1 ] = points[ 1 ]
+        return source
+
+    # Arrays and sequences of points.
+    if hasattr( points, '__len__' ) == False:
+        points = list( points )
+    source = numpy.asarray( points, dtype = float )
+    if source.size == 0:
+        source = source.reshape( ( 0, 2 ) )
+    if ( source.ndim != 2 ) or ( source.shape[ 1 ] != 2 ):
+        raise ValueError(
+            'Unable to use points with shape {}.'.format( source.shape )
+        )
+    return source
+
+
+#=============================================================================
+def _round_axes( target, nearest ):
+    """
+    Rounds the requested axes of an (N,2) array of points to the nearest
+    integer.
+
+    @param target  The (N,2) array of points to round (modified in place)
+    @param nearest True to round both axes, or a (bool,bool) two-tuple to
+                   indicate rounding per axis
+    @return        The rounded array of points; the array has an integer
+                   type when both axes are rounded
+    """
+    if isinstance( nearest, ( tuple, list ) ):
+        nearx, neary = nearest[ 0 : 2 ]
+    else:
+        nearx, neary = nearest, nearest
+    if nearx and neary:
+        return _round_nearest( target ).astype( int )
+    if nearx:
+        _round_nearest( target[ :, 0 ], out = target[ :, 0 ] )
+    if neary:
+        _round_nearest( target[ :, 1 ], out = target[ :, 1 ] )
+    return target
+
+
+#=============================================================================
+def _complex_grid( x, y ):
+    """
+    Combines arrays of real and imaginary parts into complex values.
+
+    @param x The array of real parts
+    @param y The array of imaginary parts (broadcast against the real parts)
+    @return  An array of complex values
+    """
+    real, imag = numpy.broadcast_arrays( x, y )
+    z = numpy.empty( real.shape, dtype = complex )
+    z.real = real
+    z.imag = imag
+    return z
+
+
+#=============================================================================
+def _escape_time( z, c, func, limit, radius ):
+    """
+    Counts the iterations needed for complex values to escape a radius.
+
+    @param z      The array of starting values
+    @param c      The constant added after squaring:  an array with the shape
+                  of `z`, a scalar, or None when using a function
+    @param func   The function to iterate, or None to iterate `z = z * z + c`
+    @param limit  The maximum number of iterations
+    @param radius The magnitude that a value must exceed to escape
+    @return       An integer array of the number of iterations before each
+                  value escaped (`limit` for values that never escape)
+    """
+    counts = numpy.empty( z.shape, dtype = numpy.int32 )
+    counts.fill( limit )
+    flat   = counts.reshape( -1 )
+    index  = numpy.arange( z.size )
+    z      = z.reshape( -1 ).copy()
+    varies = isinstance( c, numpy.ndarray )
+    if varies:
+        c = c.reshape( -1 )
+    bound  = radius * radius
+    for count in range( limit ):
+
+        # Remove escaped values from the working arrays.
+        escaped = ( z.real * z.real + z.imag * z.imag ) > bound
+        if escaped.any():
+            flat[ index[ escaped ] ] = count
+            remain = numpy.logical_not( escaped )
+            index  = index[ remain ]
+            z      = z[ remain ]
+            if varies:
+                c = c[ remain ]
+            if len( index ) == 0:
+                break
+
+        # Iterate the remaining values.
+        if func is None:
+            z *= z
+            z += c
+        else:
+            z = func( z )
+    return counts
+
+
+#=============================================================================
+# Per-process state of workers evaluating functions over planes
+_evaluate_state = {}
+
+
+#=============================================================================
+def _evaluate_init( func, buffer, dtype, shape, xvalues, yvalues ):
+    """
+    Initializes a worker process for evaluating functions over planes.
+
+    @param func    The function to evaluate
+    @param buffer  The shared-memory result buffer
+    @param dtype   The data type string of the result
+    @param shape   The (h,w) shape of the result
+    @param xvalues The horizontal axis values
+    @param yvalues The vertical axis values
+    """
+    _evaluate_state.update(
+        func    = func,
+        result  = _shared_view( buffer, dtype, shape ),
+        xvalues = xvalues,
+        yvalues = yvalues
+    )
+
+
+#=============================================================================
+def _evaluate_region( func, result, xvalues, yvalues, region ):
+    """
+    Evaluates a function over one tile of a plane.
+
+    @param func    The function to evaluate
+    @param result  The array receiving the results for the entire plane
+    @param xvalues The horizontal axis values
+    @param yvalues The vertical axis values
+    @param region  The ( rows, columns ) slices of the tile
+    """
+    rows, columns = region
+    x, y = numpy.meshgrid( xvalues[ columns ], yvalues[ rows ] )
+    result[ rows, columns ] = func( x, y )
+
+
+#=============================================================================
+def _evaluate_tile( region ):
+    """
+    Evaluates a function over one tile of a plane in a worker process.
+
+    @param region The ( rows, columns ) slices of the tile
+    """
+    state = _evaluate_state
+    _evaluate_region(
+        state[ 'func' ],
+        state[ 'result' ],
+        state[ 'xvalues' ],
+        state[ 'yvalues' ],
+        region
+    )
+
+
+#=============================================================================
+def _shared_view( buffer, dtype, shape ):
+    """
+    Creates a NumPy array that uses a shared-memory buffer.
+
+    @param buffer The shared-memory buffer (e.g. `multiprocessing.RawArray`)
+    @param dtype  The data type of the array
+    @param shape  The shape of the array
+    @return       An array sharing memory with the buffer
+    """
+    count = 1
+    for size in shape:
+        count *= size
+    view = numpy.frombuffer( buffer, dtype = dtype, count = count )
+    return view.reshape( shape )
+
+
+#=============================================================================
+def _tile_regions( shape, tile ):
+    """
+    Generates the regions of each tile covering a grid, in row-major order.
+
+    @param shape The (h,w) shape of the grid
+    @param tile  The maximum (w,h) dimensions of each tile, or a number for
+                 square tiles
+    @return      A generator of ( rows, columns ) slices for each tile
+    @throws      ValueError if the tile dimensions are not positive
+    """
+    width, height = _tile_size( tile )
+    for top in range( 0, shape[ 0 ], height ):
+        rows = slice( top, min( top + height, shape[ 0 ] ) )
+        for left in range( 0, shape[ 1 ], width ):
+            yield ( rows, slice( left, min( left + width, shape[ 1 ] ) ) )
+
+
+#=============================================================================
+def _tile_size( tile ):
+    """
+    Checks and normalizes the dimensions of a tile.
+
+    @param tile The (w,h) dimensions of a tile, or a number for square tiles
+    @return     A Dimension of the tile's width and height
+    @throws     ValueError if the tile dimensions are not positive
+    """
+    if isinstance( tile, numbers.Number ):
+        tile = ( tile, tile )
+    size = Dimension( int( tile[ 0 ] ), int( tile[ 1 ] ) )
+    if ( size.w < 1 ) or ( size.h < 1 ):
+        raise ValueError( 'Invalid tile dimensions: {}'.format( tile ) )
+    return size
+
+
 #=============================================================================
 class LinearMap( object ):
     """
@@ -123,6 +504,8 @@ class LinearMap( object ):
             raise ValueError( 'Target interval must have non-zero domain.' )
 
         # Initialize the clip and fill boundaries.
+        self._clip = None
+        self._fill = None
         self.set_clip( clip )
         self.set_fill( fill )
 
@@ -141,6 +524,64 @@ class LinearMap( object ):
         return self.translate( point )
 
 
+    #=========================================================================
+    def __matmul__( self, other ):
+        """
+        Supports composition through the matrix multiplication operator.
+
+        @param other The LinearMap applied before this map
+        @return      A new LinearMap instance for the composed mapping
+        """
+        if isinstance( other, LinearMap ) == False:
+            return NotImplemented
+        return self.compose( other )
+
+
+    #=========================================================================
+    def compose( self, other ):
+        """
+        Composes this map with another map into a single, precomputed map.
+
+        The composed map translates from the other map's source interval to
+        this map's target interval.  The combined scaling is kept as the
+        clipping interval of the new map (the image of the source interval in
+        the target interval).
+
+        @param other The LinearMap applied before this map
+        @return      A new LinearMap instance that applies `other`, then this
+                     map
+        @throws      TypeError if the other map is not a LinearMap
+        """
+        if isinstance( other, LinearMap ) == False:
+            raise TypeError(
+                'Unable to compose with {}.'.format( type( other ) )
+            )
+        a = self._map.a * other._map.a
+        b = self._map.a * other._map.b + self._map.b
+        start = other.source.start
+        stop  = other.source.stop
+        clip  = interval.RealInterval( a * start + b, a * stop + b )
+        return LinearMap( other.source, self.target, clip = clip )
+
+
+    #=========================================================================
+    def inverse( self ):
+        """
+        Creates the inverse of this map.
+
+        The inverse translates from the target interval back to the source
+        interval.  Clipping and filling trade places in the inverse map.
+
+        @return A new LinearMap instance that undoes this map
+        """
+        return LinearMap(
+            self.target,
+            self.source,
+            clip = self._fill,
+            fill = self._clip
+        )
+
+
     #=========================================================================
     def set_clip( self, clip = None ):
         """
@@ -198,15 +639,79 @@ class LinearMap( object ):
 
 
     #=========================================================================
-    def translate( self, point ):
+    def mask( self, point, out = None ):
+        """
+        Tests which points from the source axis land within the target
+        interval once they are translated.
+
+        Points that are translated outside of the target interval are those
+        that would be clipped (missing) from the output.
+
+        @param point A point in the source interval, or an array, array.array
+                     or memoryview of points in the source interval
+        @param out   Optional, preallocated boolean array to receive the mask
+        @return      True (or an array of booleans) for each point that lands
+                     within the target interval
+        @throws      ImportError if given arrays and NumPy is not installed
+        """
+
+        # Single point test.
+        if ( out is None ) and isinstance( point, numbers.Number ):
+            return self.translate( point ) in self.target
+
+        # Translate the batch of points, and test all of them at once.
+        _require_numpy( 'LinearMap.mask()' )
+        if out is not None:
+            out = _array_view( out )
+        return self.target.contains_many( self.translate( point ), out )
+
+
+    #=========================================================================
+    def translate( self, point, out = None, missing = None ):
         """
         Translates a point from an independent point on a source axis to a
         dependent point on a target axis.
 
-        @param point A point in the source interval
-        @return      The corresponding point in the target interval
+        When given an array of points, the entire array is translated in a
+        single vectorized pass.  Arrays can be NumPy arrays, or anything that
+        supports the buffer protocol (array.array, memoryview, etc).
+
+        @param point   A point in the source interval, or an array of points
+                       in the source interval
+        @param out     Optional, preallocated array, array.array or
+                       memoryview to receive the translated points
+        @param missing If given, points that are translated outside of the
+                       target interval are replaced with this value
+        @return        The corresponding point (or array of points) in the
+                       target interval;  When `out` is given, it is returned
+        @throws        ImportError if given arrays and NumPy is not installed
+        @throws        ValueError if the `out` buffer is not writable
         """
-        return self._map.a * point + self._map.b
+
+        # Single point translation.
+        if ( out is None ) and isinstance( point, numbers.Number ):
+            result = self._map.a * point + self._map.b
+            if ( missing is not None ) and ( result not in self.target ):
+                return missing
+            return result
+
+        # Translate all points in place within the output array.
+        _require_numpy( 'LinearMap.translate()' )
+        values = numpy.asarray( point )
+        if out is None:
+            result = numpy.multiply( values, self._map.a )
+        else:
+            result = _array_view( out )
+            numpy.multiply( values, self._map.a, out = result )
+        numpy.add( result, self._map.b, out = result )
+
+        # Replace all points outside the target interval.
+        if missing is not None:
+            inside = self.target.contains_many( result )
+            result[ numpy.logical_not( inside ) ] = missing
+
+        # Give the caller back their own buffer.
+        return result if out is None else out
 
 
     #=========================================================================
@@ -267,9 +772,43 @@ class LinearMap( object ):
 class Plane( object ):
     """
     Models a Cartesian coordinate plane.
+
+    Planes are immutable.  The following attributes are available (short
+    aliases are given after each name).  Single values are computed once
+    when the plane is created, and pairs of values are built from them.
+
+    aspect         The dx/dy aspect ratio (can be negative)
+    bottom|b       The bottom vertical extreme
+    delta|d        The (dx,dy) difference between extremes
+    deltax|dx      The difference between horizontal extremes
+    deltay|dy      The difference between veritcal extremes
+    dimensions|dim The (w,h) dimensions of the plane
+    height|h       The number of coordinates on the vertical axis
+    left|l         The left horizontal extreme
+    lefttop|lt     The (x,y) coordinate of the top-left extreme
+    right|r        The right horizontal extreme
+    rightbot|rb    The (x,y) coordinate of the bottom-right extreme
+    top|t          The top veritical extreme
+    width|w        The number of coordinates on the horizontal axis
     """
 
 
+    #=========================================================================
+    # Instances only store the axes, and values derived from the axes.
+    __slots__ = (
+        '_x',
+        '_y',
+        'bottom',
+        'deltax',
+        'deltay',
+        'height',
+        'left',
+        'right',
+        'top',
+        'width'
+    )
+
+
     #=========================================================================
     def __init__(
         self,
@@ -296,10 +835,6 @@ class Plane( object ):
             The default step is 1.
         """
 
-        # Coordinate and dimension constructors
-        self._cmake = Point
-        self._dmake = Dimension
-
         # Determine the step values.
         if isinstance( step, ( tuple, list ) ):
             xstep, ystep = step[ 0 : 2 ]
@@ -330,188 +865,826 @@ class Plane( object ):
             right, bot = rightbot[ 0 : 2 ]
 
         # Create the axes.
-        self._x = interval.Interval( left, right, xstep )
-        self._y = interval.Interval( top, bot, ystep )
-
-
-    #=========================================================================
-    def __getattr__( self, name ):
-        """
-        Procedurally-generated attributes.
-
-        aspect         The dx/dy aspect ratio (can be negative)
-        bottom|b       The bottom vertical extreme
-        delta|d        The (dx,dy) difference between extremes
-        deltax|dx      The difference between horizontal extremes
-        deltay|dy      The difference between veritcal extremes
-        dimensions|dim The (w,h) dimensions of the plane
-        height|h       The number of coordinates on the vertical axis
-        left|l         The left horizontal extreme
-        lefttop|lt     The (x,y) coordinate of the top-left extreme
-        right|r        The right horizontal extreme
-        rightbot|rb    The (x,y) coordinate of the bottom-right extreme
-        top|t          The top veritical extreme
-        width|w        The number of coordinates on the horizontal axis
-
-        @param name The name of the attribute to retrieve
-        @return     The value of the requested attribute
-        @throws     AttributeError if the attribute is invalid
-        """
-        if name == 'aspect':
-            return self._x.delta / self._y.delta
-        elif ( name == 'bottom' ) or ( name == 'b' ):
-            return self._y.stop
-        elif ( name == 'delta' ) or ( name == 'd' ):
-            return self._dmake( self._x.delta, self._y.delta )
-        elif ( name == 'deltax' ) or ( name == 'dx' ):
-            return self._x.delta
-        elif ( name == 'deltay' ) or ( name == 'dy' ):
-            return self._y.delta
-        elif ( name == 'dimensions' ) or ( name == 'dim' ):
-            return self._dmake( len( self._x ), len( self._y ) )
-        elif ( name == 'height' ) or ( name == 'h' ):
-            return len( self._y )
-        elif ( name == 'left' ) or ( name == 'l' ):
-            return self._x.start
-        elif ( name == 'lefttop' ) or ( name == 'lt' ):
-            return self._cmake( self._x.start, self._y.start )
-        elif ( name == 'right' ) or ( name == 'r' ):
-            return self._x.stop
-        elif ( name == 'rightbot' ) or ( name == 'rb' ):
-            return self._cmake( self._x.stop, self._y.stop )
-        elif ( name == 'top' ) or ( name == 't' ):
-            return self._y.start
-        elif ( name == 'width') or ( name == 'w' ):
-            return len( self._x )
-        raise AttributeError( 'Unknown attribute: {}'.format( name ) )
+        xaxis = interval.Interval( left, right, xstep )
+        yaxis = interval.Interval( top, bot, ystep )
+
+        # Set the axes and derived values.
+        setter = object.__setattr__
+        setter( self, '_x', xaxis )
+        setter( self, '_y', yaxis )
+        setter( self, 'bottom', yaxis.stop )
+        setter( self, 'deltax', xaxis.delta )
+        setter( self, 'deltay', yaxis.delta )
+        setter( self, 'height', len( yaxis ) )
+        setter( self, 'left', xaxis.start )
+        setter( self, 'right', xaxis.stop )
+        setter( self, 'top', yaxis.start )
+        setter( self, 'width', len( xaxis ) )
 
 
     #=========================================================================
-    def __str__( self ):
+    def __delattr__( self, name ):
         """
-        Produces a string representation of the Cartesian plane.
+        Prevents deleting attributes.
+        """
+        raise AttributeError( 'Planes can not be modified.' )
 
-        @return A string representation of the Cartesian plane
+
+    #=========================================================================
+    def __eq__( self, other ):
         """
-        return 'X := {} / Y := {}'.format( self._x, self._y )
+        Tests two planes for equality.
 
+        @param other The other plane
+        @return      True if both planes are the same type, and have the same
+                     axes
+        """
+        if type( self ) is not type( other ):
+            return NotImplemented
+        return ( self._x == other._x ) and ( self._y == other._y )
 
-#=============================================================================
-class ComplexPlane( Plane ):
-    """
-    Extends the Cartesian Coordinate Plane class to support complex numbers.
-    """
-    ### ZIH
-    pass
 
+    #=========================================================================
+    def __hash__( self ):
+        """
+        Produces a hash value consistent with plane equality.
 
-#=============================================================================
-class Map( object ):
-    """
-    Models coordinate mapping between two planes.
-    """
+        @return The hash value of the plane
+        """
+        return hash( ( type( self ), self._x, self._y ) )
 
 
     #=========================================================================
-    def __init__( self, horizontal = None, vertical = None ):
+    def __ne__( self, other ):
         """
-        Initializes a Map object.
+        Tests two planes for inequality.
 
-        Note: Linear map coefficients are given as two-tuples or Line named
-        tuples where the first item is the straight-line slope, and the second
-        item is the straight-line intercept.
+        @param other The other plane
+        @return      True if the planes are not equal
+        """
+        result = self.__eq__( other )
+        if result is NotImplemented:
+            return result
+        return not result
 
-        @param horizontal Linear map coefficients from horizontal coordinates
-                          from an source plane to a target plane.  When not
-                          specified, the map defaults to a 1:1 scaled map with
-                          matching origins.
-        @param vertical   Same as `horizontal`, but for the vertical axis
+
+    #=========================================================================
+    def __reduce__( self ):
         """
-        if horizontal is None:
-            self.horizontal = Line( 1.0, 0.0 )
-        else:
-            self.horizontal = Line( *horizontal )
-        if vertical is None:
-            self.vertical = Line( 1.0, 0.0 )
-        else:
-            self.vertical = Line( *vertical )
+        Supports pickling and copying immutable planes.
+
+        @return The information needed to recreate the plane
+        """
+        return (
+            type( self ),
+            ( self.lefttop, self.rightbot, ( self._x.step, self._y.step ) )
+        )
 
 
     #=========================================================================
-    @staticmethod
-    def map_extremes( source, target ):
+    def __setattr__( self, name, value ):
         """
-        Creates new map objects based on the extremes of two planes.
+        Prevents changing attributes.
+        """
+        raise AttributeError( 'Planes can not be modified.' )
 
-        @param source The source plane for mapping requests
-        @param target The target plane for mapping requests
-        @return       A new Map instance for scaled coordinate mapping
+
+    #=========================================================================
+    def __str__( self ):
         """
-        xslope     = target.deltax / float( source.deltax )
-        xintercept = target.left - xslope * source.left
-        yslope     = target.deltay / float( source.deltay )
-        yintercept = target.left - yslope * source.left
-        return Map( ( xslope, xintercept ), ( yslope, yintercept ) )
+        Produces a string representation of the Cartesian plane.
+
+        @return A string representation of the Cartesian plane
+        """
+        return 'X := {} / Y := {}'.format( self._x, self._y )
 
 
     #=========================================================================
-    @staticmethod
-    def map_clipped( source, target, fixed = AXIS_HORIZONTAL ):
+    @property
+    def aspect( self ):
         """
-        Creates new map objects that clip the source plane within the
-        boundaries of the target plane.
+        The dx/dy aspect ratio (can be negative).
+        """
+        return self.deltax / self.deltay
 
-        Clipping assumes one dimension is fixed, and the other is scaled
-        assuming each point in the planes map with an equal aspect ratio.
 
-        @param source The source plane for mapping requests
-        @param target The target plane for mapping requests
-        @return       A new Map instance for clipped coordinate mapping
+    #=========================================================================
+    @property
+    def delta( self ):
         """
+        The (dx,dy) difference between extremes.
+        """
+        return Dimension( self.deltax, self.deltay )
 
-        # Clip the horizontal axis with respect to the vertical axis.
-        if fixed == AXIS_VERTICAL:
-            ### ZIH
-            pass
 
-        # Clip the vertical axis with respect to the horizontal axis.
-        else:
+    #=========================================================================
+    @property
+    def dimensions( self ):
+        """
+        The (w,h) dimensions of the plane.
+        """
+        return Dimension( self.width, self.height )
 
-            # Determine new total height of the target plane.
-            theight = source.deltay \
-                    * float( target.deltax ) / float( source.deltax )
 
-            # Determine the vertical middle point of the target plane.
-            mid = target.top + target.deltay / 2.0
+    #=========================================================================
+    @property
+    def lefttop( self ):
+        """
+        The (x,y) coordinate of the top-left extreme.
+        """
+        return Point( self.left, self.top )
 
-            # Determine new top vertical extreme for the target plane.
-            ytop = mid - theight / 2.0
 
-            # Determine slope and intercept for the vertical axis mapping.
-            yslope     = theight / float( source.deltay )
-            yintercept = ytop - yslope * source.top
+    #=========================================================================
+    @property
+    def rightbot( self ):
+        """
+        The (x,y) coordinate of the bottom-right extreme.
+        """
+        return Point( self.right, self.bottom )
 
-            # Determine the mapping for the fixed axis.
-            xslope     = target.deltax / float( source.deltax )
-            xintercept = target.left - xslope * source.left
 
-            # Create Map object with adjusted vertical axis.
-            return Map( ( xslope, xintercept ), ( yslope, yintercept ) )
+    #=========================================================================
+    def chunks( self, tile = ( 256, 256 ), sparse = False ):
+        """
+        Generates the coordinates of the plane one rectangular tile at a time.
+
+        Only the coordinates of the current tile are produced, so planes of
+        any size can be walked in bounded memory.  Tiles are generated in
+        row-major order, and tiles along the right and bottom edges may be
+        smaller than the requested size.
+
+        @param tile   The maximum (w,h) dimensions of each tile, or a number
+                      for square tiles
+        @param sparse Set to produce a (1,w) array of horizontal coordinates,
+                      and an (h,1) array of vertical coordinates for each
+                      tile instead of full (h,w) arrays (the arrays still
+                      broadcast against each other)
+        @return       A generator of Tile objects
+        @throws       ImportError if NumPy is not installed
+        @throws       ValueError if the tile dimensions are not positive
+        """
+        _require_numpy( 'Plane.chunks()' )
+        xvalues = self._x.values()
+        yvalues = self._y.values()
+        shape   = ( len( yvalues ), len( xvalues ) )
+        for rows, columns in _tile_regions( shape, tile ):
+            x, y = numpy.meshgrid(
+                xvalues[ columns ],
+                yvalues[ rows ],
+                sparse = sparse
+            )
+            yield Tile( rows, columns, x, y )
 
 
     #=========================================================================
-    def translate( self, point = None, nearest = False ):
+    def evaluate(
+        self,
+        func,
+        workers  = 1,
+        tile     = ( 256, 256 ),
+        dtype    = float,
+        progress = None,
+        cancel   = None
+    ):
         """
-        Translates a source point into a target point.
+        Evaluates a function at every position in the plane.
+
+        The plane is split into tiles (see: `chunks()`), and the function is
+        called once per tile with the tile's (h,w) arrays of horizontal and
+        vertical coordinates.  It must return an array (or scalar) that
+        broadcasts to the shape of the tile.
+
+        With more than one worker, tiles are evaluated by a pool of processes
+        that write directly into a shared-memory result buffer.  The function
+        must then be picklable (e.g. a module-level function).
+
+        @param func     The function to evaluate as `func( x, y )`
+        @param workers  The number of worker processes;  1 evaluates all
+                        tiles in this process, and 0 uses one worker per CPU
+        @param tile     The maximum (w,h) dimensions of each tile, or a number
+                        for square tiles
+        @param dtype    The NumPy data type of the result
+        @param progress Optional function called as `progress( done, total )`
+                        after each tile is evaluated
+        @param cancel   Optional event (e.g. `threading.Event`) that aborts
+                        the evaluation when it is set
+        @return         An (h,w) array of the results where rows follow the
+                        vertical axis, and columns follow the horizontal axis;
+                        None if the evaluation was canceled
+        @throws         ImportError if NumPy is not installed
+        @throws         ValueError if the tile dimensions are not positive
+        """
+        _require_numpy( 'Plane.evaluate()' )
+        xvalues = self._x.values()
+        yvalues = self._y.values()
+        shape   = ( len( yvalues ), len( xvalues ) )
+        regions = list( _tile_regions( shape, tile ) )
+        total   = len( regions )
+        dtype   = numpy.dtype( dtype )
+        if workers == 0:
+            workers = multiprocessing.cpu_count()
+
+        # Evaluate small jobs in this process.
+        if ( workers <= 1 ) or ( total <= 1 ):
+            result = numpy.empty( shape, dtype = dtype )
+            for done, region in enumerate( regions, 1 ):
+                if ( cancel is not None ) and cancel.is_set():
+                    return None
+                _evaluate_region( func, result, xvalues, yvalues, region )
+                if progress is not None:
+                    progress( done, total )
+            return result
+
+        # Allocate the result in shared memory so workers can write their
+        # tiles into it directly.
+        size   = max( 1, shape[ 0 ] * shape[ 1 ] * dtype.itemsize )
+        buffer = multiprocessing.RawArray( 'b', size )
+        result = _shared_view( buffer, dtype, shape )
+
+        # Hand out tiles, and wait for them to finish in any order.
+        pool = multiprocessing.Pool(
+            min( workers, total ),
+            _evaluate_init,
+            ( func, buffer, dtype.str, shape, xvalues, yvalues )
+        )
+        try:
+            tiles = pool.imap_unordered( _evaluate_tile, regions )
+            for done in range( 1, total + 1 ):
+                if ( cancel is not None ) and cancel.is_set():
+                    return None
+                next( tiles )
+                if progress is not None:
+                    progress( done, total )
+            if ( cancel is not None ) and cancel.is_set():
+                return None
+            pool.close()
+        finally:
+            pool.terminate()
+            pool.join()
+        return result
 
-        @param point   A Point or two-tuple of the point to translate
-        @param nearest Set to true to map outputs to the closest integer.
-                       Set a two-tuple of (bool,bool) to indicate integer
-                       outputs per axis.
-        @return        A Point in the target plane that corresponds to the
-                       same position in the source plane
+
+    #=========================================================================
+    def meshgrid( self, sparse = False ):
         """
-        if point is None:
+        Produces coordinate arrays for every position in the plane.
+
+        @param sparse Set to produce a (1,w) array of horizontal coordinates,
+                      and an (h,1) array of vertical coordinates instead of
+                      full (h,w) arrays (using memory for only one row and
+                      one column)
+        @return       A two-tuple of horizontal and vertical coordinate arrays
+                      where rows follow the vertical axis, and columns follow
+                      the horizontal axis
+        @throws       ImportError if NumPy is not installed
+        """
+        _require_numpy( 'Plane.meshgrid()' )
+        return tuple( numpy.meshgrid(
+            self._x.values(),
+            self._y.values(),
+            sparse = sparse
+        ) )
+
+
+    #=========================================================================
+    def points( self, tile = ( 256, 256 ) ):
+        """
+        Generates the coordinates of the plane as batches of points, one
+        rectangular tile at a time (see: `chunks()`).
+
+        @param tile The maximum (w,h) dimensions of each tile, or a number for
+                    square tiles
+        @return     A generator of (N,2) arrays of (x,y) coordinates in
+                    row-major order within each tile
+        @throws     ImportError if NumPy is not installed
+        @throws     ValueError if the tile dimensions are not positive
+        """
+        for chunk in self.chunks( tile ):
+            points = numpy.empty( ( chunk.x.size, 2 ), dtype = chunk.x.dtype )
+            points[ :, 0 ] = chunk.x.reshape( -1 )
+            points[ :, 1 ] = chunk.y.reshape( -1 )
+            yield points
+
+
+#=============================================================================
+# Short aliases of plane attributes share the descriptors of the full names.
+Plane.b   = Plane.bottom
+Plane.d   = Plane.delta
+Plane.dx  = Plane.deltax
+Plane.dy  = Plane.deltay
+Plane.dim = Plane.dimensions
+Plane.h   = Plane.height
+Plane.l   = Plane.left
+Plane.lt  = Plane.lefttop
+Plane.r   = Plane.right
+Plane.rb  = Plane.rightbot
+Plane.t   = Plane.top
+Plane.w   = Plane.width
+
+
+#=============================================================================
+class ComplexPlane( Plane ):
+    """
+    Extends the Cartesian Coordinate Plane class to support complex numbers.
+
+    The horizontal axis holds the real part, and the vertical axis holds the
+    imaginary part of each coordinate.
+
+    Escape-time rendering iterates a function at every position until the
+    magnitude of the result exceeds a radius, and reports the number of
+    iterations it took.  Iteration is vectorized over each tile:  positions
+    that escape are removed from the working arrays, so they are no longer
+    updated.  Rendering accepts all options of `Plane.evaluate()`, so tiles
+    can also be spread across worker processes.
+    """
+
+
+    #=========================================================================
+    # Complex planes do not store any additional values.
+    __slots__ = ()
+
+
+    #=========================================================================
+    def escape( self, func, limit = 256, radius = 2.0, **options ):
+        """
+        Renders the escape time of iterating a function from each position.
+
+        @param func    The function to iterate as `z = func( z )` over arrays
+                       of complex values (must be picklable when using more
+                       than one worker)
+        @param limit   The maximum number of iterations
+        @param radius  The magnitude that a value must exceed to escape
+        @param options Any options of `Plane.evaluate()` (except `dtype`)
+        @return        An (h,w) array of the number of iterations before each
+                       position escaped (`limit` for positions that never
+                       escape);  None if the rendering was canceled
+        @throws        ImportError if NumPy is not installed
+        """
+        rule = EscapeTime( func, None, limit, radius )
+        return self._render( rule, options )
+
+
+    #=========================================================================
+    def grid( self ):
+        """
+        Produces complex coordinates for every position in the plane.
+
+        @return An (h,w) array of complex coordinates where rows follow the
+                vertical (imaginary) axis, and columns follow the horizontal
+                (real) axis
+        @throws ImportError if NumPy is not installed
+        """
+        x, y = self.meshgrid( sparse = True )
+        return _complex_grid( x, y )
+
+
+    #=========================================================================
+    def julia( self, c, limit = 256, radius = 2.0, **options ):
+        """
+        Renders the escape time of a Julia set, iterating `z = z * z + c`
+        from each position.
+
+        @param c       The complex constant of the Julia set
+        @param limit   The maximum number of iterations
+        @param radius  The magnitude that a value must exceed to escape
+        @param options Any options of `Plane.evaluate()` (except `dtype`)
+        @return        An (h,w) array of iteration counts (see: `escape()`)
+        @throws        ImportError if NumPy is not installed
+        """
+        return self._render( EscapeTime.julia( c, limit, radius ), options )
+
+
+    #=========================================================================
+    def mandelbrot( self, limit = 256, radius = 2.0, **options ):
+        """
+        Renders the escape time of the Mandelbrot set, iterating
+        `z = z * z + c` from zero where `c` is each position.
+
+        @param limit   The maximum number of iterations
+        @param radius  The magnitude that a value must exceed to escape
+        @param options Any options of `Plane.evaluate()` (except `dtype`)
+        @return        An (h,w) array of iteration counts (see: `escape()`)
+        @throws        ImportError if NumPy is not installed
+        """
+        return self._render( EscapeTime.mandelbrot( limit, radius ), options )
+
+
+    #=========================================================================
+    def _render( self, rule, options ):
+        """
+        Evaluates an escape-time rule over the plane.
+
+        @param rule    The EscapeTime rule to evaluate
+        @param options Any options of `Plane.evaluate()` (except `dtype`)
+        @return        The result of `Plane.evaluate()`
+        """
+        return self.evaluate( rule, dtype = numpy.int32, **options )
+
+
+#=============================================================================
+class EscapeTime( object ):
+    """
+    Escape-time rule evaluated over tiles of complex planes.
+
+    Rules are called with arrays of real and imaginary coordinates (like any
+    function given to `Plane.evaluate()`), and produce the number of
+    iterations before each position escaped.  Rules are picklable, and
+    compare equal when they have the same parameters (so they can be used to
+    identify cached results).
+    """
+
+
+    #=========================================================================
+    @staticmethod
+    def julia( c, limit = 256, radius = 2.0 ):
+        """
+        Creates the rule for a Julia set.
+
+        @param c      The complex constant of the Julia set
+        @param limit  The maximum number of iterations
+        @param radius The magnitude that a value must exceed to escape
+        @return       A new EscapeTime instance
+        """
+        return EscapeTime( None, complex( c ), limit, radius )
+
+
+    #=========================================================================
+    @staticmethod
+    def mandelbrot( limit = 256, radius = 2.0 ):
+        """
+        Creates the rule for the Mandelbrot set.
+
+        @param limit  The maximum number of iterations
+        @param radius The magnitude that a value must exceed to escape
+        @return       A new EscapeTime instance
+        """
+        return EscapeTime( None, None, limit, radius )
+
+
+    #=========================================================================
+    def __init__( self, func, constant, limit, radius ):
+        """
+        Initializes an EscapeTime object.
+
+        @param func     The function to iterate, or None to iterate
+                        `z = z * z + c`
+        @param constant The constant `c` of a Julia set;  If None (and there
+                        is no function), this is the Mandelbrot set.
+        @param limit    The maximum number of iterations
+        @param radius   The magnitude that a value must exceed to escape
+        """
+        self.func     = func
+        self.constant = constant
+        self.limit    = limit
+        self.radius   = radius
+
+
+    #=========================================================================
+    def __call__( self, x, y ):
+        """
+        Computes the escape times of a tile of positions.
+
+        @param x The horizontal (real) coordinates of the tile
+        @param y The vertical (imaginary) coordinates of the tile
+        @return  An array of iteration counts with the shape of the tile
+        """
+        z = _complex_grid( x, y )
+        if ( self.func is None ) and ( self.constant is None ):
+            return _escape_time(
+                numpy.zeros_like( z ),
+                z,
+                None,
+                self.limit,
+                self.radius
+            )
+        return _escape_time(
+            z,
+            self.constant,
+            self.func,
+            self.limit,
+            self.radius
+        )
+
+
+    #=========================================================================
+    def __eq__( self, other ):
+        """
+        Tests two rules for equality.
+        """
+        if isinstance( other, EscapeTime ) == False:
+            return NotImplemented
+        return self._parameters() == other._parameters()
+
+
+    #=========================================================================
+    def __hash__( self ):
+        """
+        Produces a hash value consistent with rule equality.
+        """
+        return hash( self._parameters() )
+
+
+    #=========================================================================
+    def __ne__( self, other ):
+        """
+        Tests two rules for inequality.
+        """
+        result = self.__eq__( other )
+        if result is NotImplemented:
+            return result
+        return not result
+
+
+    #=========================================================================
+    def _parameters( self ):
+        """
+        Lists the parameters that identify the rule.
+
+        @return A tuple of the rule's parameters
+        """
+        return ( self.func, self.constant, self.limit, self.radius )
+
+
+#=============================================================================
+class Map( object ):
+    """
+    Models coordinate mapping between two planes.
+    """
+
+
+    #=========================================================================
+    def __init__( self, horizontal = None, vertical = None ):
+        """
+        Initializes a Map object.
+
+        Note: Linear map coefficients are given as two-tuples or Line named
+        tuples where the first item is the straight-line slope, and the second
+        item is the straight-line intercept.
+
+        @param horizontal Linear map coefficients from horizontal coordinates
+                          from an source plane to a target plane.  When not
+                          specified, the map defaults to a 1:1 scaled map with
+                          matching origins.
+        @param vertical   Same as `horizontal`, but for the vertical axis
+        """
+        if horizontal is None:
+            self.horizontal = Line( 1.0, 0.0 )
+        else:
+            self.horizontal = Line( *horizontal )
+        if vertical is None:
+            self.vertical = Line( 1.0, 0.0 )
+        else:
+            self.vertical = Line( *vertical )
+
+
+    #=========================================================================
+    def __matmul__( self, other ):
+        """
+        Supports composition through the matrix multiplication operator.
+
+        @param other The Map applied before this map
+        @return      A new Map instance for the composed mapping
+        """
+        if isinstance( other, Map ) == False:
+            return NotImplemented
+        return self.compose( other )
+
+
+    #=========================================================================
+    @staticmethod
+    def map_extremes( source, target ):
+        """
+        Creates new map objects based on the extremes of two planes.
+
+        @param source The source plane for mapping requests
+        @param target The target plane for mapping requests
+        @return       A new Map instance for scaled coordinate mapping
+        """
+        xslope     = target.deltax / float( source.deltax )
+        xintercept = target.left - xslope * source.left
+        yslope     = target.deltay / float( source.deltay )
+        yintercept = target.top - yslope * source.top
+        return Map( ( xslope, xintercept ), ( yslope, yintercept ) )
+
+
+    #=========================================================================
+    @staticmethod
+    def map_clipped( source, target, fixed = AXIS_HORIZONTAL ):
+        """
+        Creates new map objects that clip the source plane within the
+        boundaries of the target plane.
+
+        Clipping assumes one dimension is fixed, and the other is scaled
+        assuming each point in the planes map with an equal aspect ratio.
+
+        @param source The source plane for mapping requests
+        @param target The target plane for mapping requests
+        @param fixed  The axis that maps extreme-to-extreme:  AXIS_HORIZONTAL
+                      (the default) or AXIS_VERTICAL
+        @return       A new Map instance for clipped coordinate mapping
+        """
+
+        # Clip the horizontal axis with respect to the vertical axis.
+        if fixed == AXIS_VERTICAL:
+
+            # Determine new total width of the target plane.
+            twidth = source.deltax \
+                   * float( target.deltay ) / float( source.deltay )
+
+            # Determine the horizontal middle point of the target plane.
+            mid = target.left + target.deltax / 2.0
+
+            # Determine new left horizontal extreme for the target plane.
+            xleft = mid - twidth / 2.0
+
+            # Determine slope and intercept for the horizontal axis mapping.
+            xslope     = twidth / float( source.deltax )
+            xintercept = xleft - xslope * source.left
+
+            # Determine the mapping for the fixed axis.
+            yslope     = target.deltay / float( source.deltay )
+            yintercept = target.top - yslope * source.top
+
+            # Create Map object with adjusted horizontal axis.
+            return Map( ( xslope, xintercept ), ( yslope, yintercept ) )
+
+        # Clip the vertical axis with respect to the horizontal axis.
+        else:
+
+            # Determine new total height of the target plane.
+            theight = source.deltay \
+                    * float( target.deltax ) / float( source.deltax )
+
+            # Determine the vertical middle point of the target plane.
+            mid = target.top + target.deltay / 2.0
+
+            # Determine new top vertical extreme for the target plane.
+            ytop = mid - theight / 2.0
+
+            # Determine slope and intercept for the vertical axis mapping.
+            yslope     = theight / float( source.deltay )
+            yintercept = ytop - yslope * source.top
+
+            # Determine the mapping for the fixed axis.
+            xslope     = target.deltax / float( source.deltax )
+            xintercept = target.left - xslope * source.left
+
+            # Create Map object with adjusted vertical axis.
+            return Map( ( xslope, xintercept ), ( yslope, yintercept ) )
+
+
+    #=========================================================================
+    @staticmethod
+    def fit( source, target, mode = FIT_CONTAIN, align = ( 0.5, 0.5 ) ):
+        """
+        Creates a map that places a source plane within a target plane.
+
+        FIT_STRETCH maps the extremes of the planes to each other (see
+        `map_extremes()`).  The other modes scale both axes equally, so
+        shapes keep their aspect ratio.  FIT_CONTAIN shows the entire source
+        plane, and leaves unused space on one axis (letterboxing).
+        FIT_COVER fills the entire target plane, and crops the source plane
+        on one axis.  The direction of each axis is kept.
+
+        @param source The source plane for mapping requests
+        @param target The target plane for mapping requests
+        @param mode   The fit mode: FIT_CONTAIN, FIT_COVER, or FIT_STRETCH
+        @param align  The (x,y) fractions of the unused (or cropped) space
+                      placed before the source plane on each axis, or a
+                      number for both axes;  The default centers the plane.
+        @return       A new Map instance for the fitted coordinate mapping
+        @throws       ValueError if the fit mode is not valid
+        """
+        if mode not in ( FIT_STRETCH, FIT_CONTAIN, FIT_COVER ):
+            raise ValueError( 'Invalid fit mode: {}'.format( mode ) )
+        xalign, yalign = _fit_align( align )
+
+        # Determine the scale of each axis.
+        xslope = target.deltax / float( source.deltax )
+        yslope = target.deltay / float( source.deltay )
+        if mode != FIT_STRETCH:
+            if mode == FIT_CONTAIN:
+                scale = min( abs( xslope ), abs( yslope ) )
+            else:
+                scale = max( abs( xslope ), abs( yslope ) )
+            xslope = math.copysign( scale, xslope )
+            yslope = math.copysign( scale, yslope )
+
+        # Place the remaining space on each axis according to the alignment.
+        xintercept = target.left - xslope * source.left \
+                   + ( target.deltax - xslope * source.deltax ) * xalign
+        yintercept = target.top - yslope * source.top \
+                   + ( target.deltay - yslope * source.deltay ) * yalign
+        return Map( ( xslope, xintercept ), ( yslope, yintercept ) )
+
+
+    #=========================================================================
+    @staticmethod
+    def fit_many(
+        sources,
+        targets,
+        mode  = FIT_CONTAIN,
+        align = ( 0.5, 0.5 )
+    ):
+        """
+        Creates maps for a batch of source and target planes (see: `fit()`).
+
+        The coefficients of every map are computed in a single vectorized
+        pass.  A single source or target plane (or a single row of extremes)
+        is paired with every plane of the other batch.
+
+        @param sources The source planes as a Plane, a sequence of Planes, or
+                       an (N,4) array of (left,top,right,bottom) extremes
+        @param targets The target planes (in the same forms as `sources`)
+        @param mode    The fit mode: FIT_CONTAIN, FIT_COVER, or FIT_STRETCH
+        @param align   The (x,y) fractions of the unused (or cropped) space
+                       placed before each source plane, or a number for both
+                       axes
+        @return        A list of new Map instances, one for each pair of
+                       planes
+        @throws        ImportError if NumPy is not installed
+        @throws        ValueError if the fit mode is not valid, or the
+                       batches can not be paired
+        """
+        _require_numpy( 'Map.fit_many()' )
+        if mode not in ( FIT_STRETCH, FIT_CONTAIN, FIT_COVER ):
+            raise ValueError( 'Invalid fit mode: {}'.format( mode ) )
+        source = _extreme_array( sources )
+        target = _extreme_array( targets )
+
+        # Determine the scale of each axis.
+        sdelta = source[ :, 2 : ] - source[ :, : 2 ]
+        tdelta = target[ :, 2 : ] - target[ :, : 2 ]
+        slope  = tdelta / sdelta
+        if mode != FIT_STRETCH:
+            if mode == FIT_CONTAIN:
+                scale = numpy.abs( slope ).min( axis = 1 )
+            else:
+                scale = numpy.abs( slope ).max( axis = 1 )
+            slope = numpy.copysign( scale[ :, numpy.newaxis ], slope )
+
+        # Place the remaining space on each axis according to the alignment.
+        intercept  = target[ :, : 2 ] - slope * source[ :, : 2 ]
+        intercept += ( tdelta - slope * sdelta ) * _fit_align( align )
+        return [
+            Map( ( xslope, xintercept ), ( yslope, yintercept ) )
+            for xslope, yslope, xintercept, yintercept
+            in numpy.hstack( ( slope, intercept ) ).tolist()
+        ]
+
+
+    #=========================================================================
+    def compose( self, other ):
+        """
+        Composes this map with another map into a single, precomputed map.
+
+        @param other The Map applied before this map
+        @return      A new Map instance that applies `other`, then this map
+        @throws      TypeError if the other map is not a Map
+        """
+        if isinstance( other, Map ) == False:
+            raise TypeError(
+                'Unable to compose with {}.'.format( type( other ) )
+            )
+        h1, v1 = self.horizontal, self.vertical
+        h2, v2 = other.horizontal, other.vertical
+        return Map(
+            ( h1.a * h2.a, h1.a * h2.b + h1.b ),
+            ( v1.a * v2.a, v1.a * v2.b + v1.b )
+        )
+
+
+    #=========================================================================
+    def inverse( self ):
+        """
+        Creates the inverse of this map (e.g. for target-to-source picking).
+
+        @return A new Map instance that undoes this map
+        @throws ValueError if either axis has a zero slope
+        """
+        if ( self.horizontal.a == 0 ) or ( self.vertical.a == 0 ):
+            raise ValueError( 'Unable to invert a map with a zero slope.' )
+        h, v = self.horizontal, self.vertical
+        return Map(
+            ( 1.0 / h.a, -h.b / float( h.a ) ),
+            ( 1.0 / v.a, -v.b / float( v.a ) )
+        )
+
+
+    #=========================================================================
+    def translate( self, point = None, nearest = False ):
+        """
+        Translates a source point into a target point.
+
+        @param point   A Point or two-tuple of the point to translate
+        @param nearest Set to true to map outputs to the closest integer.
+                       Set a two-tuple of (bool,bool) to indicate integer
+                       outputs per axis.
+        @return        A Point in the target plane that corresponds to the
+                       same position in the source plane
+        """
+        if point is None:
             point = Point( 0.0, 0.0 )
         elif isinstance( point, Point ) == False:
             point = Point( *point )
@@ -528,3 +1701,711 @@ class Map( object ):
         return Point( target_x, target_y )
 
 
+    #=========================================================================
+    def translate_many( self, points, nearest = False ):
+        """
+        Translates a batch of source points into target points.
+
+        The coefficients of both axes are applied to all points in a single
+        vectorized pass.  No per-point Python objects are created.
+
+        @param points  The points to translate as one of the following:
+                       - An (N,2) array of (x,y) coordinates
+                       - A two-tuple of 1-D arrays: (xs, ys)
+                       - Any iterable of Points or two-tuples
+                       Note: A two-tuple of tuples or lists is treated as
+                       two points, not as separate coordinate arrays.
+        @param nearest Set to true to map outputs to the closest integer.
+                       Set a two-tuple of (bool,bool) to indicate integer
+                       outputs per axis.
+        @return        An (N,2) array of target points; the array has an
+                       integer type when both axes are mapped to integers
+        @throws        ImportError if NumPy is not installed
+        @throws        ValueError if the points can not be arranged as (x,y)
+                       coordinate pairs
+        """
+        _require_numpy( 'Map.translate_many()' )
+
+        source = _point_array( points )
+
+        # Apply the coefficients for both axes in one pass.
+        slope     = numpy.array( ( self.horizontal.a, self.vertical.a ) )
+        intercept = numpy.array( ( self.horizontal.b, self.vertical.b ) )
+        target    = source * slope
+        target   += intercept
+
+        # Round the requested axes to the nearest integer.
+        return _round_axes( target, nearest )
+
+
+#=============================================================================
+class Affine( object ):
+    """
+    Models an affine transform between two planes as a 3x3 matrix of
+    homogeneous coordinates.
+
+    The bottom row of the matrix is always (0, 0, 1), so only the top two
+    rows are stored:
+
+        | a  b  c |   | x |   | a * x + b * y + c |
+        | d  e  f | * | y | = | d * x + e * y + f |
+        | 0  0  1 |   | 1 |   |         1         |
+
+    Unlike a `Map`, an affine transform can express rotation and shear, and
+    any chain of transforms collapses into a single transform.
+
+    Composition follows the usual matrix convention:  `t1.compose( t2 )`
+    (or `t1 @ t2`) is the transform that applies `t2` first, then `t1`.
+    """
+
+
+    #=========================================================================
+    def __init__(
+        self,
+        a = 1.0,
+        b = 0.0,
+        c = 0.0,
+        d = 0.0,
+        e = 1.0,
+        f = 0.0
+    ):
+        """
+        Initializes an Affine object.  The default is the identity transform.
+
+        @param a Horizontal scaling coefficient
+        @param b Horizontal coefficient from the vertical input coordinate
+        @param c Horizontal offset
+        @param d Vertical coefficient from the horizontal input coordinate
+        @param e Vertical scaling coefficient
+        @param f Vertical offset
+        """
+        self._m = (
+            float( a ), float( b ), float( c ),
+            float( d ), float( e ), float( f )
+        )
+
+
+    #=========================================================================
+    def __eq__( self, other ):
+        """
+        Compares two transforms for equality.
+
+        @param other The other transform
+        @return      True if both transforms have the same coefficients
+        """
+        if isinstance( other, Affine ) == False:
+            return NotImplemented
+        return self._m == other._m
+
+
+    #=========================================================================
+    def __hash__( self ):
+        """
+        Produces a hash value for the transform.
+
+        @return The hash of the transform's coefficients
+        """
+        return hash( self._m )
+
+
+    #=========================================================================
+    def __matmul__( self, other ):
+        """
+        Supports composition through the matrix multiplication operator.
+
+        @param other The transform (or Map) applied before this transform
+        @return      A new Affine instance for the composed transform
+        """
+        if isinstance( other, ( Affine, Map ) ) == False:
+            return NotImplemented
+        return self.compose( other )
+
+
+    #=========================================================================
+    def __ne__( self, other ):
+        """
+        Compares two transforms for inequality.
+
+        @param other The other transform
+        @return      True if the transforms have different coefficients
+        """
+        result = self.__eq__( other )
+        if result is NotImplemented:
+            return result
+        return not result
+
+
+    #=========================================================================
+    def __rmatmul__( self, other ):
+        """
+        Supports composition with a Map on the left of the operator.
+
+        @param other The Map applied after this transform
+        @return      A new Affine instance for the composed transform
+        """
+        if isinstance( other, Map ) == False:
+            return NotImplemented
+        return Affine.from_map( other ).compose( self )
+
+
+    #=========================================================================
+    def __str__( self ):
+        """
+        Produces a string representation of the transform.
+
+        @return A string representation of the transform's matrix
+        """
+        return '[[{}, {}, {}], [{}, {}, {}], [0, 0, 1]]'.format( *self._m )
+
+
+    #=========================================================================
+    @staticmethod
+    def chain( *transforms ):
+        """
+        Collapses a pipeline of transforms into a single transform.
+
+        @param transforms Any number of Affine or Map instances given in the
+                          order they are applied to a point
+        @return           A new Affine instance for the entire pipeline
+        """
+        result = Affine()
+        for transform in transforms:
+            result = Affine._argument( transform ).compose( result )
+        return result
+
+
+    #=========================================================================
+    @staticmethod
+    def fit( source, target, mode = FIT_CONTAIN, align = ( 0.5, 0.5 ) ):
+        """
+        Creates a transform that places a source plane within a target plane.
+
+        @param source The source plane for mapping requests
+        @param target The target plane for mapping requests
+        @param mode   The fit mode (see `Map.fit()`)
+        @param align  The alignment of the source plane (see `Map.fit()`)
+        @return       A new Affine instance for the fitted coordinate mapping
+        """
+        return Affine.from_map( Map.fit( source, target, mode, align ) )
+
+
+    #=========================================================================
+    @staticmethod
+    def from_map( pmap ):
+        """
+        Creates a transform that performs the same mapping as a Map.
+
+        @param pmap The Map instance to convert
+        @return     A new Affine instance for the same mapping
+        """
+        return Affine(
+            pmap.horizontal.a, 0.0, pmap.horizontal.b,
+            0.0, pmap.vertical.a, pmap.vertical.b
+        )
+
+
+    #=========================================================================
+    @staticmethod
+    def map_clipped( source, target, fixed = AXIS_HORIZONTAL ):
+        """
+        Creates a transform that clips the source plane within the boundaries
+        of the target plane.
+
+        @param source The source plane for mapping requests
+        @param target The target plane for mapping requests
+        @param fixed  The axis that is fixed (see `Map.map_clipped()`)
+        @return       A new Affine instance for clipped coordinate mapping
+        """
+        return Affine.from_map( Map.map_clipped( source, target, fixed ) )
+
+
+    #=========================================================================
+    @staticmethod
+    def map_extremes( source, target ):
+        """
+        Creates a transform based on the extremes of two planes.
+
+        @param source The source plane for mapping requests
+        @param target The target plane for mapping requests
+        @return       A new Affine instance for scaled coordinate mapping
+        """
+        return Affine.from_map( Map.map_extremes( source, target ) )
+
+
+    #=========================================================================
+    @staticmethod
+    def rotation( angle, center = None ):
+        """
+        Creates a transform that rotates points about a center point.
+
+        @param angle  The angle of rotation in radians
+        @param center The point to rotate about (default is the origin)
+        @return       A new Affine instance for the rotation
+        """
+        cos = math.cos( angle )
+        sin = math.sin( angle )
+        rotate = Affine( cos, -sin, 0.0, sin, cos, 0.0 )
+        if center is None:
+            return rotate
+        return Affine.chain(
+            Affine.translation( -center[ 0 ], -center[ 1 ] ),
+            rotate,
+            Affine.translation( center[ 0 ], center[ 1 ] )
+        )
+
+
+    #=========================================================================
+    @staticmethod
+    def scaling( sx, sy = None ):
+        """
+        Creates a transform that scales points about the origin.
+
+        @param sx The horizontal scaling factor
+        @param sy The vertical scaling factor (default is `sx`)
+        @return   A new Affine instance for the scaling
+        """
+        if sy is None:
+            sy = sx
+        return Affine( sx, 0.0, 0.0, 0.0, sy, 0.0 )
+
+
+    #=========================================================================
+    @staticmethod
+    def shear( kx, ky = 0.0 ):
+        """
+        Creates a transform that shears points along each axis.
+
+        @param kx The horizontal shear factor (x += kx * y)
+        @param ky The vertical shear factor (y += ky * x)
+        @return   A new Affine instance for the shear
+        """
+        return Affine( 1.0, kx, 0.0, ky, 1.0, 0.0 )
+
+
+    #=========================================================================
+    @staticmethod
+    def translation( tx, ty ):
+        """
+        Creates a transform that moves points by a fixed offset.
+
+        @param tx The horizontal offset
+        @param ty The vertical offset
+        @return   A new Affine instance for the translation
+        """
+        return Affine( 1.0, 0.0, tx, 0.0, 1.0, ty )
+
+
+    #=========================================================================
+    def compose( self, other ):
+        """
+        Composes this transform with another transform.
+
+        @param other The transform (or Map) applied before this transform
+        @return      A new Affine instance that applies `other`, then this
+                     transform
+        """
+        a1, b1, c1, d1, e1, f1 = self._m
+        a2, b2, c2, d2, e2, f2 = self._argument( other )._m
+        return Affine(
+            a1 * a2 + b1 * d2,
+            a1 * b2 + b1 * e2,
+            a1 * c2 + b1 * f2 + c1,
+            d1 * a2 + e1 * d2,
+            d1 * b2 + e1 * e2,
+            d1 * c2 + e1 * f2 + f1
+        )
+
+
+    #=========================================================================
+    def inverse( self ):
+        """
+        Creates the inverse of this transform.
+
+        @return A new Affine instance that undoes this transform
+        @throws ValueError if the transform can not be inverted
+        """
+        a, b, c, d, e, f = self._m
+        det = a * e - b * d
+        if det == 0:
+            raise ValueError( 'Unable to invert a singular transform.' )
+        inv_a =  e / det
+        inv_b = -b / det
+        inv_d = -d / det
+        inv_e =  a / det
+        return Affine(
+            inv_a, inv_b, -( inv_a * c + inv_b * f ),
+            inv_d, inv_e, -( inv_d * c + inv_e * f )
+        )
+
+
+    #=========================================================================
+    @property
+    def matrix( self ):
+        """
+        The full 3x3 matrix of the transform as a tuple of rows.
+        """
+        return ( self._m[ 0 : 3 ], self._m[ 3 : 6 ], ( 0.0, 0.0, 1.0 ) )
+
+
+    #=========================================================================
+    def translate( self, point = None, nearest = False ):
+        """
+        Translates a source point into a target point.
+
+        @param point   A Point or two-tuple of the point to translate
+        @param nearest Set to true to map outputs to the closest integer.
+                       Set a two-tuple of (bool,bool) to indicate integer
+                       outputs per axis.
+        @return        A Point in the target plane
+        """
+        if point is None:
+            point = Point( 0.0, 0.0 )
+        if isinstance( nearest, ( tuple, list ) ):
+            nearx, neary = nearest[ 0 : 2 ]
+        else:
+            nearx, neary = nearest, nearest
+        a, b, c, d, e, f = self._m
+        target_x = a * point[ 0 ] + b * point[ 1 ] + c
+        target_y = d * point[ 0 ] + e * point[ 1 ] + f
+        if nearx:
+            target_x = int( round( target_x ) )
+        if neary:
+            target_y = int( round( target_y ) )
+        return Point( target_x, target_y )
+
+
+    #=========================================================================
+    def translate_many( self, points, nearest = False ):
+        """
+        Translates a batch of source points into target points with a single
+        matrix multiplication.
+
+        @param points  The points to translate (see `Map.translate_many()`)
+        @param nearest Set to true to map outputs to the closest integer.
+                       Set a two-tuple of (bool,bool) to indicate integer
+                       outputs per axis.
+        @return        An (N,2) array of target points
+        @throws        ImportError if NumPy is not installed
+        @throws        ValueError if the points can not be arranged as (x,y)
+                       coordinate pairs
+        """
+        _require_numpy( 'Affine.translate_many()' )
+        source = _point_array( points )
+        a, b, c, d, e, f = self._m
+        target  = numpy.dot( source, numpy.array( ( ( a, d ), ( b, e ) ) ) )
+        target += ( c, f )
+        return _round_axes( target, nearest )
+
+
+    #=========================================================================
+    @staticmethod
+    def _argument( transform ):
+        """
+        Checks a transform argument and converts it into an Affine instance
+        if it isn't one already.
+
+        @param transform An Affine or Map instance
+        @return          A usable Affine instance
+        @throws          TypeError if the argument is not a transform
+        """
+        if isinstance( transform, Affine ):
+            return transform
+        if isinstance( transform, Map ):
+            return Affine.from_map( transform )
+        raise TypeError(
+            'Unable to use {} as a transform.'.format( type( transform ) )
+        )
+
+
+#=============================================================================
+class TileCache( object ):
+    """
+    Least-recently-used cache of rendered tiles for interactive panning and
+    zooming.
+
+    Tiles are aligned to a lattice of positions anchored at zero, so every
+    view of a plane with the same step (and the same function) shares the
+    same tiles.  After a pan, only the tiles that were not already visible
+    are computed.  After an integer zoom, the positions of a new tile that
+    coincide with the positions of cached tiles at the previous step are
+    copied, and only the remaining positions are computed.
+
+    Functions are called as `func( x, y )` with arrays of coordinates (as in
+    `Plane.evaluate()`), and must compute each position independently of the
+    others.  Cached tiles are discarded (least-recently-used first) when the
+    total size of the tiles exceeds the memory budget.
+    """
+
+
+    #=========================================================================
+    def __init__( self, budget = 64 * 1024 * 1024, tile = ( 256, 256 ) ):
+        """
+        Initializes a TileCache object.
+
+        @param budget The maximum number of bytes of tile data to keep
+        @param tile   The (w,h) dimensions of each tile, or a number for
+                      square tiles
+        @throws       ValueError if the budget is negative, or the tile
+                      dimensions are not positive
+        """
+        self.tile      = _tile_size( tile )
+        self.hits      = 0
+        self.misses    = 0
+        self.nbytes    = 0
+        self._budget   = 0
+        self._tiles    = collections.OrderedDict()
+        self._lattices = {}
+        self.budget    = budget
+
+
+    #=========================================================================
+    def __len__( self ):
+        """
+        Reports the number of tiles in the cache.
+
+        @return The number of cached tiles
+        """
+        return len( self._tiles )
+
+
+    #=========================================================================
+    @property
+    def budget( self ):
+        """
+        The maximum number of bytes of tile data kept in the cache.
+        """
+        return self._budget
+
+
+    #=========================================================================
+    @budget.setter
+    def budget( self, budget ):
+        """
+        Changes the maximum number of bytes of tile data kept in the cache
+        (discarding the least-recently-used tiles as needed).
+        """
+        if budget < 0:
+            raise ValueError( 'Invalid cache budget: {}'.format( budget ) )
+        self._budget = budget
+        while self.nbytes > budget:
+            self._discard()
+
+
+    #=========================================================================
+    def clear( self ):
+        """
+        Discards all tiles from the cache.
+        """
+        self._tiles.clear()
+        self._lattices.clear()
+        self.nbytes = 0
+
+
+    #=========================================================================
+    def render( self, plane, func, key = None, pmap = None, dtype = float ):
+        """
+        Evaluates a function at every position in a plane using (and
+        updating) the cached tiles.
+
+        @param plane The Plane (or ComplexPlane) to render
+        @param func  The function to evaluate as `func( x, y )`
+        @param key   The hashable identity of the function's results;  The
+                     function itself is used by default, so functions that
+                     depend on other state (e.g. closures) should be given an
+                     explicit key.
+        @param pmap  Optional Map from the plane's coordinates (e.g. pixels
+                     of a view) to the coordinates given to the function
+        @param dtype The NumPy data type of the result
+        @return      An (h,w) array of the results where rows follow the
+                     vertical axis, and columns follow the horizontal axis
+                     (see: `Plane.evaluate()`)
+        @throws      ImportError if NumPy is not installed
+        """
+        _require_numpy( 'TileCache.render()' )
+        if key is None:
+            key = func
+        if pmap is None:
+            pmap = Map()
+        dtype = numpy.dtype( dtype )
+        group = ( key, dtype.str )
+        width, height = self.tile
+
+        # Planes without any positions have nothing to render.
+        shape = ( len( plane._y ), len( plane._x ) )
+        if ( shape[ 0 ] == 0 ) or ( shape[ 1 ] == 0 ):
+            return numpy.empty( shape, dtype = dtype )
+
+        # Find the lattice of the function's coordinates.
+        xstep, xphase, left, columns, xflip = _lattice_axis(
+            plane._x,
+            pmap.horizontal
+        )
+        ystep, yphase, top, rows, yflip = _lattice_axis(
+            plane._y,
+            pmap.vertical
+        )
+        lattice = ( ( xstep, xphase ), ( ystep, yphase ) )
+
+        # Copy the visible part of each tile into the result.
+        result = numpy.empty( ( rows, columns ), dtype = dtype )
+        for row in range( top // height, ( top + rows - 1 ) // height + 1 ):
+            low  = max( top, row * height )
+            high = min( top + rows, ( row + 1 ) * height )
+            for column in range(
+                left // width,
+                ( left + columns - 1 ) // width + 1
+            ):
+                start  = max( left, column * width )
+                stop   = min( left + columns, ( column + 1 ) * width )
+                values = self._tile( group, lattice, row, column, func )
+                result[ low - top : high - top, start - left : stop - left ] \
+                    = values[
+                        low - row * height : high - row * height,
+                        start - column * width : stop - column * width
+                    ]
+
+        # Arrange the result in the order of the plane's axes.
+        if yflip:
+            result = result[ ::-1 ]
+        if xflip:
+            result = result[ :, ::-1 ]
+        return numpy.ascontiguousarray( result )
+
+
+    #=========================================================================
+    def stats( self ):
+        """
+        Reports the cache's usage statistics.
+
+        @return A dictionary with the number of tile 'hits' and 'misses', the
+                memory 'budget' of the cache, the number of bytes used by
+                cached tiles ('nbytes'), and the current 'length' of the
+                cache
+        """
+        return {
+            'hits'   : self.hits,
+            'misses' : self.misses,
+            'budget' : self._budget,
+            'nbytes' : self.nbytes,
+            'length' : len( self._tiles )
+        }
+
+
+    #=========================================================================
+    def _discard( self ):
+        """
+        Discards the least-recently-used tile.
+        """
+        entry, values = self._tiles.popitem( last = False )
+        self.nbytes  -= values.nbytes
+        lattices      = self._lattices[ entry[ 0 ] ]
+        lattices[ entry[ 1 ] ] -= 1
+        if lattices[ entry[ 1 ] ] == 0:
+            del lattices[ entry[ 1 ] ]
+            if len( lattices ) == 0:
+                del self._lattices[ entry[ 0 ] ]
+
+
+    #=========================================================================
+    def _reuse( self, group, lattice, row, column, values ):
+        """
+        Copies the positions of a new tile that coincide with positions of
+        cached tiles on other lattices (e.g. from before a zoom).
+
+        @param group   The ( key, dtype ) group of the tile
+        @param lattice The lattice of the tile
+        @param row     The lattice row of the tile
+        @param column  The lattice column of the tile
+        @param values  The array of the tile's values to fill
+        @return        A boolean array of the positions that are still
+                       missing;  None if no positions were copied
+        """
+        height, width = values.shape
+        filled = None
+        for other in self._lattices.get( group, () ):
+            if other == lattice:
+                continue
+            ymatch = _lattice_match(
+                row * height,
+                height,
+                lattice[ 1 ],
+                other[ 1 ]
+            )
+            xmatch = _lattice_match(
+                column * width,
+                width,
+                lattice[ 0 ],
+                other[ 0 ]
+            )
+            if ( ymatch is None ) or ( xmatch is None ):
+                continue
+            yrows = ymatch[ 1 ] // height
+            xcols = xmatch[ 1 ] // width
+            for orow in numpy.unique( yrows ):
+                rselect = yrows == orow
+                for ocol in numpy.unique( xcols ):
+                    source = self._tiles.get( ( group, other, orow, ocol ) )
+                    if source is None:
+                        continue
+                    cselect = xcols == ocol
+                    target  = numpy.ix_(
+                        ymatch[ 0 ][ rselect ],
+                        xmatch[ 0 ][ cselect ]
+                    )
+                    values[ target ] = source[ numpy.ix_(
+                        ymatch[ 1 ][ rselect ] % height,
+                        xmatch[ 1 ][ cselect ] % width
+                    ) ]
+                    if filled is None:
+                        filled = numpy.zeros( values.shape, dtype = bool )
+                    filled[ target ] = True
+        if filled is None:
+            return None
+        return ~filled
+
+
+    #=========================================================================
+    def _tile( self, group, lattice, row, column, func ):
+        """
+        Retrieves a tile from the cache, computing it when it is missing.
+
+        @param group   The ( key, dtype ) group of the tile
+        @param lattice The lattice of the tile
+        @param row     The lattice row of the tile
+        @param column  The lattice column of the tile
+        @param func    The function that computes the tile's values
+        @return        The (h,w) array of the tile's values
+        """
+        entry  = ( group, lattice, row, column )
+        values = self._tiles.pop( entry, None )
+        if values is not None:
+            self.hits += 1
+            self._tiles[ entry ] = values
+            return values
+        self.misses += 1
+
+        # Compute the positions that weren't copied from other lattices.
+        width, height = self.tile
+        x, y = numpy.meshgrid(
+            ( numpy.arange( column * width, ( column + 1 ) * width )
+                + lattice[ 0 ][ 1 ] ) * lattice[ 0 ][ 0 ],
+            ( numpy.arange( row * height, ( row + 1 ) * height )
+                + lattice[ 1 ][ 1 ] ) * lattice[ 1 ][ 0 ]
+        )
+        values  = numpy.empty( ( height, width ), dtype = group[ 1 ] )
+        missing = self._reuse( group, lattice, row, column, values )
+        if missing is None:
+            values[ ... ] = func( x, y )
+        elif missing.any():
+            values[ missing ] = func( x[ missing ], y[ missing ] )
+        values.flags.writeable = False
+
+        # Keep the tile if it fits within the budget.
+        if values.nbytes <= self._budget:
+            self._tiles[ entry ] = values
+            self.nbytes += values.nbytes
+            lattices = self._lattices.setdefault( group, {} )
+            lattices[ lattice ] = lattices.get( lattice, 0 ) + 1
+            while self.nbytes > self._budget:
+                self._discard()
+        return values
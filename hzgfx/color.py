@@ -27,17 +27,74 @@ that format instead.
 To limit a lot of repetitious documentation in the code, assume all sequences
 of non-alpha color channels occur in the same order: red, green, then blue.
 
+Batches of 32-bit colors can be composited with the Porter-Duff operators
+using the `composite()`, `premultiply()`, and `unpremultiply()` functions.
+
+Colors can be converted between the following color spaces:  sRGB, linear
+RGB, HSV, HSL, CIE XYZ (D65 white point), and CIELAB.  Single colors are
+converted with the `to_*()` and `from_*()` methods of `Color`.  Arrays of
+colors are converted with the `convert_many()` function.  Channel values are
+floating-point numbers from 0 to 1 (except for 8-bit sRGB arrays, and the
+L*a*b* components which use their usual ranges).  Hue is given as a
+fraction of a full turn (from 0 to 1), just like the `colorsys` module.
+
+Images of packed 32-bit colors can be resized with the `resample()`
+function (using box or Lanczos filters).
+
+Hexadecimal color strings are parsed through a bounded, least-recently-used
+cache (`hex_cache`).  `Color.from_hex()` returns shared, immutable colors
+from a second cache (`interned`).  Both caches report their hit and miss
+statistics, and can be resized at any time.
+
 ZIH TODO:
 
-- Implement ColorAlpha
 - Implement color arithmetic methods
 
 """
 
 
+import collections
+import colorsys
+import numbers
+import sys
+
+from ._optional import numpy
+from ._optional import require_numpy as _require_numpy
+
+
 __version__ = '0.0.0'
 
 
+#=============================================================================
+# Color spaces supported by conversions
+SPACE_SRGB   = 0        # 8-bit (or 0-1 floating-point) sRGB channels
+SPACE_LINEAR = 1        # linear-light RGB channels
+SPACE_HSV    = 2        # hue, saturation, value
+SPACE_HSL    = 3        # hue, saturation, lightness
+SPACE_XYZ    = 4        # CIE 1931 XYZ (D65 white point)
+SPACE_LAB    = 5        # CIELAB (D65 white point)
+
+
+#=============================================================================
+# Conversion matrices between linear sRGB and CIE XYZ (D65)
+_XYZ_FROM_LINEAR = (
+    ( 0.4124564, 0.3575761, 0.1804375 ),
+    ( 0.2126729, 0.7151522, 0.0721750 ),
+    ( 0.0193339, 0.1191920, 0.9503041 )
+)
+_LINEAR_FROM_XYZ = (
+    (  3.2404542, -1.5371385, -0.4985314 ),
+    ( -0.9692660,  1.8760108,  0.0415560 ),
+    (  0.0556434, -0.2040259,  1.0572252 )
+)
+
+
+#=============================================================================
+# Reference white point (D65) and linear segment limit for CIELAB
+_WHITE     = ( 0.95047, 1.0, 1.08883 )
+_LAB_DELTA = 6.0 / 29.0
+
+
 #=============================================================================
 class Color( object ):
     """
@@ -55,6 +112,88 @@ class Color( object ):
     STR_LITERAL = 3         # "0xRRGGBB"
 
 
+    #=========================================================================
+    # Instances only store the color itself (no per-instance dictionary).
+    __slots__ = ( '_int', '_rgb', 'strmode' )
+
+
+    #=========================================================================
+    @staticmethod
+    def from_hex( value ):
+        """
+        Retrieves a shared, immutable color for a hexadecimal string.
+
+        Repeated calls with the same string return the same instance (until
+        it is evicted from the `interned` cache).
+
+        @param value A hexadecimal string (see: `set()`)
+        @return      A FrozenColor instance
+        """
+        return interned( value )
+
+
+    #=========================================================================
+    @staticmethod
+    def from_hsl( hsl ):
+        """
+        Creates a color from HSL components.
+
+        @param hsl A 3-sequence of hue, saturation, and lightness
+        @return    A new Color instance
+        """
+        rgb = colorsys.hls_to_rgb( hsl[ 0 ], hsl[ 2 ], hsl[ 1 ] )
+        return Color( [ _to8( c ) for c in rgb ] )
+
+
+    #=========================================================================
+    @staticmethod
+    def from_hsv( hsv ):
+        """
+        Creates a color from HSV components.
+
+        @param hsv A 3-sequence of hue, saturation, and value
+        @return    A new Color instance
+        """
+        rgb = colorsys.hsv_to_rgb( *hsv[ 0 : 3 ] )
+        return Color( [ _to8( c ) for c in rgb ] )
+
+
+    #=========================================================================
+    @staticmethod
+    def from_lab( lab ):
+        """
+        Creates a color from CIELAB components.
+
+        @param lab A 3-sequence of L*, a*, and b*
+        @return    A new Color instance (out-of-gamut channels are clipped)
+        """
+        return Color.from_xyz( _lab_to_xyz( lab ) )
+
+
+    #=========================================================================
+    @staticmethod
+    def from_linear( linear ):
+        """
+        Creates a color from linear-light RGB channels.
+
+        @param linear A 3-sequence of linear channel values
+        @return       A new Color instance
+        """
+        return Color( [ _to8( _srgb_encode( c ) ) for c in linear[ 0 : 3 ] ] )
+
+
+    #=========================================================================
+    @staticmethod
+    def from_xyz( xyz ):
+        """
+        Creates a color from CIE XYZ components.
+
+        @param xyz A 3-sequence of X, Y, and Z
+        @return    A new Color instance (out-of-gamut channels are clipped)
+        """
+        return Color.from_linear( _transform( _LINEAR_FROM_XYZ, xyz ) )
+
+
     #=========================================================================
     @staticmethod
     def int2rgb( integer ):
@@ -73,6 +212,106 @@ class Color( object ):
         )
 
 
+    #=========================================================================
+    @staticmethod
+    def pack_many( rgb ):
+        """
+        Converts a batch of RGB colors into packed, 24-bit integer values.
+
+        @param rgb An (N,3) array or sequence of 3-sequences containing the
+                   8-bit values for each primary color channel
+        @return    An array of N packed colors with a `uint32` type
+        @throws    ImportError if NumPy is not installed
+        @throws    ValueError if the colors are not given as (N,3)
+        """
+        _require_numpy( 'Color.pack_many()' )
+        channels = numpy.asarray( rgb )
+        if channels.size == 0:
+            return numpy.zeros( 0, dtype = numpy.uint32 )
+        if ( channels.ndim != 2 ) or ( channels.shape[ 1 ] < 3 ):
+            raise ValueError(
+                'Unable to pack colors with shape {}.'.format( channels.shape )
+            )
+        channels = channels[ :, 0 : 3 ].astype( numpy.uint32 )
+        channels &= 0xFF
+        packed  = channels[ :, 0 ] << 16
+        packed |= channels[ :, 1 ] << 8
+        packed |= channels[ :, 2 ]
+        return packed
+
+
+    #=========================================================================
+    @staticmethod
+    def parse_many( values ):
+        """
+        Converts a batch of colors into packed, 24-bit integer values.
+
+        The representation of the colors is detected once for the entire
+        batch (from the first color).  All colors in the batch must use the
+        same representation.
+
+        @param values A sequence or array of colors using any of the
+                      representations supported by the `set()` method
+        @return       An array of packed colors with a `uint32` type
+        @throws       ImportError if NumPy is not installed
+        @throws       TypeError if the representation is not supported
+        @throws       ValueError if any string is not a hexadecimal color
+        """
+        _require_numpy( 'Color.parse_many()' )
+
+        # Arrays are already the same type for every color.
+        if isinstance( values, numpy.ndarray ):
+            if values.dtype.kind in 'SU':
+                return _parse_hex_many( values )
+            if values.ndim == 2:
+                return Color.pack_many( values )
+            return values.astype( numpy.uint32 )
+
+        # Check the first color to determine how to convert all colors.
+        values = list( values )
+        if len( values ) == 0:
+            return numpy.zeros( 0, dtype = numpy.uint32 )
+        first = values[ 0 ]
+
+        # integer colors
+        if isinstance( first, numbers.Integral ):
+            return numpy.array( values, dtype = numpy.uint32 )
+
+        # string colors
+        elif isstring( first ):
+            return _parse_hex_many( values )
+
+        # color objects
+        elif isinstance( first, Color ):
+            return numpy.array(
+                [ value._int for value in values ],
+                dtype = numpy.uint32
+            )
+
+        # mappings with RGB values
+        elif hasattr( first, 'keys' ):
+            return Color.pack_many(
+                [ ( v[ 'r' ], v[ 'g' ], v[ 'b' ] ) for v in values ]
+            )
+
+        # sequences with RGB values
+        elif hasattr( first, '__getitem__' ):
+            return Color.pack_many(
+                [ ( v[ 0 ], v[ 1 ], v[ 2 ] ) for v in values ]
+            )
+
+        # objects that appear to contain color information
+        elif hasattr( first, 'r' ) \
+         and hasattr( first, 'g' ) \
+         and hasattr( first, 'b' ):
+            return Color.pack_many( [ ( v.r, v.g, v.b ) for v in values ] )
+
+        # unable to figure out how to convert the colors
+        raise TypeError(
+            'Unable to use {} values to set colors.'.format( type( first ) )
+        )
+
+
     #=========================================================================
     @staticmethod
     def rgb2int( rgb, green = None, blue = None ):
@@ -94,6 +333,26 @@ class Color( object ):
         return Color.rgb2int( *rgb )
 
 
+    #=========================================================================
+    @staticmethod
+    def unpack_many( packed ):
+        """
+        Converts a batch of packed, 24-bit integer colors into RGB values.
+
+        @param packed An array or sequence of packed colors
+        @return       An (N,3) array of 8-bit channel values with a `uint8`
+                      type
+        @throws       ImportError if NumPy is not installed
+        """
+        _require_numpy( 'Color.unpack_many()' )
+        packed = numpy.asarray( packed, dtype = numpy.uint32 ).reshape( -1 )
+        rgb = numpy.empty( ( len( packed ), 3 ), dtype = numpy.uint8 )
+        rgb[ :, 0 ] = packed >> 16
+        rgb[ :, 1 ] = packed >> 8
+        rgb[ :, 2 ] = packed
+        return rgb
+
+
     #=========================================================================
     def __init__( self, value = 0x00000000 ):
         """
@@ -102,7 +361,7 @@ class Color( object ):
         @param value See: value parameter for the `set()` method
         """
         self._int    = 0
-        self._rgn    = ( 0, 0, 0 )
+        self._rgb    = ( 0, 0, 0 )
         self.strmode = self.STR_POUNDS
         self.set( value )
 
@@ -164,19 +423,13 @@ class Color( object ):
         """
 
         # integer color
-        if type( value ) is int:
-            self._int = value
+        if isinstance( value, numbers.Integral ):
+            self._int = int( value )
             self._rgb = self.int2rgb( self._int )
 
         # string color
         elif isstring( value ):
-            val = value.strip( '#' )
-            if val.startswith( '0x' ):
-                val = val[ 2 : ]
-            if len( val ) == 3:
-                val = ''.join( c * 2 for c in val )
-            self._int = int( val, 16 )
-            self._rgb = self.int2rgb( self._int )
+            self._int, self._rgb, _ = hex_cache( value )
 
         # sequence/mapping with RGB values
         elif hasattr( value, '__getitem__' ):
@@ -217,17 +470,1754 @@ class Color( object ):
             )
 
 
+    #=========================================================================
+    def to_hsl( self ):
+        """
+        Converts the color to HSL components.
+
+        @return A 3-tuple of hue, saturation, and lightness
+        """
+        h, l, s = colorsys.rgb_to_hls( *[ c / 255.0 for c in self._rgb ] )
+        return ( h, s, l )
+
+
+    #=========================================================================
+    def to_hsv( self ):
+        """
+        Converts the color to HSV components.
+
+        @return A 3-tuple of hue, saturation, and value
+        """
+        return colorsys.rgb_to_hsv( *[ c / 255.0 for c in self._rgb ] )
+
+
+    #=========================================================================
+    def to_lab( self ):
+        """
+        Converts the color to CIELAB components.
+
+        @return A 3-tuple of L*, a*, and b*
+        """
+        return _xyz_to_lab( self.to_xyz() )
+
+
+    #=========================================================================
+    def to_linear( self ):
+        """
+        Converts the color to linear-light RGB channels.
+
+        @return A 3-tuple of linear channel values
+        """
+        return tuple( _srgb_decode( c / 255.0 ) for c in self._rgb )
+
+
+    #=========================================================================
+    def to_xyz( self ):
+        """
+        Converts the color to CIE XYZ components.
+
+        @return A 3-tuple of X, Y, and Z
+        """
+        return _transform( _XYZ_FROM_LINEAR, self.to_linear() )
+
+
 #=============================================================================
-def isstring( obj ):
+class FrozenColor( Color ):
     """
-    Wrapper to provide Python 2 and 3 support for string type testing.
+    Immutable color representational object.
 
-    @param obj The object to test to see if it is a string
-    @return    True if the object is a string
+    Frozen colors can be safely shared between any number of users (see:
+    `Color.from_hex()`).  Any attempt to change the color raises an
+    AttributeError.
     """
-    try:
-        result = isinstance( obj, basestring )
-    except NameError:
-        result = isinstance( obj, str )
-    return result
 
+
+    #=========================================================================
+    __slots__ = ()
+
+
+    #=========================================================================
+    def __init__( self, value = 0x00000000 ):
+        """
+        Initializes a FrozenColor object.
+
+        @param value See: value parameter for the `Color.set()` method
+        """
+        color = Color( value )
+        for name in Color.__slots__:
+            object.__setattr__( self, name, getattr( color, name ) )
+
+
+    #=========================================================================
+    def __delattr__( self, name ):
+        """
+        Prevents deleting attributes.
+        """
+        raise AttributeError( 'Frozen colors can not be modified.' )
+
+
+    #=========================================================================
+    def __setattr__( self, name, value ):
+        """
+        Prevents changing attributes.
+        """
+        raise AttributeError( 'Frozen colors can not be modified.' )
+
+
+    #=========================================================================
+    def set( self, value ):
+        """
+        Prevents changing the color.
+        """
+        raise AttributeError( 'Frozen colors can not be modified.' )
+
+
+#=============================================================================
+class ColorAlpha( Color ):
+    """
+    Color representational object with an alpha channel.
+
+    Numeric representations use 32 bits with 8 bits per channel.  By
+    default, the alpha channel occupies the high-order bits (ARGB).  Set the
+    class's `order` attribute to `ORDER_RGBA` to use RGBA ordering for all
+    numeric input and output instead.  String representations always list
+    the alpha channel last (e.g. "#RRGGBBAA").
+    """
+
+
+    #=========================================================================
+    # Possible numeric channel orders
+
+    ORDER_ARGB = 0          # 0xAARRGGBB
+    ORDER_RGBA = 1          # 0xRRGGBBAA
+
+
+    #=========================================================================
+    # The channel order used for all numeric input and output.
+    order = ORDER_ARGB
+
+
+    #=========================================================================
+    # Instances also store the alpha channel.
+    __slots__ = ( '_alpha', )
+
+
+    #=========================================================================
+    @staticmethod
+    def int2rgba( integer, order = None ):
+        """
+        Converts a color represented by a 32-bit integer value into an RGBA
+        tuple.
+
+        @param integer A 32-bit integer representation of the color
+        @param order   The channel order of the integer (default is the
+                       class's `order` attribute)
+        @return        A 4-tuple containing the 8-bit integer values for each
+                       color channel followed by the alpha channel
+        """
+        if order is None:
+            order = ColorAlpha.order
+        if order == ColorAlpha.ORDER_RGBA:
+            rgb   = integer >> 8
+            alpha = integer & 0xFF
+        else:
+            rgb   = integer & 0xFFFFFF
+            alpha = ( integer >> 24 ) & 0xFF
+        return Color.int2rgb( rgb ) + ( alpha, )
+
+
+    #=========================================================================
+    @staticmethod
+    def pack_many( rgba, order = None ):
+        """
+        Converts a batch of RGBA colors into packed, 32-bit integer values.
+
+        @param rgba  An array of 8-bit channel values with a last dimension
+                     of 4 channels (red, green, blue, then alpha) and any
+                     number of leading dimensions (e.g. an (h,w,4) image)
+        @param order The channel order of the packed colors (default is the
+                     class's `order` attribute)
+        @return      An array of packed colors with a `uint32` type, and the
+                     leading dimensions of the channel array
+        @throws      ImportError if NumPy is not installed
+        @throws      ValueError if the last dimension is not 4 channels
+        """
+        _require_numpy( 'ColorAlpha.pack_many()' )
+        channels = numpy.asarray( rgba )
+        if ( channels.ndim == 0 ) or ( channels.shape[ -1 ] != 4 ):
+            raise ValueError(
+                'Unable to pack colors with shape {}.'.format( channels.shape )
+            )
+        octets = numpy.empty( channels.shape, dtype = numpy.uint8 )
+        octets[ ..., _rgba_indices( order ) ] = channels
+        return _pack_channels( octets )
+
+
+    #=========================================================================
+    @staticmethod
+    def rgba2int( rgba, order = None ):
+        """
+        Converts a color represented by an RGBA tuple into a 32-bit integer
+        value.
+
+        @param rgba  A 4-tuple containing the 8-bit values for each color
+                     channel followed by the alpha channel
+        @param order The channel order of the integer (default is the class's
+                     `order` attribute)
+        @return      The 32-bit integer representation of the color
+        """
+        if order is None:
+            order = ColorAlpha.order
+        rgb   = Color.rgb2int( rgba[ 0 : 3 ] )
+        alpha = rgba[ 3 ] & 0xFF
+        if order == ColorAlpha.ORDER_RGBA:
+            return ( rgb << 8 ) | alpha
+        return ( alpha << 24 ) | rgb
+
+
+    #=========================================================================
+    @staticmethod
+    def unpack_many( packed, order = None ):
+        """
+        Converts a batch of packed, 32-bit integer colors into RGBA values.
+
+        @param packed An array or sequence of packed colors (any shape)
+        @param order  The channel order of the packed colors (default is the
+                      class's `order` attribute)
+        @return       An array of 8-bit channel values with a `uint8` type,
+                      and one extra dimension of 4 channels (red, green,
+                      blue, then alpha)
+        @throws       ImportError if NumPy is not installed
+        """
+        _require_numpy( 'ColorAlpha.unpack_many()' )
+        return _channels( packed )[ ..., _rgba_indices( order ) ]
+
+
+    #=========================================================================
+    def __init__( self, value = 0x00000000 ):
+        """
+        Initializes a ColorAlpha object.
+
+        @param value See: value parameter for the `set()` method
+        """
+        self._alpha = 0xFF
+        super( ColorAlpha, self ).__init__( value )
+
+
+    #=========================================================================
+    def __int__( self ):
+        """
+        Provides conversion to integer representation.
+
+        @return The 32-bit integer representation of this color in the
+                class's channel order
+        """
+        return self.rgba2int( self._rgb + ( self._alpha, ) )
+
+
+    #=========================================================================
+    def __str__( self ):
+        """
+        Produces a shorthand hexadecimal string representing the color.
+
+        @return A hexadecimal string representation of the color with the
+                alpha channel listed last
+        """
+        rgba = ( Color.rgb2int( self._rgb ) << 8 ) | self._alpha
+        if self.strmode == self.STR_LITERAL:
+            return '0x{:08X}'.format( rgba )
+        elif self.strmode == self.STR_PLAIN:
+            return '{:08X}'.format( rgba )
+        return '#{:08X}'.format( rgba )
+
+
+    #=========================================================================
+    def __tuple__( self ):
+        """
+        Provides conversion to tuple representation.
+
+        @return The RGBA tuple representation of this color
+        """
+        return self._rgb + ( self._alpha, )
+
+
+    #=========================================================================
+    def set( self, value ):
+        """
+        Set the color using type/format auto-detection.
+
+        @param value A color representation in any format supported by
+                     `Color.set()`, with the following extensions for the
+                     alpha channel (colors without alpha are opaque):
+                     - A 32-bit integer in the class's channel order
+                     - A hexadecimal string given as "RGBA" or "RRGGBBAA"
+                     - A sequence with a fourth item for alpha
+                     - A mapping with an 'a' key for alpha
+                     - An object with an 'a' attribute for alpha
+        """
+
+        rgba = None
+
+        # integer color
+        if isinstance( value, numbers.Integral ):
+            rgba = self.int2rgba( int( value ) )
+
+        # string color (with an alpha channel when given 4 or 8 digits)
+        elif isstring( value ):
+            packed = hex_cache( value )[ 2 ]
+            if packed is not None:
+                rgba = self.int2rgba( packed, self.ORDER_RGBA )
+
+        # mapping with an alpha channel
+        elif hasattr( value, 'keys' ):
+            if 'a' in value:
+                rgba = (
+                    value[ 'r' ], value[ 'g' ], value[ 'b' ], value[ 'a' ]
+                )
+
+        # sequence with an alpha channel
+        elif hasattr( value, '__getitem__' ):
+            if hasattr( value, '__len__' ) and ( len( value ) >= 4 ):
+                rgba = tuple( value[ 0 : 4 ] )
+
+        # object with an alpha channel
+        elif hasattr( value, 'a' ):
+            rgba = ( value.r, value.g, value.b, value.a )
+
+        # opaque color
+        if rgba is None:
+            super( ColorAlpha, self ).set( value )
+            self._alpha = 0xFF
+            return
+
+        self._rgb   = tuple( rgba[ 0 : 3 ] )
+        self._int   = Color.rgb2int( self._rgb )
+        self._alpha = rgba[ 3 ] & 0xFF
+
+
+#=============================================================================
+class ColorArray( object ):
+    """
+    Compact, array-backed container of 24-bit colors.
+
+    All colors are stored in a single, contiguous buffer of packed `uint32`
+    values (4 bytes per color).  `Color` objects are only created when an
+    individual element is indexed.  Slicing with a step of 1 produces a new
+    `ColorArray` that shares the same buffer (other slices are copied to
+    keep every buffer contiguous).
+
+    The red, green, and blue channels are available as zero-copy views onto
+    the buffer through the `r`, `g`, `b`, and `rgb` attributes.  Writing to
+    a channel view modifies the colors in the array.
+
+    The buffer itself is shared without copying through `numpy.asarray()`,
+    or `memoryview( colors.data )`.  Python 3.12 and newer also support
+    `memoryview( colors )` directly (older versions do not let Python
+    classes export buffers).
+    """
+
+
+    #=========================================================================
+    # Byte offsets of each channel within a packed color.
+    if sys.byteorder == 'little':
+        _offsets = ( 2, 1, 0 )
+    else:
+        _offsets = ( 1, 2, 3 )
+
+
+    #=========================================================================
+    def __init__( self, colors = 0 ):
+        """
+        Initializes a ColorArray object.
+
+        @param colors The initial colors in the array as one of the following:
+                      - An integer number of colors (all black)
+                      - A 1-D array of packed colors (used without copying
+                        if it is a contiguous `uint32` array)
+                      - An (N,3) array of 8-bit RGB channel values
+                      - Any sequence of colors supported by
+                        `Color.parse_many()`
+        @throws       ImportError if NumPy is not installed
+        """
+        _require_numpy( 'ColorArray' )
+        if isinstance( colors, numbers.Integral ):
+            data = numpy.zeros( colors, dtype = numpy.uint32 )
+        elif isinstance( colors, ColorArray ):
+            data = colors.data
+        elif isinstance( colors, numpy.ndarray ) \
+         and ( colors.ndim == 1 ) \
+         and ( colors.dtype.kind in 'iu' ):
+            data = numpy.ascontiguousarray( colors, dtype = numpy.uint32 )
+        else:
+            data = Color.parse_many( colors )
+        self.data = data
+
+
+    #=========================================================================
+    def __array__( self, dtype = None ):
+        """
+        Provides the packed colors to NumPy without copying.
+
+        @param dtype Optional array type requested by NumPy
+        @return      The array of packed colors
+        """
+        if dtype is None:
+            return self.data
+        return self.data.astype( dtype )
+
+
+    #=========================================================================
+    def __buffer__( self, flags ):
+        """
+        Supports the buffer protocol (Python 3.12 and newer;  use
+        `memoryview( colors.data )` on older versions).
+
+        @param flags The buffer request flags
+        @return      A memoryview of the packed colors
+        """
+        return memoryview( self.data )
+
+
+    #=========================================================================
+    def __getattr__( self, name ):
+        """
+        Provides access to zero-copy views of the color channels.
+
+        r   The red channel as an array of `uint8` values
+        g   The green channel as an array of `uint8` values
+        b   The blue channel as an array of `uint8` values
+        rgb An (N,3) array of `uint8` channel values
+
+        @param name The name of the attribute to retrieve
+        @return     The value of the requested attribute
+        @throws     AttributeError for invalid attributes
+        """
+        if name in ( 'r', 'g', 'b', 'rgb' ):
+            octets = self.data.view( numpy.uint8 ).reshape( ( -1, 4 ) )
+            if name == 'r':
+                return octets[ :, self._offsets[ 0 ] ]
+            elif name == 'g':
+                return octets[ :, self._offsets[ 1 ] ]
+            elif name == 'b':
+                return octets[ :, self._offsets[ 2 ] ]
+            elif self._offsets[ 0 ] > self._offsets[ 2 ]:
+                return octets[ :, self._offsets[ 0 ] : : -1 ]
+            return octets[ :, self._offsets[ 0 ] : ]
+        raise AttributeError(
+            "{} object has no attribute '{}'".format(
+                self.__class__.__name__,
+                name
+            )
+        )
+
+
+    #=========================================================================
+    def __getitem__( self, index ):
+        """
+        Retrieves a color, or a view of a range of colors.
+
+        @param index The integer index of a color, or a slice of colors
+        @return      A Color object for a single color, or a ColorArray for
+                     a slice
+        """
+        if isinstance( index, numbers.Integral ):
+            return Color( int( self.data[ index ] ) )
+        return ColorArray( self.data[ index ] )
+
+
+    #=========================================================================
+    def __iter__( self ):
+        """
+        Provides an iterator interface to the colors.
+
+        @return An iterable object that produces a Color for each position
+        """
+        for value in self.data.tolist():
+            yield Color( value )
+
+
+    #=========================================================================
+    def __len__( self ):
+        """
+        Produces the number of colors in the array.
+
+        @return The number of colors in the array
+        """
+        return len( self.data )
+
+
+    #=========================================================================
+    def __setitem__( self, index, value ):
+        """
+        Modifies a color, or a range of colors.
+
+        @param index The integer index of a color, or a slice of colors
+        @param value A color (any value supported by `Color.set()`) for a
+                     single index, or a batch of colors for a slice
+        """
+        if isinstance( index, numbers.Integral ):
+            if isinstance( value, Color ) == False:
+                value = Color( value )
+            self.data[ index ] = value._int
+        elif isinstance( value, ColorArray ):
+            self.data[ index ] = value.data
+        else:
+            self.data[ index ] = Color.parse_many( value )
+
+
+    #=========================================================================
+    def tobytes( self ):
+        """
+        Produces the raw contents of the color buffer.
+
+        @return A byte string of the packed colors in native byte order
+        """
+        return self.data.tobytes()
+
+
+#=============================================================================
+class LRUCache( object ):
+    """
+    Bounded, least-recently-used cache of a function's results.
+
+    The cached function must accept a single, hashable argument.  When the
+    cache is full, the result that was used the longest time ago is
+    discarded.
+    """
+
+
+    #=========================================================================
+    def __init__( self, function, size = 1024 ):
+        """
+        Initializes an LRUCache object.
+
+        @param function The function that computes results that are missing
+                        from the cache
+        @param size     The maximum number of results to keep in the cache
+        """
+        self.function = function
+        self.hits     = 0
+        self.misses   = 0
+        self._size    = 0
+        self._results = collections.OrderedDict()
+        self.size     = size
+
+
+    #=========================================================================
+    def __call__( self, key ):
+        """
+        Retrieves the result for an argument, computing it only when it is
+        not already in the cache.
+
+        @param key The argument to the cached function
+        @return    The result of the cached function
+        """
+
+        # Results are ordered from the least- to the most-recently-used.
+        results = self._results
+        if key in results:
+            result = results.pop( key )
+            results[ key ] = result
+            self.hits += 1
+            return result
+
+        # Compute a missing result, and discard the oldest result if needed.
+        self.misses += 1
+        result = self.function( key )
+        if self._size < 1:
+            return result
+        while len( results ) >= self._size:
+            results.popitem( last = False )
+        results[ key ] = result
+        return result
+
+
+    #=========================================================================
+    def __len__( self ):
+        """
+        Produces the number of results currently in the cache.
+
+        @return The number of cached results
+        """
+        return len( self._results )
+
+
+    #=========================================================================
+    def clear( self ):
+        """
+        Discards all cached results, and resets the statistics.
+        """
+        self._results.clear()
+        self.hits   = 0
+        self.misses = 0
+
+
+    #=========================================================================
+    @property
+    def size( self ):
+        """
+        The maximum number of results kept in the cache.
+        """
+        return self._size
+
+
+    #=========================================================================
+    @size.setter
+    def size( self, size ):
+        """
+        Changes the maximum number of results kept in the cache (discarding
+        the least-recently-used results as needed).
+        """
+        if size < 0:
+            raise ValueError( 'Invalid cache size: {}'.format( size ) )
+        self._size = size
+        while len( self._results ) > size:
+            self._results.popitem( last = False )
+
+
+    #=========================================================================
+    def stats( self ):
+        """
+        Reports the cache's usage statistics.
+
+        @return A dictionary with the number of 'hits' and 'misses', the
+                maximum 'size' of the cache, and the current 'length' of the
+                cache
+        """
+        return {
+            'hits'   : self.hits,
+            'misses' : self.misses,
+            'size'   : self._size,
+            'length' : len( self._results )
+        }
+
+
+#=============================================================================
+class Palette( object ):
+    """
+    Indexes a fixed list of colors for fast nearest-color queries (color
+    quantization).
+
+    Queries normally use a precomputed lookup cube:  each RGB channel is
+    reduced to a number of bits, and every cell of the resulting cube stores
+    the index of the palette color nearest to the cell's center.  Entire
+    images are then mapped with a single table lookup per pixel.  Exact
+    queries compare every pixel to every palette color instead.
+
+    Distances are measured in either sRGB or CIELAB space.  Use `get()` to
+    share built palette indexes between all users of the same palette.
+    """
+
+
+    #=========================================================================
+    # Cache of built palettes (see: `get()`)
+    _cache      = collections.OrderedDict()
+    _cache_size = 32
+
+
+    #=========================================================================
+    # Number of rows compared at once during exact queries and cube builds
+    _chunk = 0x4000
+
+
+    #=========================================================================
+    @staticmethod
+    def clear_cache():
+        """
+        Discards all cached palette indexes.
+        """
+        Palette._cache.clear()
+
+
+    #=========================================================================
+    @staticmethod
+    def get( colors, space = SPACE_SRGB, bits = 5 ):
+        """
+        Retrieves a shared palette index, building it only once for each
+        unique palette and set of options.
+
+        @param colors The palette colors (see: `__init__()`)
+        @param space  The color space used to measure distances
+        @param bits   The number of bits per channel in the lookup cube
+        @return       A Palette instance
+        """
+        packed = Color.parse_many( colors )
+        key = ( packed.tobytes(), space, bits )
+        cache = Palette._cache
+        if key in cache:
+            palette = cache.pop( key )
+        else:
+            palette = Palette( packed, space, bits )
+            while len( cache ) >= Palette._cache_size:
+                cache.popitem( last = False )
+        cache[ key ] = palette
+        return palette
+
+
+    #=========================================================================
+    def __init__( self, colors, space = SPACE_SRGB, bits = 5 ):
+        """
+        Initializes a Palette object.
+
+        @param colors The palette colors as a sequence of Color objects, or
+                      any batch of colors supported by `Color.parse_many()`
+        @param space  The color space used to measure distances (SPACE_SRGB
+                      or SPACE_LAB)
+        @param bits   The number of bits per channel in the lookup cube (1 to
+                      8); more bits give more accurate queries, but use more
+                      memory and take longer to build
+        @throws       ImportError if NumPy is not installed
+        @throws       ValueError if the palette is empty, or an option is not
+                      supported
+        """
+        _require_numpy( 'Palette' )
+        if space not in ( SPACE_SRGB, SPACE_LAB ):
+            raise ValueError( 'Unsupported palette color space: {}'.format(
+                space
+            ) )
+        if ( bits < 1 ) or ( bits > 8 ):
+            raise ValueError( 'Unsupported lookup cube size: {}'.format(
+                bits
+            ) )
+        self.colors = Color.parse_many( colors )
+        if len( self.colors ) == 0:
+            raise ValueError( 'Unable to index an empty palette.' )
+        self.space   = space
+        self.bits    = bits
+        self._points = self._space_points( Color.unpack_many( self.colors ) )
+        self._cube   = None
+
+
+    #=========================================================================
+    def __getitem__( self, index ):
+        """
+        Retrieves a palette color.
+
+        @param index The index of the color in the palette
+        @return      A Color object for the palette color
+        """
+        return Color( int( self.colors[ index ] ) )
+
+
+    #=========================================================================
+    def __len__( self ):
+        """
+        Produces the number of colors in the palette.
+
+        @return The number of colors in the palette
+        """
+        return len( self.colors )
+
+
+    #=========================================================================
+    def nearest( self, colors, exact = False, channels = None ):
+        """
+        Finds the nearest palette color for a batch of colors.
+
+        @param colors   An array of packed colors (any shape), an array of
+                        8-bit RGB channels with a last dimension of 3, or any
+                        batch of colors supported by `Color.parse_many()`
+        @param exact    Set to true to compare every color to every palette
+                        color instead of using the lookup cube
+        @param channels Set to true if the colors are an array of RGB
+                        channels, or false if they are packed colors;  By
+                        default, only `uint8` arrays with a last dimension of
+                        3 are treated as channels.
+        @return         An array of palette indexes with the same shape as the
+                        batch of colors (without the channel dimension)
+        """
+        rgb = self._rgb_argument( colors, channels )
+        if exact:
+            points = self._space_points( rgb.reshape( ( -1, 3 ) ) )
+            result = _nearest_many( points, self._points, self._chunk )
+            return result.reshape( rgb.shape[ : -1 ] )
+        shift = 8 - self.bits
+        cells = rgb.astype( numpy.uint32 ) >> shift
+        index = ( cells[ ..., 0 ] << ( 2 * self.bits ) ) \
+              | ( cells[ ..., 1 ] << self.bits ) \
+              | cells[ ..., 2 ]
+        return self._lookup_cube()[ index ]
+
+
+    #=========================================================================
+    def quantize( self, colors, exact = False, channels = None ):
+        """
+        Replaces each color in a batch with its nearest palette color.
+
+        @param colors   The batch of colors (see: `nearest()`)
+        @param exact    Set to true to skip the lookup cube (see: `nearest()`)
+        @param channels Set to true if the colors are an array of RGB channels
+                        (see: `nearest()`)
+        @return         An array of packed palette colors with the same shape
+                        as the batch of colors
+        """
+        return self.colors[ self.nearest( colors, exact, channels ) ]
+
+
+    #=========================================================================
+    def _lookup_cube( self ):
+        """
+        Provides the lookup cube, building it on first use.
+
+        @return A flat array of palette indexes for every cell of the cube
+        """
+        if self._cube is None:
+            size   = 1 << self.bits
+            step   = 256.0 / size
+            levels = numpy.arange( size ) * step + ( step - 1 ) / 2.0
+            red, green, blue = numpy.meshgrid(
+                levels,
+                levels,
+                levels,
+                indexing = 'ij'
+            )
+            centers = numpy.stack(
+                ( red.ravel(), green.ravel(), blue.ravel() ),
+                axis = -1
+            )
+            points = self._space_points( centers )
+            self._cube = _nearest_many( points, self._points, self._chunk )
+        return self._cube
+
+
+    #=========================================================================
+    def _rgb_argument( self, colors, channels ):
+        """
+        Converts a query argument into an array of RGB channel values.
+
+        @param colors   The batch of colors (see: `nearest()`)
+        @param channels True if the colors are channels, false if they are
+                        packed, or None to detect channels (see: `nearest()`)
+        @return         An array of 8-bit channel values with a last dimension
+                        of 3
+        @throws         ValueError if channels are requested, but the colors
+                        do not have a last dimension of 3
+        """
+        if channels is None:
+            channels = isinstance( colors, numpy.ndarray ) \
+                and ( colors.dtype == numpy.uint8 ) \
+                and ( colors.ndim > 1 ) and ( colors.shape[ -1 ] == 3 )
+        if channels:
+            colors = numpy.asarray( colors )
+            if ( colors.ndim < 1 ) or ( colors.shape[ -1 ] != 3 ):
+                raise ValueError(
+                    'Expected RGB channels, not an array of shape {}.'.format(
+                        colors.shape
+                    )
+                )
+            return colors
+        if isinstance( colors, numpy.ndarray ) \
+        and ( colors.dtype.kind in 'iu' ):
+            packed = colors
+        else:
+            packed = Color.parse_many( colors )
+        shape = numpy.shape( packed )
+        return Color.unpack_many( packed ).reshape( shape + ( 3, ) )
+
+
+    #=========================================================================
+    def _space_points( self, rgb ):
+        """
+        Converts RGB channel values into points in the palette's color space.
+
+        @param rgb An (N,3) array of RGB channel values from 0 to 255
+        @return    An (N,3) array of points used to measure distances
+        """
+        if self.space == SPACE_LAB:
+            return convert_many( rgb / 255.0, SPACE_SRGB, SPACE_LAB )
+        return rgb.astype( float )
+
+
+#=============================================================================
+# Shared caches for parsing hexadecimal color strings (the size of each cache
+# may be changed by setting its `size` attribute)
+hex_cache = LRUCache( lambda value: _parse_hex( value ), 1024 )
+interned  = LRUCache( FrozenColor, 1024 )
+
+
+#=============================================================================
+# Porter-Duff compositing operators
+OP_OVER = 0             # source over destination
+OP_IN   = 1             # source in destination
+OP_OUT  = 2             # source out of destination
+OP_ATOP = 3             # source atop destination
+
+
+#=============================================================================
+def composite( source, dest, op = OP_OVER, order = None, out = None ):
+    """
+    Composites arrays of premultiplied, packed 32-bit colors using one of the
+    Porter-Duff operators.
+
+    Every channel (including alpha) of the result is computed as:
+
+        result = source * Fa + dest * Fb
+
+    where the factors for each operator are:
+
+        OP_OVER  Fa = 1               Fb = 1 - source_alpha
+        OP_IN    Fa = dest_alpha      Fb = 0
+        OP_OUT   Fa = 1 - dest_alpha  Fb = 0
+        OP_ATOP  Fa = dest_alpha      Fb = 1 - source_alpha
+
+    @param source The source (top layer) array of packed colors
+    @param dest   The destination (bottom layer) array of packed colors with
+                  the same shape as the source (or a single packed color)
+    @param op     The compositing operator (one of the OP_* constants)
+    @param order  The channel order of the packed colors (default is the
+                  `ColorAlpha.order` attribute)
+    @param out    Optional, preallocated `uint32` array to receive the result
+                  (may be the same array as `dest` to flatten layers in place)
+    @return       The array of composited, premultiplied colors
+    @throws       ImportError if NumPy is not installed
+    @throws       ValueError if the operator is not supported
+    """
+    _require_numpy( 'composite()' )
+    src = _channels( source )
+    dst = _channels( numpy.broadcast_to( dest, numpy.shape( source ) ) )
+    alpha = _alpha_index( order )
+
+    # Determine the factors for the requested operator.
+    opaque = numpy.uint16( 0xFF )
+    if op == OP_OVER:
+        fa = None
+        fb = opaque - src[ ..., alpha ]
+    elif op == OP_IN:
+        fa = dst[ ..., alpha ].astype( numpy.uint16 )
+        fb = None
+    elif op == OP_OUT:
+        fa = opaque - dst[ ..., alpha ]
+        fb = None
+    elif op == OP_ATOP:
+        fa = dst[ ..., alpha ].astype( numpy.uint16 )
+        fb = opaque - src[ ..., alpha ]
+    else:
+        raise ValueError( 'Unknown compositing operator: {}'.format( op ) )
+
+    # Scale and sum both layers for all channels.
+    if fa is None:
+        result = src.astype( numpy.uint16 )
+    else:
+        result = _mul255( src, fa[ ..., None ] )
+    if fb is not None:
+        result += _mul255( dst, fb[ ..., None ] )
+    numpy.minimum( result, 0xFF, out = result )
+    return _pack_channels( result, out )
+
+
+#=============================================================================
+def premultiply( colors, order = None, out = None ):
+    """
+    Multiplies the color channels of packed 32-bit colors by their alpha
+    channel.
+
+    @param colors The array of packed, straight-alpha colors
+    @param order  The channel order of the packed colors (default is the
+                  `ColorAlpha.order` attribute)
+    @param out    Optional, preallocated `uint32` array to receive the result
+                  (may be the same array as `colors`)
+    @return       The array of premultiplied colors
+    @throws       ImportError if NumPy is not installed
+    """
+    _require_numpy( 'premultiply()' )
+    channels = _channels( colors )
+    alpha    = _alpha_index( order )
+    result   = _mul255( channels, channels[ ..., alpha, None ] )
+    result[ ..., alpha ] = channels[ ..., alpha ]
+    return _pack_channels( result, out )
+
+
+#=============================================================================
+def unpremultiply( colors, order = None, out = None ):
+    """
+    Divides the color channels of premultiplied, packed 32-bit colors by
+    their alpha channel.  Fully transparent colors become transparent black.
+
+    @param colors The array of packed, premultiplied colors
+    @param order  The channel order of the packed colors (default is the
+                  `ColorAlpha.order` attribute)
+    @param out    Optional, preallocated `uint32` array to receive the result
+                  (may be the same array as `colors`)
+    @return       The array of straight-alpha colors
+    @throws       ImportError if NumPy is not installed
+    """
+    _require_numpy( 'unpremultiply()' )
+    channels = _channels( colors ).astype( numpy.uint32 )
+    alpha    = _alpha_index( order )
+    divisor  = channels[ ..., alpha, None ]
+    result   = channels * 255 + ( divisor >> 1 )
+    result //= numpy.maximum( divisor, 1 )
+    numpy.minimum( result, 0xFF, out = result )
+    result[ ..., alpha ] = channels[ ..., alpha ]
+    return _pack_channels( result, out )
+
+
+#=============================================================================
+def convert_many( values, source, target ):
+    """
+    Converts an array of colors from one color space to another.
+
+    Conversions from 8-bit sRGB use a precomputed lookup table for the sRGB
+    transfer function, and conversions to sRGB use a 16-bit lookup table for
+    its inverse, so entire images are converted with a few vectorized passes.
+
+    @param values An array of colors with a last dimension of 3 channels
+                  (any number of leading dimensions);  sRGB colors are given
+                  as 8-bit integers, or as floating-point values from 0 to 1
+    @param source The color space of the given colors (a SPACE_* constant)
+    @param target The color space of the result (a SPACE_* constant)
+    @return       An array of the converted colors with the same shape;  sRGB
+                  results are always 8-bit (`uint8`) channel values
+    @throws       ImportError if NumPy is not installed
+    @throws       ValueError if either color space is not supported
+    """
+    _require_numpy( 'convert_many()' )
+    spaces = (
+        SPACE_SRGB, SPACE_LINEAR, SPACE_HSV, SPACE_HSL, SPACE_XYZ, SPACE_LAB
+    )
+    if ( source not in spaces ) or ( target not in spaces ):
+        raise ValueError(
+            'Unknown color space conversion: {} to {}'.format( source, target )
+        )
+    values = numpy.asarray( values )
+
+    # Conversions involving cylindrical spaces use sRGB channel values.
+    if target in ( SPACE_HSV, SPACE_HSL ):
+        if source == target:
+            return values.astype( float )
+        rgb = _srgb_float_many( values, source )
+        if target == SPACE_HSV:
+            return _rgb_to_hsv_many( rgb )
+        return _rgb_to_hsl_many( rgb )
+
+    # Conversions to 8-bit sRGB.
+    if target == SPACE_SRGB:
+        if ( source == SPACE_SRGB ) and ( values.dtype.kind in 'iu' ):
+            return values.astype( numpy.uint8 )
+        if source in ( SPACE_SRGB, SPACE_HSV, SPACE_HSL ):
+            rgb = _srgb_float_many( values, source )
+            return _to8_many( rgb )
+        return _srgb_encode8_many( _linear_many( values, source ) )
+
+    # All other conversions pass through linear RGB.
+    linear = _linear_many( values, source )
+    if target == SPACE_LINEAR:
+        return linear
+    xyz = _transform_many( _XYZ_FROM_LINEAR, linear )
+    if target == SPACE_XYZ:
+        return xyz
+    return _xyz_to_lab_many( xyz )
+
+
+#=============================================================================
+# Resampling filters
+FILTER_BOX     = 0      # area-averaging box filter
+FILTER_LANCZOS = 1      # three-lobed Lanczos (windowed sinc) filter
+
+
+#=============================================================================
+def resample( colors, size, filter = FILTER_LANCZOS, order = None ):
+    """
+    Resizes an image of packed, straight-alpha 32-bit colors.
+
+    The image is filtered separately along each axis.  Channels are filtered
+    as premultiplied, linear-light values, so transparent and dark regions
+    do not bleed into the result.  The box filter averages the area covered
+    by each output pixel.  The Lanczos filter produces sharper results when
+    reducing images (e.g. for icons).
+
+    @param colors The (h,w) array of packed colors
+    @param size   The (w,h) dimensions of the result
+    @param filter The resampling filter (one of the FILTER_* constants)
+    @param order  The channel order of the packed colors (default is the
+                  `ColorAlpha.order` attribute)
+    @return       The (h,w) array of resized, packed colors
+    @throws       ImportError if NumPy is not installed
+    @throws       ValueError if the filter is not supported, or either image
+                  is empty
+    """
+    _require_numpy( 'resample()' )
+    colors = numpy.asarray( colors, dtype = numpy.uint32 )
+    width, height = int( size[ 0 ] ), int( size[ 1 ] )
+    if ( min( width, height ) < 1 ) or ( colors.ndim != 2 ) \
+    or ( colors.size == 0 ):
+        raise ValueError( 'Unable to resample an empty image.' )
+    rows    = _resample_weights( colors.shape[ 0 ], height, filter )
+    columns = _resample_weights( colors.shape[ 1 ], width, filter )
+
+    # Premultiply linear-light channels.
+    rgba   = ColorAlpha.unpack_many( colors, order )
+    values = numpy.empty( rgba.shape )
+    values[ ..., 3 ] = rgba[ ..., 3 ] / 255.0
+    values[ ..., : 3 ] = _srgb_decode_table()[ rgba[ ..., : 3 ] ]
+    values[ ..., : 3 ] *= values[ ..., 3, None ]
+
+    # Filter each axis.
+    values = numpy.tensordot( rows, values, axes = ( 1, 0 ) )
+    values = numpy.tensordot( columns, values, axes = ( 1, 1 ) )
+    values = values.transpose( 1, 0, 2 )
+
+    # Clip any ringing, and restore straight-alpha sRGB channels.
+    alpha = numpy.clip( values[ ..., 3 ], 0.0, 1.0 )
+    rgb   = numpy.clip( values[ ..., : 3 ], 0.0, alpha[ ..., None ] )
+    rgb  /= numpy.maximum( alpha, 1e-12 )[ ..., None ]
+    rgba  = numpy.empty( alpha.shape + ( 4, ), dtype = numpy.uint8 )
+    rgba[ ..., : 3 ] = _srgb_encode8_many( rgb )
+    rgba[ ..., 3 ]   = _to8_many( alpha )
+    return ColorAlpha.pack_many( rgba, order )
+
+
+#=============================================================================
+def isstring( obj ):
+    """
+    Wrapper to provide Python 2 and 3 support for string type testing.
+
+    @param obj The object to test to see if it is a string
+    @return    True if the object is a string
+    """
+    try:
+        result = isinstance( obj, basestring )
+    except NameError:
+        result = isinstance( obj, str )
+    return result
+
+
+#=============================================================================
+def _alpha_index( order ):
+    """
+    Determines the byte offset of the alpha channel within packed colors.
+
+    @param order The channel order of the packed colors (None for the
+                 `ColorAlpha.order` attribute)
+    @return      The index of the alpha channel in each color's bytes
+    """
+    if order is None:
+        order = ColorAlpha.order
+    high = 3 if sys.byteorder == 'little' else 0
+    return high if order == ColorAlpha.ORDER_ARGB else 3 - high
+
+
+#=============================================================================
+def _channels( colors ):
+    """
+    Views an array of packed 32-bit colors as its individual channel bytes.
+
+    @param colors An array of packed colors (any shape)
+    @return       A `uint8` array with one extra dimension of 4 channels
+    """
+    colors = numpy.ascontiguousarray( colors, dtype = numpy.uint32 )
+    return colors.view( numpy.uint8 ).reshape( colors.shape + ( 4, ) )
+
+
+#=============================================================================
+def _mul255( channels, factors ):
+    """
+    Multiplies 8-bit channel values by 8-bit factors with correct rounding
+    (computes round( channels * factors / 255 ) using integer math).
+
+    @param channels The array of channel values
+    @param factors  The array of factors (broadcast against the channels)
+    @return         A `uint16` array of the scaled channel values
+    """
+    product  = channels.astype( numpy.uint16 ) * factors.astype( numpy.uint16 )
+    product += 0x80
+    product += product >> 8
+    product >>= 8
+    return product
+
+
+#=============================================================================
+def _nearest_many( points, targets, chunk ):
+    """
+    Finds the nearest target point for every point (squared Euclidean
+    distance) by comparing a limited number of points at once.
+
+    @param points  An (N,3) array of query points
+    @param targets An (M,3) array of target points
+    @param chunk   The maximum number of query points compared at once
+    @return        An array of N indexes into the target points
+    """
+    dtype   = numpy.uint8 if len( targets ) <= 0x100 else numpy.uint32
+    result  = numpy.empty( len( points ), dtype = dtype )
+    targets = numpy.asarray( targets, dtype = float )
+    norms   = ( targets ** 2 ).sum( axis = 1 )
+    for start in range( 0, len( points ), chunk ):
+        block = points[ start : start + chunk ]
+        distance  = numpy.dot( block, targets.T )
+        distance *= -2.0
+        distance += norms
+        result[ start : start + chunk ] = distance.argmin( axis = 1 )
+    return result
+
+
+#=============================================================================
+def _pack_channels( channels, out = None ):
+    """
+    Packs an array of channel values back into 32-bit colors.
+
+    @param channels An array of channel values with a last dimension of 4
+    @param out      Optional `uint32` array to receive the packed colors
+    @return         The array of packed colors
+    """
+    octets = channels.astype( numpy.uint8 )
+    packed = octets.view( numpy.uint32 ).reshape( channels.shape[ : -1 ] )
+    if out is None:
+        return packed
+    out[ ... ] = packed
+    return out
+
+
+#=============================================================================
+def _parse_hex( value ):
+    """
+    Parses a hexadecimal color string.
+
+    @param value A hexadecimal string given as "RGB", "RGBA", "RRGGBB", or
+                 "RRGGBBAA" with or without a leading pounds symbol or "0x"
+                 literal prefix
+    @return      A 3-tuple of the integer value of the string as parsed by
+                 `Color.set()` (only "RGB" shorthand is expanded), the RGB
+                 tuple of the integer value, and the "RRGGBBAA" integer value
+                 of strings with an alpha channel ("RGBA" shorthand is
+                 expanded) or None for strings without one
+    @throws      ValueError if the string is not a hexadecimal color
+    """
+    val = value.strip( '#' )
+    if val.startswith( '0x' ):
+        val = val[ 2 : ]
+    if len( val ) == 3:
+        val = ''.join( c * 2 for c in val )
+    integer = int( val, 16 )
+    rgba    = None
+    if len( val ) == 4:
+        rgba = int( ''.join( c * 2 for c in val ), 16 )
+    elif len( val ) == 8:
+        rgba = integer
+    return ( integer, Color.int2rgb( integer ), rgba )
+
+
+#=============================================================================
+def _parse_hex_many( values ):
+    """
+    Converts a batch of hexadecimal color strings into packed integers.
+
+    Strings are handled the same way as the `Color.set()` method:  pound
+    symbols and "0x" prefixes are removed, and 3-digit "RGB" strings are
+    expanded to "RRGGBB".  The strings are decoded as a matrix of character
+    codes, so the work is done in vectorized passes over the entire batch.
+
+    @param values A sequence or array of hexadecimal color strings
+    @return       An array of packed colors with a `uint32` type
+    @throws       ValueError if any string is not a hexadecimal color
+    """
+
+    # View the characters of each string as a row of character codes.
+    strings = numpy.ascontiguousarray( values )
+    if strings.dtype.kind == 'U':
+        ctype = numpy.uint32
+    elif strings.dtype.kind == 'S':
+        ctype = numpy.uint8
+    else:
+        raise TypeError( 'Unable to parse non-string colors.' )
+    count = len( strings )
+    width = strings.dtype.itemsize // numpy.dtype( ctype ).itemsize
+    if count == 0:
+        return numpy.zeros( 0, dtype = numpy.uint32 )
+    if width == 0:
+        raise ValueError( 'Unable to parse hexadecimal color string.' )
+    codes = strings.view( ctype ).reshape( ( count, width ) )
+
+    # Find the first and last digit positions after removing pound symbols
+    # from both ends, and a leading "0x" literal prefix.
+    pounds = ( codes == ord( '#' ) ) | ( codes == 0 )
+    start  = numpy.argmin( pounds, axis = 1 ).astype( numpy.int32 )
+    stop   = width - numpy.argmin( pounds[ :, : : -1 ], axis = 1 )
+    stop   = stop.astype( numpy.int32 )
+    stop[ pounds.all( axis = 1 ) ] = 0
+    rows   = numpy.arange( count )
+    head   = numpy.minimum( start, width - 1 )
+    tail   = numpy.minimum( start + 1, width - 1 )
+    prefix = ( codes[ rows, head ] == ord( '0' ) ) \
+           & ( codes[ rows, tail ] == ord( 'x' ) ) \
+           & ( start + 1 < stop )
+    start += prefix * 2
+    lengths = stop - start
+    if ( lengths.min() < 1 ) or ( lengths.max() > 8 ):
+        raise ValueError( 'Unable to parse hexadecimal color string.' )
+
+    # Decode every digit, and shift each into its position in the value.
+    if ctype is not numpy.uint8:
+        codes = numpy.minimum( codes, 0xFF )
+    digits = _hex_digits()[ codes ]
+    shifts = stop[ :, None ] - numpy.arange( 1, width + 1, dtype = 'i4' )
+    used   = ( shifts >= 0 ) & ( shifts < lengths[ :, None ] )
+    if numpy.logical_and( digits > 0xF, used ).any():
+        raise ValueError( 'Unable to parse hexadecimal color string.' )
+    digits  = digits.astype( numpy.uint32 )
+    digits *= used
+    shifts *= used
+    digits <<= ( shifts << 2 ).view( numpy.uint32 )
+    packed = numpy.bitwise_or.reduce( digits, axis = 1 )
+
+    # Expand "RGB" shorthand to "RRGGBB".
+    short = lengths == 3
+    if numpy.any( short ):
+        rgb = packed[ short ]
+        packed[ short ] = ( ( ( rgb >> 8 ) & 0xF ) * 0x110000 ) \
+                        | ( ( ( rgb >> 4 ) & 0xF ) * 0x001100 ) \
+                        | ( ( ( rgb >> 0 ) & 0xF ) * 0x000011 )
+    return packed
+
+
+#=============================================================================
+# Lookup table from ASCII character codes to hexadecimal digit values
+_hex_digit_table = None
+
+
+#=============================================================================
+def _hex_digits():
+    """
+    Provides a lookup table from ASCII character codes to hexadecimal digit
+    values.  Characters that are not hexadecimal digits map to 0xFF.
+
+    @return A 256-entry array of digit values
+    """
+    global _hex_digit_table
+    if _hex_digit_table is None:
+        table = numpy.full( 256, 0xFF, dtype = numpy.uint8 )
+        for value, char in enumerate( '0123456789abcdef' ):
+            table[ ord( char ) ] = value
+            table[ ord( char.upper() ) ] = value
+        _hex_digit_table = table
+    return _hex_digit_table
+
+
+#=============================================================================
+def _resample_weights( source, target, filter ):
+    """
+    Computes the weights of source pixels for each resampled pixel along one
+    axis.
+
+    @param source The number of source pixels
+    @param target The number of resampled pixels
+    @param filter The resampling filter (one of the FILTER_* constants)
+    @return       A (target,source) array of weights;  The weights of each
+                  resampled pixel sum to 1.
+    @throws       ValueError if the filter is not supported
+    """
+    scale = source / float( target )
+    edges = numpy.arange( target + 1 ) * scale
+
+    # Box weights are the overlap of each source pixel with the area of the
+    # resampled pixel.
+    if filter == FILTER_BOX:
+        low     = numpy.arange( source )
+        weights = numpy.minimum( edges[ 1 :, None ], low + 1.0 ) \
+                - numpy.maximum( edges[ : -1, None ], low )
+        numpy.maximum( weights, 0.0, out = weights )
+
+    # Lanczos weights are stretched to cover every source pixel when
+    # reducing.
+    elif filter == FILTER_LANCZOS:
+        stretch = max( scale, 1.0 )
+        centers = ( edges[ : -1 ] + edges[ 1 : ] ) / 2.0
+        offsets = ( numpy.arange( source ) + 0.5 - centers[ :, None ] )
+        offsets /= stretch
+        weights  = numpy.sinc( offsets ) * numpy.sinc( offsets / 3.0 )
+        weights[ numpy.abs( offsets ) >= 3.0 ] = 0.0
+
+    else:
+        raise ValueError( 'Unknown resampling filter: {}'.format( filter ) )
+
+    weights /= weights.sum( axis = 1 )[ :, None ]
+    return weights
+
+
+#=============================================================================
+def _rgba_indices( order ):
+    """
+    Determines the byte offsets of each channel within packed 32-bit colors.
+
+    @param order The channel order of the packed colors (None for the
+                 `ColorAlpha.order` attribute)
+    @return      A list of the indices of the red, green, blue, and alpha
+                 channels in each color's bytes
+    """
+    if order is None:
+        order = ColorAlpha.order
+    if order == ColorAlpha.ORDER_ARGB:
+        shifts = ( 16, 8, 0, 24 )
+    else:
+        shifts = ( 24, 16, 8, 0 )
+    if sys.byteorder == 'little':
+        return [ shift // 8 for shift in shifts ]
+    return [ 3 - shift // 8 for shift in shifts ]
+
+
+#=============================================================================
+def _chroma_to_rgb_many( hue, chroma, offset ):
+    """
+    Converts hue and chroma to RGB channel values (shared by the HSV and HSL
+    conversions).
+
+    @param hue    The array of hues (fractions of a full turn)
+    @param chroma The array of chroma values
+    @param offset The array of values added to every channel
+    @return       An array of RGB channel values with a last dimension of 3
+    """
+    sector = numpy.mod( hue, 1.0 ) * 6.0
+    second = chroma * ( 1.0 - numpy.abs( numpy.mod( sector, 2.0 ) - 1.0 ) )
+    zero   = numpy.zeros_like( chroma )
+    index  = numpy.minimum( sector.astype( int ), 5 )
+    c, x   = chroma, second
+    red    = numpy.choose( index, ( c, x, zero, zero, x, c ) )
+    green  = numpy.choose( index, ( x, c, c, x, zero, zero ) )
+    blue   = numpy.choose( index, ( zero, zero, x, c, c, x ) )
+    rgb    = numpy.stack( ( red, green, blue ), axis = -1 )
+    rgb   += offset[ ..., None ]
+    return rgb
+
+
+#=============================================================================
+def _hue_many( rgb, high, delta ):
+    """
+    Computes the hue of an array of RGB colors.
+
+    @param rgb   An array of RGB channel values
+    @param high  The array of maximum channel values
+    @param delta The array of differences between maximum and minimum
+                 channel values
+    @return      The array of hues (fractions of a full turn)
+    """
+    red, green, blue = rgb[ ..., 0 ], rgb[ ..., 1 ], rgb[ ..., 2 ]
+    safe = numpy.where( delta == 0, 1.0, delta )
+    hue = numpy.where(
+        high == red,
+        numpy.mod( ( green - blue ) / safe, 6.0 ),
+        numpy.where(
+            high == green,
+            ( blue - red ) / safe + 2.0,
+            ( red - green ) / safe + 4.0
+        )
+    )
+    hue /= 6.0
+    hue[ delta == 0 ] = 0.0
+    return hue
+
+
+#=============================================================================
+def _lab_to_xyz( lab ):
+    """
+    Converts a single color from CIELAB to CIE XYZ.
+
+    @param lab A 3-sequence of L*, a*, and b*
+    @return    A 3-tuple of X, Y, and Z
+    """
+    fy = ( lab[ 0 ] + 16.0 ) / 116.0
+    fx = fy + lab[ 1 ] / 500.0
+    fz = fy - lab[ 2 ] / 200.0
+    xyz = []
+    for white, f in zip( _WHITE, ( fx, fy, fz ) ):
+        if f > _LAB_DELTA:
+            xyz.append( white * f ** 3 )
+        else:
+            xyz.append( white * 3.0 * _LAB_DELTA ** 2 * ( f - 4.0 / 29.0 ) )
+    return tuple( xyz )
+
+
+#=============================================================================
+def _lab_to_xyz_many( lab ):
+    """
+    Converts an array of colors from CIELAB to CIE XYZ.
+
+    @param lab An array of L*a*b* colors
+    @return    An array of XYZ colors
+    """
+    fy = ( lab[ ..., 0 ] + 16.0 ) / 116.0
+    fx = fy + lab[ ..., 1 ] / 500.0
+    fz = fy - lab[ ..., 2 ] / 200.0
+    f  = numpy.stack( ( fx, fy, fz ), axis = -1 )
+    xyz = numpy.where(
+        f > _LAB_DELTA,
+        f ** 3,
+        3.0 * _LAB_DELTA ** 2 * ( f - 4.0 / 29.0 )
+    )
+    xyz *= _WHITE
+    return xyz
+
+
+#=============================================================================
+def _linear_many( values, source ):
+    """
+    Converts an array of colors from any color space to linear RGB.
+
+    @param values The array of colors
+    @param source The color space of the given colors
+    @return       An array of linear RGB colors
+    """
+    if source == SPACE_LINEAR:
+        return values.astype( float )
+    if ( source == SPACE_SRGB ) and ( values.dtype.kind in 'iu' ):
+        return _srgb_decode_table()[ values.astype( numpy.uint8 ) ]
+    if source in ( SPACE_SRGB, SPACE_HSV, SPACE_HSL ):
+        return _srgb_decode_many( _srgb_float_many( values, source ) )
+    if source == SPACE_LAB:
+        values = _lab_to_xyz_many( values )
+    return _transform_many( _LINEAR_FROM_XYZ, values )
+
+
+#=============================================================================
+def _rgb_to_hsl_many( rgb ):
+    """
+    Converts an array of sRGB colors to HSL.
+
+    @param rgb An array of sRGB colors (floating-point channel values)
+    @return    An array of HSL colors
+    """
+    high  = rgb.max( axis = -1 )
+    low   = rgb.min( axis = -1 )
+    delta = high - low
+    light = ( high + low ) / 2.0
+    scale = 1.0 - numpy.abs( 2.0 * light - 1.0 )
+    sat   = delta / numpy.where( scale > 0, scale, 1.0 )
+    sat[ scale <= 0 ] = 0.0
+    hue   = _hue_many( rgb, high, delta )
+    return numpy.stack( ( hue, sat, light ), axis = -1 )
+
+
+#=============================================================================
+def _rgb_to_hsv_many( rgb ):
+    """
+    Converts an array of sRGB colors to HSV.
+
+    @param rgb An array of sRGB colors (floating-point channel values)
+    @return    An array of HSV colors
+    """
+    high  = rgb.max( axis = -1 )
+    low   = rgb.min( axis = -1 )
+    delta = high - low
+    sat   = delta / numpy.where( high > 0, high, 1.0 )
+    hue   = _hue_many( rgb, high, delta )
+    return numpy.stack( ( hue, sat, high ), axis = -1 )
+
+
+#=============================================================================
+def _srgb_decode( channel ):
+    """
+    Applies the sRGB decoding (linearizing) transfer function.
+
+    @param channel An sRGB channel value from 0 to 1
+    @return        The linear channel value
+    """
+    if channel <= 0.04045:
+        return channel / 12.92
+    return ( ( channel + 0.055 ) / 1.055 ) ** 2.4
+
+
+#=============================================================================
+def _srgb_decode_many( rgb ):
+    """
+    Applies the sRGB decoding transfer function to an array.
+
+    @param rgb An array of sRGB channel values from 0 to 1
+    @return    The array of linear channel values
+    """
+    return numpy.where(
+        rgb <= 0.04045,
+        rgb / 12.92,
+        ( ( numpy.maximum( rgb, 0.04045 ) + 0.055 ) / 1.055 ) ** 2.4
+    )
+
+
+#=============================================================================
+# Lookup table from 8-bit sRGB channel values to linear values
+_srgb_decode_lut = None
+
+
+#=============================================================================
+def _srgb_decode_table():
+    """
+    Provides a lookup table from 8-bit sRGB channel values to linear channel
+    values.
+
+    @return A 256-entry array of linear channel values
+    """
+    global _srgb_decode_lut
+    if _srgb_decode_lut is None:
+        _srgb_decode_lut = _srgb_decode_many( numpy.arange( 256 ) / 255.0 )
+    return _srgb_decode_lut
+
+
+#=============================================================================
+def _srgb_encode( channel ):
+    """
+    Applies the sRGB encoding (gamma) transfer function.
+
+    @param channel A linear channel value from 0 to 1
+    @return        The sRGB channel value
+    """
+    if channel <= 0.0031308:
+        return channel * 12.92
+    return 1.055 * channel ** ( 1.0 / 2.4 ) - 0.055
+
+
+#=============================================================================
+# Smallest linear channel value that encodes to each 8-bit sRGB level above 0
+_srgb_encode_limits = None
+
+
+#=============================================================================
+def _srgb_encode8_many( linear ):
+    """
+    Applies the sRGB encoding transfer function to an array, and quantizes
+    the result to 8 bits.
+
+    The result is found by searching a table of the smallest linear value
+    that `_srgb_encode()` and `_to8()` map to each level, so every value is
+    quantized exactly the same as a single conversion.
+
+    @param linear An array of linear channel values
+    @return       An array of 8-bit sRGB channel values
+    """
+    global _srgb_encode_limits
+    if _srgb_encode_limits is None:
+        limits = []
+        for level in range( 1, 256 ):
+            low, high = 0.0, 1.0
+            while True:
+                middle = ( low + high ) / 2.0
+                if ( middle == low ) or ( middle == high ):
+                    break
+                if _to8( _srgb_encode( middle ) ) >= level:
+                    high = middle
+                else:
+                    low = middle
+            limits.append( high )
+        _srgb_encode_limits = numpy.array( limits )
+    levels = numpy.searchsorted(
+        _srgb_encode_limits,
+        numpy.clip( linear, 0.0, 1.0 ),
+        side = 'right'
+    )
+    return levels.astype( numpy.uint8 )
+
+
+#=============================================================================
+def _srgb_float_many( values, source ):
+    """
+    Converts an array of colors to sRGB channel values from 0 to 1.
+
+    @param values The array of colors
+    @param source The color space of the given colors
+    @return       An array of floating-point sRGB colors
+    """
+    if source == SPACE_SRGB:
+        if values.dtype.kind in 'iu':
+            return values / 255.0
+        return values.astype( float )
+    if source == SPACE_HSV:
+        chroma = values[ ..., 2 ] * values[ ..., 1 ]
+        offset = values[ ..., 2 ] - chroma
+        return _chroma_to_rgb_many( values[ ..., 0 ], chroma, offset )
+    if source == SPACE_HSL:
+        light  = values[ ..., 2 ]
+        chroma = ( 1.0 - numpy.abs( 2.0 * light - 1.0 ) ) * values[ ..., 1 ]
+        offset = light - chroma / 2.0
+        return _chroma_to_rgb_many( values[ ..., 0 ], chroma, offset )
+    linear = _linear_many( values, source )
+    return numpy.where(
+        linear <= 0.0031308,
+        linear * 12.92,
+        1.055 * numpy.maximum( linear, 0.0031308 ) ** ( 1.0 / 2.4 ) - 0.055
+    )
+
+
+#=============================================================================
+def _to8( channel ):
+    """
+    Quantizes a channel value from 0 to 1 to an 8-bit integer (rounding
+    halfway values up, the same as `_to8_many()`).
+
+    @param channel The channel value (clipped to the range 0 to 1)
+    @return        The 8-bit integer channel value
+    """
+    return int( min( max( channel, 0.0 ), 1.0 ) * 255.0 + 0.5 )
+
+
+#=============================================================================
+def _to8_many( rgb ):
+    """
+    Quantizes an array of channel values from 0 to 1 to 8-bit integers.
+
+    @param rgb The array of channel values (clipped to the range 0 to 1)
+    @return    An array of 8-bit integer channel values
+    """
+    scaled  = numpy.clip( rgb, 0.0, 1.0 ) * 255.0
+    scaled += 0.5
+    return scaled.astype( numpy.uint8 )
+
+
+#=============================================================================
+def _transform( matrix, vector ):
+    """
+    Multiplies a 3-vector by a 3x3 matrix.
+
+    @param matrix The matrix as a 3-tuple of rows
+    @param vector The 3-vector
+    @return       The resulting 3-tuple
+    """
+    return tuple(
+        sum( m * v for m, v in zip( row, vector ) ) for row in matrix
+    )
+
+
+#=============================================================================
+def _transform_many( matrix, vectors ):
+    """
+    Multiplies an array of 3-vectors by a 3x3 matrix.
+
+    @param matrix  The matrix as a 3-tuple of rows
+    @param vectors The array of 3-vectors
+    @return        The array of resulting 3-vectors
+    """
+    return numpy.dot( vectors, numpy.transpose( matrix ) )
+
+
+#=============================================================================
+def _xyz_to_lab( xyz ):
+    """
+    Converts a single color from CIE XYZ to CIELAB.
+
+    @param xyz A 3-sequence of X, Y, and Z
+    @return    A 3-tuple of L*, a*, and b*
+    """
+    f = []
+    for value, white in zip( xyz, _WHITE ):
+        t = value / white
+        if t > _LAB_DELTA ** 3:
+            f.append( t ** ( 1.0 / 3.0 ) )
+        else:
+            f.append( t / ( 3.0 * _LAB_DELTA ** 2 ) + 4.0 / 29.0 )
+    fx, fy, fz = f
+    return ( 116.0 * fy - 16.0, 500.0 * ( fx - fy ), 200.0 * ( fy - fz ) )
+
+
+#=============================================================================
+def _xyz_to_lab_many( xyz ):
+    """
+    Converts an array of colors from CIE XYZ to CIELAB.
+
+    @param xyz An array of XYZ colors
+    @return    An array of L*a*b* colors
+    """
+    t = xyz / _WHITE
+    f = numpy.where(
+        t > _LAB_DELTA ** 3,
+        numpy.cbrt( t ),
+        t / ( 3.0 * _LAB_DELTA ** 2 ) + 4.0 / 29.0
+    )
+    lab = numpy.empty_like( f )
+    lab[ ..., 0 ] = 116.0 * f[ ..., 1 ] - 16.0
+    lab[ ..., 1 ] = 500.0 * ( f[ ..., 0 ] - f[ ..., 1 ] )
+    lab[ ..., 2 ] = 200.0 * ( f[ ..., 1 ] - f[ ..., 2 ] )
+    return lab
@@ -0,0 +1,387 @@
+#=============================================================================
+#
+# Windows Icons and Cursors
+#
+#=============================================================================
+
+"""
+Windows Icons and Cursors
+=========================
+
+Reads and writes ICO (icon) and CUR (cursor) files in memory.  A file holds
+several images of the same picture (usually at different sizes), and each
+image is stored as either a PNG file, or a Windows device-independent bitmap
+(DIB).
+
+Images are written from (h,w) arrays of packed, straight-alpha 32-bit colors
+(see: `hzgfx.png`), or from already-encoded payloads (e.g. PNG files that
+were rendered by another program).  Bitmaps are always written with 32 bits
+per pixel, and a transparency mask.  Large images are written as PNG files to
+keep icons small (older versions of Windows can not read PNG payloads, but
+they also do not use large icons).
+
+Bitmaps with 1, 4, 8, 24, and 32 bits per pixel can be read.  Compressed
+bitmaps are not supported.
+"""
+
+
+import collections
+import struct
+
+from ._optional import numpy
+from ._optional import require_numpy as _require_numpy
+from . import color
+from . import png
+
+
+__version__ = '0.0.0'
+
+
+#=============================================================================
+# File types
+TYPE_ICON   = 1
+TYPE_CURSOR = 2
+
+
+#=============================================================================
+# Default minimum width of images that are written as PNG files
+PNG_WIDTH = 256
+
+
+#=============================================================================
+# The largest image that can be listed in a file
+_MAX_SIZE = 256
+
+
+#=============================================================================
+# Layouts of the structures in a file (all values are little-endian)
+_ICONDIR          = struct.Struct( '<HHH' )
+_ICONDIRENTRY     = struct.Struct( '<BBBBHHII' )
+_BITMAPINFOHEADER = struct.Struct( '<IiiHHIIiiII' )
+
+
+#=============================================================================
+# An image in a file
+#   width   The width of the image (in pixels)
+#   height  The height of the image (in pixels)
+#   hotspot The (x,y) position of a cursor's hotspot (None for icons)
+#   payload The encoded image (a PNG file, or a DIB without a file header)
+Entry = collections.namedtuple(
+    'Entry',
+    ( 'width', 'height', 'hotspot', 'payload' )
+)
+
+
+#=============================================================================
+def decode( data, order = None ):
+    """
+    Decodes every image in an icon or cursor.
+
+    @param data  The contents of an ICO or CUR file
+    @param order The channel order of the packed colors (default is the
+                 `ColorAlpha.order` attribute)
+    @return      A list of the (h,w) arrays of packed, straight-alpha colors
+                 of each image, in the order they are listed
+    @throws      ImportError if NumPy is not installed
+    @throws      ValueError if the data is not a valid (or supported) file
+    """
+    _require_numpy( 'ico.decode()' )
+    images = []
+    for entry in entries( data )[ 1 ]:
+        if entry.payload[ : 8 ] == png.SIGNATURE:
+            images.append( png.decode( entry.payload, order ) )
+        else:
+            images.append( _decode_bmp( entry.payload, order ) )
+    return images
+
+
+#=============================================================================
+def encode( images, order = None, hotspots = None, png_width = PNG_WIDTH ):
+    """
+    Encodes images as an icon, or a cursor.
+
+    Encoded payloads are written as given.  NumPy is only needed to encode
+    arrays of colors.
+
+    @param images    A list of images;  Each image is either an (h,w) array
+                     of packed, straight-alpha colors, or an encoded payload
+                     (a PNG file, or a DIB without a file header)
+    @param order     The channel order of the packed colors (default is the
+                     `ColorAlpha.order` attribute)
+    @param hotspots  A list of the (x,y) hotspots of each image to write a
+                     cursor (default is to write an icon);  Each hotspot must
+                     be a position within its image.
+    @param png_width The minimum width of arrays that are written as PNG
+                     files (narrower arrays are written as bitmaps)
+    @return          The contents of an ICO or CUR file
+    @throws          ImportError if an image is an array, and NumPy is not
+                     installed
+    @throws          ValueError if an image is empty or too large, the
+                     number of hotspots does not match the number of images,
+                     or a hotspot is outside its image
+    """
+    if ( hotspots is not None ) and ( len( hotspots ) != len( images ) ):
+        raise ValueError(
+            'Expected {} hotspots, not {}.'.format(
+                len( images ),
+                len( hotspots )
+            )
+        )
+
+    # Encode the images that are not already encoded.
+    payloads = []
+    for image in images:
+        if isinstance( image, ( bytes, bytearray ) ):
+            payloads.append( bytes( image ) )
+            continue
+        _require_numpy( 'ico.encode()' )
+        colors = numpy.asarray( image, dtype = numpy.uint32 )
+        if ( colors.ndim == 2 ) and ( colors.shape[ 1 ] >= png_width ):
+            payloads.append( png.encode( colors, order ) )
+        else:
+            payloads.append( _encode_bmp( colors, order ) )
+
+    # List every image after the directory.
+    kind    = TYPE_ICON if hotspots is None else TYPE_CURSOR
+    offset  = _ICONDIR.size + ( _ICONDIRENTRY.size * len( payloads ) )
+    parts   = [ _ICONDIR.pack( 0, kind, len( payloads ) ) ]
+    for index, payload in enumerate( payloads ):
+        width, height, bits = _payload_size( payload )
+        if ( width > _MAX_SIZE ) or ( height > _MAX_SIZE ):
+            raise ValueError(
+                'Unable to list a {}x{} image.'.format( width, height )
+            )
+        if hotspots is None:
+            planes = 1
+        else:
+            planes, bits = hotspots[ index ][ 0 : 2 ]
+            if not ( ( 0 <= planes < width ) and ( 0 <= bits < height ) ):
+                raise ValueError(
+                    'Hotspot ({},{}) is outside a {}x{} image.'.format(
+                        planes,
+                        bits,
+                        width,
+                        height
+                    )
+                )
+        parts.append( _ICONDIRENTRY.pack(
+            width % _MAX_SIZE,
+            height % _MAX_SIZE,
+            0,
+            0,
+            planes,
+            bits,
+            len( payload ),
+            offset
+        ) )
+        offset += len( payload )
+    return b''.join( parts + payloads )
+
+
+#=============================================================================
+def entries( data ):
+    """
+    Lists the images in an icon or cursor without decoding them.
+
+    @param data The contents of an ICO or CUR file
+    @return     A ( file type, list of `Entry` items ) pair
+    @throws     ValueError if the data is not a valid file
+    """
+    if len( data ) < _ICONDIR.size:
+        raise ValueError( 'Truncated icon directory.' )
+    reserved, kind, count = _ICONDIR.unpack( data[ : _ICONDIR.size ] )
+    if ( reserved != 0 ) or ( kind not in ( TYPE_ICON, TYPE_CURSOR ) ):
+        raise ValueError( 'Missing icon or cursor header.' )
+    if len( data ) < ( _ICONDIR.size + ( _ICONDIRENTRY.size * count ) ):
+        raise ValueError( 'Truncated icon directory.' )
+    result = []
+    for index in range( count ):
+        start = _ICONDIR.size + ( _ICONDIRENTRY.size * index )
+        x, y, length, offset = _ICONDIRENTRY.unpack(
+            data[ start : start + _ICONDIRENTRY.size ]
+        )[ 4 : ]
+        if ( offset + length ) > len( data ):
+            raise ValueError( 'Truncated image {}.'.format( index ) )
+        payload = bytes( data[ offset : offset + length ] )
+        width, height = _payload_size( payload )[ 0 : 2 ]
+        hotspot = ( x, y ) if kind == TYPE_CURSOR else None
+        result.append( Entry( width, height, hotspot, payload ) )
+    return kind, result
+
+
+#=============================================================================
+def load( filename, order = None ):
+    """
+    Reads every image from an ICO or CUR file.
+
+    @param filename The name of the file
+    @param order    The channel order of the packed colors (see: `decode()`)
+    @return         A list of the (h,w) arrays of packed colors of each image
+    """
+    with open( filename, 'rb' ) as handle:
+        return decode( handle.read(), order )
+
+
+#=============================================================================
+def save(
+    filename,
+    images,
+    order = None,
+    hotspots = None,
+    png_width = PNG_WIDTH
+):
+    """
+    Writes images to an ICO or CUR file.
+
+    @param filename  The name of the file
+    @param images    A list of images (see: `encode()`)
+    @param order     The channel order of the packed colors (see: `encode()`)
+    @param hotspots  A list of the (x,y) hotspots of each image to write a
+                     cursor (default is to write an icon)
+    @param png_width The minimum width of arrays that are written as PNG
+                     files (see: `encode()`)
+    """
+    data = encode( images, order, hotspots, png_width )
+    with open( filename, 'wb' ) as handle:
+        handle.write( data )
+
+
+#=============================================================================
+def _decode_bmp( payload, order ):
+    """
+    Decodes a bitmap image (and its transparency mask).
+
+    @param payload The DIB (starting with its BITMAPINFOHEADER)
+    @param order   The channel order of the packed colors
+    @return        The (h,w) array of packed, straight-alpha colors
+    @throws        ValueError if the bitmap is not valid (or supported)
+    """
+    if len( payload ) < _BITMAPINFOHEADER.size:
+        raise ValueError( 'Truncated bitmap header.' )
+    header = _BITMAPINFOHEADER.unpack( payload[ : _BITMAPINFOHEADER.size ] )
+    size, width, height, planes, bits, compression = header[ : 6 ]
+    used = header[ 9 ]
+    height //= 2
+    if ( compression != 0 ) or ( bits not in ( 1, 4, 8, 24, 32 ) ):
+        raise ValueError(
+            'Unsupported bitmap with {} bits per pixel, and compression '
+            '{}.'.format( bits, compression )
+        )
+    if ( width < 1 ) or ( height < 1 ):
+        raise ValueError( 'Invalid {}x{} bitmap.'.format( width, height ) )
+
+    # Find the palette, colors, and mask (each row is padded to 4 bytes).
+    offset  = size
+    palette = None
+    if bits <= 8:
+        length  = used or ( 1 << bits )
+        palette = numpy.frombuffer(
+            payload[ offset : offset + ( 4 * length ) ],
+            dtype = numpy.uint8
+        ).reshape( ( -1, 4 ) )
+        offset += 4 * length
+    stride = ( ( width * bits + 31 ) // 32 ) * 4
+    mask   = ( ( width + 31 ) // 32 ) * 4
+    if len( payload ) < ( offset + ( ( stride + mask ) * height ) ):
+        raise ValueError( 'Truncated bitmap.' )
+    pixels = numpy.frombuffer(
+        payload[ offset : offset + ( stride * height ) ],
+        dtype = numpy.uint8
+    ).reshape( ( height, stride ) )[ : : -1 ]
+    offset += stride * height
+    transparent = numpy.unpackbits(
+        numpy.frombuffer(
+            payload[ offset : offset + ( mask * height ) ],
+            dtype = numpy.uint8
+        ).reshape( ( height, mask ) )[ : : -1 ],
+        axis = 1
+    )[ :, : width ]
+
+    # Convert the BGR(A) colors, and apply the mask.
+    rgba = numpy.empty( ( height, width, 4 ), dtype = numpy.uint8 )
+    rgba[ ..., 3 ] = numpy.where( transparent, 0, 0xFF )
+    if bits >= 24:
+        bgr = pixels[ :, : width * ( bits // 8 ) ].reshape(
+            ( height, width, bits // 8 )
+        )
+        rgba[ ..., : 3 ] = bgr[ ..., 2 : : -1 ]
+
+        # Bitmaps without any alpha values only use the mask.
+        if ( bits == 32 ) and bgr[ ..., 3 ].any():
+            rgba[ ..., 3 ] = bgr[ ..., 3 ]
+    else:
+        if bits == 8:
+            index = pixels[ :, : width ]
+        else:
+            weights = 1 << numpy.arange( bits - 1, -1, -1 )
+            index   = numpy.dot(
+                numpy.unpackbits( pixels, axis = 1 ).reshape(
+                    ( height, -1, bits )
+                ),
+                weights
+            )[ :, : width ]
+        index = numpy.minimum( index, len( palette ) - 1 )
+        rgba[ ..., : 3 ] = palette[ index ][ ..., 2 : : -1 ]
+    return color.ColorAlpha.pack_many( rgba, order )
+
+
+#=============================================================================
+def _encode_bmp( colors, order ):
+    """
+    Encodes a 32-bit bitmap image (and its transparency mask).
+
+    @param colors The (h,w) array of packed, straight-alpha colors
+    @param order  The channel order of the packed colors
+    @return       The DIB (starting with its BITMAPINFOHEADER)
+    @throws       ValueError if the image is not a 2-D array of colors
+    """
+    if ( colors.ndim != 2 ) or ( colors.size == 0 ):
+        raise ValueError(
+            'Unable to encode an image with shape {}.'.format( colors.shape )
+        )
+    height, width = colors.shape
+
+    # Rows are stored from the bottom up.
+    rgba   = color.ColorAlpha.unpack_many( colors, order )[ : : -1 ]
+    pixels = rgba[ ..., [ 2, 1, 0, 3 ] ].tobytes()
+    mask   = numpy.zeros(
+        ( height, ( ( width + 31 ) // 32 ) * 32 ),
+        dtype = numpy.uint8
+    )
+    mask[ :, : width ] = rgba[ ..., 3 ] == 0
+    mask = numpy.packbits( mask, axis = 1 ).tobytes()
+    header = _BITMAPINFOHEADER.pack(
+        _BITMAPINFOHEADER.size,
+        width,
+        height * 2,
+        1,
+        32,
+        0,
+        len( pixels ) + len( mask ),
+        0,
+        0,
+        0,
+        0
+    )
+    return header + pixels + mask
+
+
+#=============================================================================
+def _payload_size( payload ):
+    """
+    Reads the dimensions of an encoded image.
+
+    @param payload A PNG file, or a DIB
+    @return        The ( width, height, bits per pixel ) of the image
+    @throws        ValueError if the payload is not a PNG file, or a DIB
+    """
+    if payload[ : 8 ] == png.SIGNATURE:
+        width, height = png.size( payload )
+        return width, height, 32
+    if len( payload ) >= _BITMAPINFOHEADER.size:
+        size, width, height, planes, bits = _BITMAPINFOHEADER.unpack(
+            payload[ : _BITMAPINFOHEADER.size ]
+        )[ : 5 ]
+        if size >= _BITMAPINFOHEADER.size:
+            return width, height // 2, bits
+    raise ValueError( 'Image is not a PNG file, or a bitmap.' )
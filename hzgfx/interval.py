@@ -7,9 +7,32 @@
 """
 Linear Numeric Intervals
 ========================
+
+Intervals are lazy:  positions and values are computed as needed, and slicing
+an interval produces another interval.  When NumPy is installed, the
+`values()`, `contains_many()`, and `getpos_many()` methods work on entire
+arrays of values at once.
+
+Collections of intervals are handled by two classes:
+
+- `IntervalSet` is a sorted union of disjoint ranges supporting set algebra
+  (union, intersection, and difference) and logarithmic membership tests.
+- `IntervalTree` indexes many (possibly overlapping) intervals to quickly find
+  the intervals containing a value or overlapping a range.
 """
 
 
+import array
+import bisect
+import decimal
+import fractions
+import numbers
+
+from ._optional import numpy
+from ._optional import require_numpy as _require_numpy
+from ._optional import round_nearest as _round_nearest
+
+
 __version__ = '0.0.0'
 
 
@@ -28,16 +51,21 @@ def interval( *args, **kwargs ):
         Floating-point numbers create an interval over [ 0.0, args[0] ]
         A sequence of values is used as constructor arguments to either
         `Interval` or `RealInterval`.  A `RealInterval` is used if any of the
-        values in the sequence is a floating-point number.
+        values in the sequence is a floating-point number (or any other
+        non-integral number such as a fraction or decimal).
     @param 1
         If argument 0 is numeric, this argument is used as the upper limit of
         the interval.
     @param 2
         If argument 0 is numeric, this argument is used as the step value of
         the interval.
+    @param exact
+        Set to true to use exact arithmetic when creating a `RealInterval`
+        (see: `RealInterval.__init__()`).
     @return
         An Interval object with the requested properties.
     """
+    exact = kwargs.get( 'exact', False )
 
     # Check for no arguments given or a `None` argument.
     if ( len( args ) == 0 ) or ( args[ 0 ] is None ):
@@ -47,8 +75,8 @@ def interval( *args, **kwargs ):
     if isinstance( args[ 0 ], ( tuple, list ) ):
 
         # See if there is a float in the sequence.
-        if any( type( v ) is float for v in args[ 0 ] ) == True:
-            return RealInterval( *args[ 0 ][ : 3 ] )
+        if any( _isreal( v ) for v in args[ 0 ] ) == True:
+            return RealInterval( *args[ 0 ][ : 3 ], exact = exact )
 
         # No floats in sequence.
         else:
@@ -60,13 +88,11 @@ def interval( *args, **kwargs ):
     step  = 1    if len( args ) <= 2 else args[ 2 ]
 
     # Determine what kind of interval to create.
-    if any( type( v ) is float for v in args ) == True:
-        itype = RealInterval
-    else:
-        itype = Interval
+    if any( _isreal( v ) for v in args ) == True:
+        return RealInterval( start, stop, step, exact = exact )
 
     # Construct the requested interval.
-    return itype( start, stop, step )
+    return Interval( start, stop, step )
 
 
 #=============================================================================
@@ -80,14 +106,41 @@ class Interval( object ):
 
     The interval is specified the same way as a Python range where the
     included endpoints on the interval are [start,stop).
+
+    Negative intervals (start > stop) normally use a positive step, and are
+    indexed up from "stop".  A negative step (e.g. from reversing a slice)
+    instead walks down from "start", so indexing and iteration both produce
+    the values in descending order.
+
+    Intervals are immutable.  The following derived attributes are computed
+    once when the interval is created:
+
+    delta The difference between the upper and lower limits
+    neg   True if the interval trends negatively
+    pos   True if the interval trends positively
     """
 
 
+    #=========================================================================
+    # Instances only store the limits, step, and derived values.
+    __slots__ = ( 'start', 'stop', 'step', 'delta', 'neg', 'pos', '_length' )
+
+
     #=========================================================================
     # The format used to represent objects as strings.
     _strfmt = '[{0.start},{0.stop});{0.step}'
 
 
+    #=========================================================================
+    # Whether or not the "stop" limit is included in the interval.
+    _closed = False
+
+
+    #=========================================================================
+    # Whether or not the interval uses exact arithmetic.
+    exact = False
+
+
     #=========================================================================
     def __init__( self, start, stop = None, step = 1 ):
         """
@@ -99,20 +152,27 @@ class Interval( object ):
         @param stop  One more than the upper-limit of the interval
         @param step  The distance between adjacent points in the interval
                      If not given, the default is 1.
+        @throws      ValueError if the step is zero
         """
 
         # Look for size-specified intervals.
         if stop is None:
-            self.start = type( start )( 0 )
-            self.stop  = start
+            stop  = start
+            start = type( start )( 0 )
 
-        # The interval is given as limits.
-        else:
-            self.start = start
-            self.stop  = stop
+        # Sanity check the step size.
+        if step == 0:
+            raise ValueError( 'Unable to use a zero interval step.' )
 
-        # Set the step size.
-        self.step = step
+        # Set the limits, step size, and derived values.
+        setter = object.__setattr__
+        setter( self, 'start', start )
+        setter( self, 'stop', stop )
+        setter( self, 'step', step )
+        setter( self, 'delta', stop - start )
+        setter( self, 'neg', start > stop )
+        setter( self, 'pos', start < stop )
+        setter( self, '_length', self._count() )
 
 
     #=========================================================================
@@ -127,49 +187,35 @@ class Interval( object ):
 
         # If the interval trends negatively, make sure the value is less than
         # start and more than stop.
-        if self.neg and ( ( value <= self.start ) and ( value > self.stop ) ):
-            return True
+        if self.neg:
+            return ( value <= self.start ) and ( value > self.stop )
 
         # If the interval trends positively, make sure the value is more than
         # start and less than stop.
-        elif ( value >= self.start ) and ( value < self.stop ):
-            return True
-
-        # Value is outside the interval.
-        return False
+        return ( value >= self.start ) and ( value < self.stop )
 
 
     #=========================================================================
-    def __getattr__( self, name ):
+    def __delattr__( self, name ):
         """
-        Provides access to computed attributes.
-
-        Compute Attributes
+        Prevents deleting attributes.
+        """
+        raise AttributeError( 'Intervals can not be modified.' )
 
-        delta The difference between the upper and lower limits
-        neg   True if the interval trends negatively
-        pos   True if the interval trends positively
 
-        @param name The name of the attribute to retrieve
-        @return     The value of the requested attribute
-        @throws     AttributeError for invalid attributes
+    #=========================================================================
+    def __eq__( self, other ):
         """
+        Tests two intervals for equality.
 
-        # Known attributes
-        if name == 'delta':
-            return self.stop - self.start
-        elif name == 'neg':
-            return self.start > self.stop
-        elif name == 'pos':
-            return self.start < self.stop
-
-        # Unknown attribute
-        raise AttributeError(
-            "{} object has no attribute '{}'".format(
-                self.__class__.__name__,
-                name
-            )
-        )
+        @param other The other interval
+        @return      True if both intervals are the same type, and have the
+                     same limits and step
+        """
+        if type( self ) is not type( other ):
+            return NotImplemented
+        return ( self.start, self.stop, self.step ) \
+            == ( other.start, other.stop, other.step )
 
 
     #=========================================================================
@@ -182,38 +228,46 @@ class Interval( object ):
 
         @param offset The integer offset into the interval
                       The integer-specified slice within the interval
-        @return       The interval value at the given offset
+        @return       The interval value at the given offset, or a new
+                      interval for the values at the positions of a slice
         @throws       KeyError if the offset can not be mapped
         """
 
-        # Number of positions in interval.
-        length = len( self )
-
         # Slice notation.
         if isinstance( offset, slice ):
-            ### ZIH
-            raise NotImplementedError()
+            return self._slice( offset )
 
         # See if an offset was given as a number from 0.0 to 1.0.
         if type( offset ) is float:
 
             # Adjust for requesting a continuous position.
-            offset = int( offset * length )
+            offset = int( offset * self._length )
 
         # Negative offset support.
         if offset < 0:
 
             # Normalize negative offset.
-            offset += length
+            offset += self._length
 
-        # Negative intervals work in reverse.
-        if self.neg == True:
+        # Negative intervals work in reverse (unless the step walks down from
+        # the "start" limit).
+        if self.neg and ( self.step > 0 ):
             return self.stop + self.step * offset
 
         # Interval value at this offset
         return self.start + self.step * offset
 
 
+    #=========================================================================
+    def __hash__( self ):
+        """
+        Produces a hash value consistent with interval equality.
+
+        @return The hash value of the interval
+        """
+        return hash( ( type( self ), self.start, self.stop, self.step ) )
+
+
     #=========================================================================
     def __iter__( self ):
         """
@@ -222,36 +276,54 @@ class Interval( object ):
         @return An iterable object for all positions on the interval
         """
 
-        # Negative interval iteration.
-        if self.neg == True:
+        # Yield the value at each position.
+        base, first, stride = self._offsets()
+        step = self.step
+        for offset in range( first, first + stride * self._length, stride ):
+            yield base + step * offset
 
-            # Iterate through the normal range of the interval.
-            for offset in range( len( self ), 0, -1 ):
 
-                # Yield the value at each position.
-                yield self.stop + self.step * offset
+    #=========================================================================
+    def __len__( self ):
+        """
+        Produces the length of the interval as the number of steps between the
+        lower and upper limits.
 
-        # Positive interval iteration.
-        else:
+        @return The number of discrete positions in the interval
+        """
+        return self._length
 
-            # Iterate through the normal range of the interval.
-            for offset in range( len( self ) ):
 
-                # Yield the value at each position.
-                yield self.start + self.step * offset
+    #=========================================================================
+    def __ne__( self, other ):
+        """
+        Tests two intervals for inequality.
+
+        @param other The other interval
+        @return      True if the intervals are not equal
+        """
+        result = self.__eq__( other )
+        if result is NotImplemented:
+            return result
+        return not result
 
 
     #=========================================================================
-    def __len__( self ):
+    def __reduce__( self ):
         """
-        Produces the length of the interval as the number of steps between the
-        lower and upper limits.
+        Supports pickling and copying immutable intervals.
 
-        @return The number of discrete positions in the interval
+        @return The information needed to recreate the interval
         """
+        return ( type( self ), ( self.start, self.stop, self.step ) )
 
-        # Floor and int to avoid over-stepping the last position.
-        return int( abs( self.delta / self.step ) )
+
+    #=========================================================================
+    def __setattr__( self, name, value ):
+        """
+        Prevents changing attributes.
+        """
+        raise AttributeError( 'Intervals can not be modified.' )
 
 
     #=========================================================================
@@ -264,6 +336,36 @@ class Interval( object ):
         return self._strfmt.format( self )
 
 
+    #=========================================================================
+    def contains_many( self, values, out = None ):
+        """
+        Tests an array of values to see which are within the limits of the
+        interval using the same rules as the `in` operator.
+
+        @param values The array of values to test
+        @param out    Optional boolean array to receive the results
+        @return       A boolean array that is true for each contained value
+        @throws       ImportError if NumPy is not installed
+        """
+        _require_numpy( 'Interval.contains_many()' )
+
+        # Determine the limits of the interval, and which are included.
+        if self.neg:
+            low, high = self.stop, self.start
+            lower = numpy.greater_equal if self._closed else numpy.greater
+            upper = numpy.less_equal
+        else:
+            low, high = self.start, self.stop
+            lower = numpy.greater_equal
+            upper = numpy.less_equal if self._closed else numpy.less
+        if self.exact:
+            low, high = float( low ), float( high )
+
+        # Test both limits for all values.
+        out = lower( values, low, out = out )
+        return numpy.logical_and( out, upper( values, high ), out = out )
+
+
     #=========================================================================
     def getpos( self, value ):
         """
@@ -285,6 +387,169 @@ class Interval( object ):
         return int( round( ( value - self.start ) / self.step ) )
 
 
+    #=========================================================================
+    def getpos_many( self, values, missing = None ):
+        """
+        Performs a reverse lookup to retrieve the positions of an array of
+        values in the interval.
+
+        @param values  The array of values within the interval
+        @param missing Optional position given to values outside the interval
+                       instead of raising an exception
+        @return        An integer array of the closest offsets into the
+                       interval's discrete positions (see: `getpos()`)
+        @throws        ImportError if NumPy is not installed
+        @throws        ValueError if any value is outside the interval, and no
+                       missing position is given
+        """
+        _require_numpy( 'Interval.getpos_many()' )
+        values = numpy.asarray( values )
+
+        # Check to make sure the values can be mapped to positions.
+        inside = self.contains_many( values )
+        if ( missing is None ) and ( inside.all() == False ):
+            raise ValueError(
+                '{} is outside the interval {}.'.format(
+                    values[ inside == False ].flat[ 0 ],
+                    self
+                )
+            )
+
+        # Compute the closest position for each value.
+        offsets  = numpy.subtract( values, float( self.start ), dtype = float )
+        offsets /= float( self.step )
+        result   = _round_nearest( offsets, out = offsets ).astype( int )
+        if missing is not None:
+            result[ inside == False ] = missing
+        return result
+
+
+    #=========================================================================
+    def values( self, typecode = None ):
+        """
+        Produces all values in the interval (in iteration order) as a single
+        array.
+
+        @param typecode Optional type code (or NumPy data type) of the array
+                        values;  The default is 'd' if any limit or the step
+                        is a floating-point number, or 'l' otherwise.
+        @return         A NumPy array of the values, or an `array.array` if
+                        NumPy is not installed
+        """
+
+        # Select a type that represents every value in the interval.
+        if typecode is None:
+            limits   = ( self.start, self.stop, self.step )
+            integral = all(
+                isinstance( v, numbers.Integral ) for v in limits
+            )
+            typecode = 'l' if integral else 'd'
+
+        # Without NumPy, fall back to the (slower) iterator.
+        if numpy is None:
+            if self.exact and ( typecode in 'fd' ):
+                return array.array( typecode, ( float( v ) for v in self ) )
+            return array.array( typecode, self )
+
+        # Compute the values the same way as the iterator.
+        base, first, stride = self._offsets()
+        offsets = numpy.arange(
+            first,
+            first + stride * self._length,
+            stride,
+            dtype = numpy.int64
+        )
+        if self.exact:
+            result = _exact_values( base, self.step, offsets )
+        else:
+            result = ( offsets * self.step ) + base
+        return result.astype( typecode, copy = False )
+
+
+    #=========================================================================
+    def _count( self ):
+        """
+        Computes the number of discrete positions in the interval.
+
+        @return The number of discrete positions in the interval
+        """
+
+        # Floor and int to avoid over-stepping the last position.
+        return int( abs( self.delta / self.step ) )
+
+
+    #=========================================================================
+    def _make( self, start, stop, step ):
+        """
+        Creates a new interval with the same type and options as this
+        interval.
+
+        @param start The lower-limit of the new interval
+        @param stop  The upper-limit of the new interval
+        @param step  The step of the new interval
+        @return      The new interval
+        """
+        return type( self )( start, stop, step )
+
+
+    #=========================================================================
+    def _offsets( self ):
+        """
+        Determines the offsets used to produce the values in iteration order.
+
+        @return A 3-tuple of the base value, the first offset from the base
+                value, and the difference between successive offsets
+        """
+
+        # Negative intervals work in reverse from the "stop" limit (which is
+        # excluded, unless the interval is closed).
+        if self.neg and ( self.step > 0 ):
+            first = self._length - 1 if self._closed else self._length
+            return ( self.stop, first, -1 )
+
+        # Positive intervals (and negative steps) work forward from the
+        # "start" limit.
+        return ( self.start, 0, 1 )
+
+
+    #=========================================================================
+    def _slice( self, positions ):
+        """
+        Creates an interval for the values at a slice of positions (see:
+        `__getitem__()`).
+
+        @param positions A slice of positions in the interval
+        @return          A new interval with the values at each position in
+                         the slice
+        """
+
+        # Determine the first value, spacing, and number of values.
+        begin, end, stride = positions.indices( self._length )
+        span  = end - begin + ( stride - 1 if stride > 0 else stride + 1 )
+        count = max( 0, span // stride )
+        first = self[ begin ] if count > 0 else self.start
+        step  = self.step * stride
+
+        # Arrange the limits so that offsets map to the sliced values (a
+        # negative step walks down from the "start" limit).  Closed limits
+        # use this interval's own values so they do not drift from them.
+        if self._closed and ( count > 0 ):
+            limits = ( first, self[ begin + stride * ( count - 1 ) ] )
+        else:
+            limits = ( first, first + step * count )
+
+        # Use a half-open interval for empty slices (real intervals always
+        # include at least one value).
+        if count > 0:
+            result = self._make( limits[ 0 ], limits[ 1 ], step )
+        else:
+            result = Interval( limits[ 0 ], limits[ 1 ], step )
+
+        # Avoid rounding errors in the length of the new interval.
+        object.__setattr__( result, '_length', count )
+        return result
+
+
 #=============================================================================
 class RealInterval( Interval ):
     """
@@ -293,23 +558,50 @@ class RealInterval( Interval ):
     Real intervals break from the convention of the "stop" value indicating
     one more than the end of the interval.  Instead, "stop" is included in the
     interval as the true upper limit.
+
+    Long intervals with fractional steps accumulate binary floating-point
+    error.  In exact mode, the limits and step are stored as fractions, so
+    the length, endpoints, and every value are computed exactly.  Values in
+    exact intervals are `fractions.Fraction` objects, but `values()` still
+    produces floating-point arrays (each value correctly rounded).
     """
 
 
+    #=========================================================================
+    # Instances also store the arithmetic mode.
+    __slots__ = ( 'exact', )
+
+
     #=========================================================================
     # The format used to represent objects as strings.
     _strfmt = '[{0.start},{0.stop}];{0.step}'
 
 
     #=========================================================================
-    def __len__( self ):
+    # Whether or not the "stop" limit is included in the interval.
+    _closed = True
+
+
+    #=========================================================================
+    def __init__( self, start, stop = None, step = 1, exact = False ):
         """
-        Produces the length of the interval as the number of steps between the
-        lower and upper limits.
+        Initializes a RealInterval object.
+
+        @param start See: `Interval.__init__()`
+        @param stop  The upper-limit of the interval
+        @param step  See: `Interval.__init__()`
+        @param exact Set to true to store the limits and step as fractions;
+                     Floating-point numbers are converted using their decimal
+                     representation (e.g. 0.1 becomes exactly 1/10).  Strings,
+                     decimals, and fractions are also accepted.
+        @throws      ValueError if the step is zero
         """
-
-        # Include the limits of the interval.
-        return int( abs( ( self.delta + self.step ) / self.step ) )
+        if exact:
+            start = _fraction( start )
+            stop  = stop if stop is None else _fraction( stop )
+            step  = _fraction( step )
+        object.__setattr__( self, 'exact', bool( exact ) )
+        super( RealInterval, self ).__init__( start, stop, step )
 
 
     #=========================================================================
@@ -324,14 +616,827 @@ class RealInterval( Interval ):
 
         # If the interval trends negatively, make sure the value is less than
         # start and more than stop.
-        if self.neg and ( ( value <= self.start ) and ( value >= self.stop ) ):
-            return True
+        if self.neg:
+            return ( value <= self.start ) and ( value >= self.stop )
 
         # If the interval trends positively, make sure the value is more than
         # start and less than stop.
-        elif ( value >= self.start ) and ( value <= self.stop ):
-            return True
+        return ( value >= self.start ) and ( value <= self.stop )
+
+
+    #=========================================================================
+    def __eq__( self, other ):
+        """
+        Tests two intervals for equality.
+
+        @param other The other interval
+        @return      True if both intervals are the same type, and have the
+                     same limits, step, and arithmetic mode
+        """
+        result = super( RealInterval, self ).__eq__( other )
+        if result is True:
+            return self.exact == other.exact
+        return result
+
+
+    #=========================================================================
+    def __hash__( self ):
+        """
+        Produces a hash value consistent with interval equality.
+
+        @return The hash value of the interval
+        """
+        return hash( ( super( RealInterval, self ).__hash__(), self.exact ) )
+
+
+    #=========================================================================
+    def __reduce__( self ):
+        """
+        Supports pickling and copying immutable intervals.
+
+        @return The information needed to recreate the interval
+        """
+        return (
+            type( self ),
+            ( self.start, self.stop, self.step, self.exact )
+        )
+
+
+    #=========================================================================
+    def _count( self ):
+        """
+        Computes the number of discrete positions in the interval.
+
+        @return The number of discrete positions in the interval
+        """
+
+        # Include both limits of the interval (in either direction).  Exact
+        # division of fractions never needs rounding.
+        step = abs( self.step )
+        return int( ( abs( self.delta ) + step ) / step )
+
+
+    #=========================================================================
+    def _make( self, start, stop, step ):
+        """
+        Creates a new interval with the same type and options as this
+        interval.
+
+        @param start The lower-limit of the new interval
+        @param stop  The upper-limit of the new interval
+        @param step  The step of the new interval
+        @return      The new interval
+        """
+        return type( self )( start, stop, step, self.exact )
+
+
+#=============================================================================
+class IntervalSet( object ):
+    """
+    Models a set of numbers as a sorted union of disjoint ranges.
+
+    Every range is half-open, [low,high).  Overlapping and adjacent ranges
+    are coalesced as they are added, so the set always holds the fewest
+    possible ranges.  Membership tests use a binary search, and set algebra
+    merges the ranges of both sets in a single pass.
+
+    Ranges may be given as two-sequences of limits, or as Interval objects
+    (using the smallest value, and one step past the largest value, of the
+    interval).  Closed intervals (such as `RealInterval`) are rejected.
+    """
+
+
+    #=========================================================================
+    # Sets can be modified, so they are not hashable.
+    __hash__ = None
+
+
+    #=========================================================================
+    def __init__( self, ranges = () ):
+        """
+        Initializes an IntervalSet object.
+
+        @param ranges An iterable of ranges to include in the set
+        """
+
+        # The limits of all ranges, in order (low, high, low, high, ...).
+        # Values between an even and an odd index are in the set.
+        self._bounds = _coalesce( sorted(
+            r for r in ( _limits( item ) for item in ranges )
+            if r[ 0 ] < r[ 1 ]
+        ) )
+
+
+    #=========================================================================
+    def __and__( self, other ):
+        """
+        Intersects two sets.
+        """
+        return self.intersection( other )
+
+
+    #=========================================================================
+    def __contains__( self, value ):
+        """
+        Tests a value to see if it is in one of the set's ranges.
+
+        @param value The value to test
+        @return      True if the value is in the set
+        """
+        return ( bisect.bisect_right( self._bounds, value ) & 1 ) == 1
+
+
+    #=========================================================================
+    def __eq__( self, other ):
+        """
+        Tests two sets for equality.
+        """
+        if isinstance( other, IntervalSet ) == False:
+            return NotImplemented
+        return self._bounds == other._bounds
+
+
+    #=========================================================================
+    def __iter__( self ):
+        """
+        Provides an iterator over the ranges in the set.
+
+        @return An iterable object for all ( low, high ) ranges, in order
+        """
+        bounds = self._bounds
+        for index in range( 0, len( bounds ), 2 ):
+            yield ( bounds[ index ], bounds[ index + 1 ] )
+
+
+    #=========================================================================
+    def __len__( self ):
+        """
+        Produces the number of disjoint ranges in the set.
+
+        @return The number of ranges in the set
+        """
+        return len( self._bounds ) // 2
+
 
-        # Value is outside the interval.
+    #=========================================================================
+    def __ne__( self, other ):
+        """
+        Tests two sets for inequality.
+        """
+        result = self.__eq__( other )
+        if result is NotImplemented:
+            return result
+        return not result
+
+
+    #=========================================================================
+    def __or__( self, other ):
+        """
+        Unites two sets.
+        """
+        return self.union( other )
+
+
+    #=========================================================================
+    def __str__( self ):
+        """
+        Produces a string representation of the set.
+
+        @return A string representation of the set
+        """
+        return ' '.join( '[{},{})'.format( *r ) for r in self ) or '{}'
+
+
+    #=========================================================================
+    def __sub__( self, other ):
+        """
+        Subtracts one set from another.
+        """
+        return self.difference( other )
+
+
+    #=========================================================================
+    def add( self, item ):
+        """
+        Adds a range to the set.
+
+        @param item A range given as a two-sequence or an Interval object
+        """
+        low, high = _limits( item )
+        if low < high:
+            bounds = self._bounds
+            first  = bisect.bisect_left( bounds, low )
+            last   = bisect.bisect_right( bounds, high )
+            merged = [] if first & 1 else [ low ]
+            if ( last & 1 ) == 0:
+                merged.append( high )
+            bounds[ first : last ] = merged
+
+
+    #=========================================================================
+    def contains_many( self, values ):
+        """
+        Tests an array of values to see which are in the set.
+
+        @param values The array of values to test
+        @return       A boolean array that is true for each value in the set
+        @throws       ImportError if NumPy is not installed
+        """
+        _require_numpy( 'IntervalSet.contains_many()' )
+        indexes = numpy.searchsorted( self._bounds, values, side = 'right' )
+        return ( indexes & 1 ) == 1
+
+
+    #=========================================================================
+    def difference( self, *others ):
+        """
+        Produces the values in this set that are not in any other set.
+
+        @param others The sets (or iterables of ranges) to subtract
+        @return       A new IntervalSet
+        """
+        return self._combine( others, lambda a, b: a and not b )
+
+
+    #=========================================================================
+    def discard( self, item ):
+        """
+        Removes a range from the set.
+
+        @param item A range given as a two-sequence or an Interval object
+        """
+        low, high = _limits( item )
+        if low < high:
+            bounds = self._bounds
+            first  = bisect.bisect_left( bounds, low )
+            last   = bisect.bisect_right( bounds, high )
+            split  = [ low ] if first & 1 else []
+            if last & 1:
+                split.append( high )
+            bounds[ first : last ] = split
+
+
+    #=========================================================================
+    def find( self, value ):
+        """
+        Finds the range containing a value.
+
+        @param value The value to find
+        @return      The ( low, high ) range containing the value, or None if
+                     the value is not in the set
+        """
+        index = bisect.bisect_right( self._bounds, value )
+        if ( index & 1 ) == 0:
+            return None
+        return ( self._bounds[ index - 1 ], self._bounds[ index ] )
+
+
+    #=========================================================================
+    def intersection( self, *others ):
+        """
+        Produces the values that are in this set and every other set.
+
+        @param others The sets (or iterables of ranges) to intersect
+        @return       A new IntervalSet
+        """
+        return self._combine( others, lambda a, b: a and b )
+
+
+    #=========================================================================
+    def overlaps( self, item ):
+        """
+        Tests a range to see if it shares any values with the set.
+
+        @param item A range given as a two-sequence or an Interval object
+        @return     True if any value in the range is in the set
+        """
+        low, high = _limits( item )
+        if low >= high:
+            return False
+        first = bisect.bisect_right( self._bounds, low )
+        last  = bisect.bisect_left( self._bounds, high )
+        return ( ( first & 1 ) == 1 ) or ( first < last )
+
+
+    #=========================================================================
+    def union( self, *others ):
+        """
+        Produces the values that are in this set or any other set.
+
+        @param others The sets (or iterables of ranges) to unite
+        @return       A new IntervalSet
+        """
+        return self._combine( others, lambda a, b: a or b )
+
+
+    #=========================================================================
+    def _combine( self, others, rule ):
+        """
+        Combines this set with other sets, one at a time.
+
+        @param others The sets (or iterables of ranges) to combine
+        @param rule   Function that decides if a value is in the result given
+                      if it is in the current result, and in the other set
+        @return       A new IntervalSet
+        """
+        bounds = self._bounds
+        for other in others:
+            if isinstance( other, IntervalSet ) == False:
+                other = IntervalSet( other )
+            bounds = _merge( bounds, other._bounds, rule )
+        result = IntervalSet()
+        result._bounds = bounds
+        return result
+
+
+#=============================================================================
+class IntervalTree( object ):
+    """
+    Indexes intervals for fast containment (stabbing) and overlap queries.
+
+    This is a centered interval tree:  each node holds the intervals that
+    contain its center value, sorted by both their lower and upper limits.
+    Queries visit one node per level of the tree, and only examine the
+    intervals they report (plus at most one more per node).  Queries use the
+    same limit rules as each interval's `in` operator.
+
+    Building the tree takes O(n log n) time, and is done lazily by the first
+    query.  After that, removing an interval takes it out of its node
+    directly (O(log n) plus the size of the node).  Added intervals are kept
+    in a short list that every query scans, and the tree is only rebuilt
+    once that list grows past the square root of the number of intervals.
+    Alternating updates and queries therefore costs O(sqrt(n) log n)
+    (amortized) per update, and O(sqrt(n)) more per query.
+    """
+
+
+    #=========================================================================
+    # Smallest number of added intervals that triggers a rebuild
+    _pending_min = 16
+
+
+    #=========================================================================
+    def __init__( self, intervals = () ):
+        """
+        Initializes an IntervalTree object.
+
+        @param intervals An iterable of Interval (or RealInterval) objects
+        """
+
+        # Intervals are grouped by value (equal intervals share a list) so
+        # they can be found without comparing every interval.
+        self._intervals = {}
+        self._length    = 0
+        self._pending   = []
+        self._root      = None
+        self._dirty     = True
+        for itvl in intervals:
+            self._intervals.setdefault( itvl, [] ).append( itvl )
+            self._length += 1
+
+
+    #=========================================================================
+    def __iter__( self ):
+        """
+        Provides an iterator over all intervals in the tree.
+
+        @return An iterable object for all intervals in the tree
+        """
+        for group in self._intervals.values():
+            for itvl in group:
+                yield itvl
+
+
+    #=========================================================================
+    def __len__( self ):
+        """
+        Produces the number of intervals in the tree.
+
+        @return The number of intervals in the tree
+        """
+        return self._length
+
+
+    #=========================================================================
+    def add( self, itvl ):
+        """
+        Adds an interval to the tree.
+
+        @param itvl The Interval object to add
+        """
+        self._intervals.setdefault( itvl, [] ).append( itvl )
+        self._length += 1
+        if self._dirty == False:
+            self._pending.append( _ends( itvl ) + ( itvl, ) )
+            limit = max(
+                self._pending_min,
+                int( self._length ** 0.5 )
+            )
+            if len( self._pending ) > limit:
+                self._dirty = True
+
+
+    #=========================================================================
+    def at( self, value ):
+        """
+        Finds all intervals that contain a value.
+
+        @param value The value to find
+        @return      A list of the intervals that contain the value
+        """
+        node   = self._tree()
+        result = [ ends[ 4 ] for ends in self._pending if value in ends[ 4 ] ]
+        while node is not None:
+            center, by_low, by_high, left, right = node
+
+            # Intervals in this node contain the center, so only the limits on
+            # the same side of the center as the value need to be checked.
+            if value < center:
+                for ends in by_low:
+                    if ends[ 0 ] > value:
+                        break
+                    if value in ends[ 4 ]:
+                        result.append( ends[ 4 ] )
+                node = left
+            elif value > center:
+                for ends in by_high:
+                    if ends[ 2 ] < value:
+                        break
+                    if value in ends[ 4 ]:
+                        result.append( ends[ 4 ] )
+                node = right
+            else:
+                result.extend(
+                    ends[ 4 ] for ends in by_low if value in ends[ 4 ]
+                )
+                break
+        return result
+
+
+    #=========================================================================
+    def overlap( self, item ):
+        """
+        Finds all intervals that share any values with a range.
+
+        @param item A half-open range given as a two-sequence, or an Interval
+                    object
+        @return     A list of the intervals that overlap the range
+        """
+        query  = _ends( item )
+        low    = query[ 0 ]
+        high   = query[ 2 ]
+        if _isempty( query ):
+            return []
+        nodes  = [ self._tree() ]
+        result = [
+            ends[ 4 ] for ends in self._pending if _overlapping( ends, query )
+        ]
+        while len( nodes ) > 0:
+            node = nodes.pop()
+            if node is None:
+                continue
+            center, by_low, by_high, left, right = node
+
+            # Only intervals that start below the end of the range can
+            # overlap a range entirely below the center.
+            if high < center:
+                for ends in by_low:
+                    if ends[ 0 ] > high:
+                        break
+                    if _overlapping( ends, query ):
+                        result.append( ends[ 4 ] )
+                nodes.append( left )
+
+            # Only intervals that end above the start of the range can
+            # overlap a range entirely above the center.
+            elif low > center:
+                for ends in by_high:
+                    if ends[ 2 ] < low:
+                        break
+                    if _overlapping( ends, query ):
+                        result.append( ends[ 4 ] )
+                nodes.append( right )
+
+            # The range includes the center, so check every interval here.
+            else:
+                result.extend(
+                    ends[ 4 ] for ends in by_low
+                    if _overlapping( ends, query )
+                )
+                nodes.append( left )
+                nodes.append( right )
+        return result
+
+
+    #=========================================================================
+    def remove( self, itvl ):
+        """
+        Removes an interval from the tree.
+
+        @param itvl The Interval object to remove
+        @throws     ValueError if the interval is not in the tree
+        """
+        group = self._intervals.get( itvl )
+        if group is None:
+            raise ValueError( '{} is not in the tree.'.format( itvl ) )
+        itvl = group.pop()
+        if len( group ) == 0:
+            del self._intervals[ itvl ]
+        self._length -= 1
+        if self._dirty:
+            return
+
+        # Remove a recently-added interval from the list of added intervals.
+        for index, ends in enumerate( self._pending ):
+            if ends[ 4 ] is itvl:
+                del self._pending[ index ]
+                return
+
+        # Find the node holding the interval the same way it was placed when
+        # the tree was built (see: `_build_node()`).
+        ends = _ends( itvl )
+        node = self._root
+        while node is not None:
+            center, by_low, by_high, left, right = node
+            if ends[ 2 ] < center:
+                node = left
+            elif ends[ 0 ] > center:
+                node = right
+            else:
+                _remove_item( by_low, itvl )
+                _remove_item( by_high, itvl )
+                return
+
+
+    #=========================================================================
+    def _tree( self ):
+        """
+        Provides the root node of the tree, building it if needed.
+
+        @return The root node, or None if the tree is empty
+        """
+        if self._dirty:
+            ends = [ _ends( itvl ) + ( itvl, ) for itvl in self ]
+            self._root    = _build_node( ends )
+            self._pending = []
+            self._dirty   = False
+        return self._root
+
+
+#=============================================================================
+def _build_node( items ):
+    """
+    Recursively builds a node of an interval tree.
+
+    @param items A list of limit tuples (see: `_ends()`) each extended with
+                 the interval they describe
+    @return      A node as a list of the center value, the items containing
+                 the center sorted by ascending lower limits, the same items
+                 sorted by descending upper limits, and the nodes for the items
+                 entirely below and above the center;  None if there are no
+                 items
+    """
+    if len( items ) == 0:
+        return None
+
+    # Split the items around the median of all their limits.
+    limits = sorted( l for ends in items for l in ( ends[ 0 ], ends[ 2 ] ) )
+    center = limits[ len( limits ) // 2 ]
+    below  = []
+    above  = []
+    here   = []
+    for ends in items:
+        if ends[ 2 ] < center:
+            below.append( ends )
+        elif ends[ 0 ] > center:
+            above.append( ends )
+        else:
+            here.append( ends )
+
+    return [
+        center,
+        sorted( here, key = lambda ends: ends[ 0 ] ),
+        sorted( here, key = lambda ends: ends[ 2 ], reverse = True ),
+        _build_node( below ),
+        _build_node( above )
+    ]
+
+
+#=============================================================================
+def _coalesce( ranges ):
+    """
+    Coalesces sorted ranges into the limits of disjoint ranges.
+
+    @param ranges A sorted list of non-empty ( low, high ) ranges
+    @return       A flat list of the limits of the disjoint ranges
+    """
+    bounds = []
+    for low, high in ranges:
+        if ( len( bounds ) > 0 ) and ( low <= bounds[ -1 ] ):
+            bounds[ -1 ] = max( bounds[ -1 ], high )
+        else:
+            bounds.extend( ( low, high ) )
+    return bounds
+
+
+#=============================================================================
+def _ends( item ):
+    """
+    Determines the limits of an interval, and which limits are included.
+
+    @param item An Interval object, or a two-sequence of the limits of a
+                half-open range
+    @return     A 4-tuple of the lower limit, true if the lower limit is
+                included, the upper limit, and true if the upper limit is
+                included
+    """
+    if isinstance( item, Interval ) == False:
+        low, high = _limits( item )
+        return ( low, True, high, False )
+    if item.neg:
+        return ( item.stop, item._closed, item.start, True )
+    return ( item.start, True, item.stop, item._closed )
+
+
+#=============================================================================
+def _exact_values( base, step, offsets ):
+    """
+    Computes correctly-rounded floating-point values for exact intervals.
+
+    @param base    The base value of the interval as a fraction
+    @param step    The step of the interval as a fraction
+    @param offsets An integer array of offsets from the base value
+    @return        A floating-point array of the values at each offset
+    """
+
+    # Nothing to compute for empty intervals.
+    if len( offsets ) == 0:
+        return numpy.zeros( 0 )
+
+    # Put the base and step over a common denominator.
+    denominator = base.denominator * step.denominator
+    a = base.numerator * step.denominator
+    b = step.numerator * base.denominator
+
+    # Integer numerators that fit in a double are divided with a single,
+    # correctly-rounded floating-point operation.
+    limit = abs( a ) + abs( b ) * int( numpy.absolute( offsets ).max() )
+    if ( limit < 2 ** 53 ) and ( denominator < 2 ** 53 ):
+        numerators = offsets * b
+        numerators += a
+        return numerators / float( denominator )
+
+    # Very large numerators and denominators fall back to fractions.
+    return numpy.array(
+        [ float( fractions.Fraction( a + b * int( o ), denominator ) )
+          for o in offsets ],
+        dtype = float
+    )
+
+
+#=============================================================================
+def _fraction( value ):
+    """
+    Converts a value into an exact fraction.
+
+    @param value A number, or a string representing a number
+    @return      The exact fraction;  Floating-point numbers are converted
+                 using their shortest decimal representation.
+    """
+    if isinstance( value, float ):
+        return fractions.Fraction( repr( value ) )
+    return fractions.Fraction( value )
+
+
+#=============================================================================
+def _isempty( ends ):
+    """
+    Tests the limits of an interval to see if it contains no values.
+
+    @param ends The limits of the interval (see: `_ends()`)
+    @return     True if the interval is empty
+    """
+    if ends[ 0 ] == ends[ 2 ]:
+        return not ( ends[ 1 ] and ends[ 3 ] )
+    return ends[ 0 ] > ends[ 2 ]
+
+
+#=============================================================================
+def _isreal( value ):
+    """
+    Tests a value to see if it should create a RealInterval.
+
+    @param value The value to test
+    @return      True if the value is a non-integral real number (including
+                 decimals)
+    """
+    if isinstance( value, numbers.Integral ):
         return False
+    return isinstance( value, ( numbers.Real, decimal.Decimal ) )
 
+
+#=============================================================================
+def _limits( item ):
+    """
+    Determines the limits of a half-open range.
+
+    Intervals are converted using their first and last values, so the range
+    covers every value in the interval (and extends one step past the
+    largest value).
+
+    @param item An Interval object, or a two-sequence of limits
+    @return     A two-tuple of the lower and upper limits
+    @throws     ValueError if the interval includes its "stop" limit (this
+                can not be represented by a half-open range)
+    """
+    if isinstance( item, Interval ) == False:
+        return ( item[ 0 ], item[ 1 ] )
+    if item._closed:
+        raise ValueError(
+            'Unable to use a closed interval as a half-open range.'
+        )
+    if item._length == 0:
+        return ( item.start, item.start )
+    base, first, stride = item._offsets()
+    values = (
+        base + item.step * first,
+        base + item.step * ( first + stride * ( item._length - 1 ) )
+    )
+    return ( min( values ), max( values ) + abs( item.step ) )
+
+
+#=============================================================================
+def _merge( first, second, rule ):
+    """
+    Merges the limits of two sets of disjoint ranges.
+
+    @param first  The flat list of limits of the first set
+    @param second The flat list of limits of the second set
+    @param rule   Function that decides if a value is in the result given if
+                  it is in the first set, and in the second set
+    @return       The flat list of limits of the merged set
+    """
+    bounds  = []
+    inside  = False
+    index_a = 0
+    index_b = 0
+    count_a = len( first )
+    count_b = len( second )
+    while ( index_a < count_a ) or ( index_b < count_b ):
+
+        # Step to the next limit in either set (or both).
+        if index_b == count_b:
+            value = first[ index_a ]
+        elif index_a == count_a:
+            value = second[ index_b ]
+        else:
+            value = min( first[ index_a ], second[ index_b ] )
+        while ( index_a < count_a ) and ( first[ index_a ] == value ):
+            index_a += 1
+        while ( index_b < count_b ) and ( second[ index_b ] == value ):
+            index_b += 1
+
+        # Record a limit when membership changes at this value.
+        member = bool( rule( index_a & 1, index_b & 1 ) )
+        if member != inside:
+            bounds.append( value )
+            inside = member
+    return bounds
+
+
+#=============================================================================
+def _overlapping( ends, query ):
+    """
+    Tests two intervals to see if they share any values.
+
+    @param ends  The limits of the first interval (see: `_ends()`)
+    @param query The limits of the second interval (see: `_ends()`)
+    @return      True if the intervals overlap
+    """
+
+    # Each interval must begin before the other one ends.  When limits are
+    # equal, both must be included.
+    if ( ends[ 0 ] > query[ 2 ] ) or ( query[ 0 ] > ends[ 2 ] ):
+        return False
+    if ( ends[ 0 ] == query[ 2 ] ) and not ( ends[ 1 ] and query[ 3 ] ):
+        return False
+    if ( query[ 0 ] == ends[ 2 ] ) and not ( query[ 1 ] and ends[ 3 ] ):
+        return False
+
+    # Empty intervals do not overlap anything.
+    return ( _isempty( ends ) or _isempty( query ) ) == False
+
+
+#=============================================================================
+def _remove_item( items, itvl ):
+    """
+    Removes the item describing an interval object from a node's list.
+
+    @param items A list of limit tuples extended with their intervals (see:
+                 `_build_node()`)
+    @param itvl  The interval object to remove
+    """
+    for index, ends in enumerate( items ):
+        if ends[ 4 ] is itvl:
+            del items[ index ]
+            return
@@ -0,0 +1,426 @@
+#=============================================================================
+#
+# Portable Network Graphics
+#
+#=============================================================================
+
+"""
+Portable Network Graphics
+=========================
+
+Reads and writes PNG images in memory (no external libraries or programs are
+needed).  Images are (h,w) arrays of packed, straight-alpha 32-bit colors
+using the channel orders of `hzgfx.color.ColorAlpha`, so they can be passed
+directly to the batch color functions (e.g. `hzgfx.color.resample()`).
+
+All standard color types and bit depths are decoded (including palettes and
+`tRNS` transparency).  Interlaced images are not supported.  Images are
+always encoded as 8-bit RGBA.
+"""
+
+
+import struct
+import zlib
+
+from ._optional import numpy
+from ._optional import require_numpy as _require_numpy
+from . import color
+
+
+__version__ = '0.0.0'
+
+
+#=============================================================================
+# The eight bytes that begin every PNG file
+SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
+
+#=============================================================================
+# PNG color types
+TYPE_GRAY       = 0
+TYPE_RGB        = 2
+TYPE_PALETTE    = 3
+TYPE_GRAY_ALPHA = 4
+TYPE_RGBA       = 6
+
+
+#=============================================================================
+# Number of samples per pixel, and valid bit depths for each color type
+_CHANNELS = {
+    TYPE_GRAY       : ( 1, ( 1, 2, 4, 8, 16 ) ),
+    TYPE_RGB        : ( 3, ( 8, 16 ) ),
+    TYPE_PALETTE    : ( 1, ( 1, 2, 4, 8 ) ),
+    TYPE_GRAY_ALPHA : ( 2, ( 8, 16 ) ),
+    TYPE_RGBA       : ( 4, ( 8, 16 ) )
+}
+
+
+#=============================================================================
+def decode( data, order = None ):
+    """
+    Decodes a PNG image.
+
+    @param data  The contents of a PNG file
+    @param order The channel order of the packed colors (default is the
+                 `ColorAlpha.order` attribute)
+    @return      The (h,w) array of packed, straight-alpha colors
+    @throws      ImportError if NumPy is not installed
+    @throws      ValueError if the data is not a valid (or supported) PNG
+                 image
+    """
+    _require_numpy( 'png.decode()' )
+    if data[ : 8 ] != SIGNATURE:
+        raise ValueError( 'Missing PNG signature.' )
+
+    # Collect the chunks needed to decode the image.
+    header  = None
+    palette = None
+    alpha   = None
+    idat    = []
+    for kind, payload in _chunks( data ):
+        if kind == b'IHDR':
+            header = struct.unpack( '>IIBBBBB', payload )
+        elif kind == b'PLTE':
+            palette = numpy.frombuffer( payload, dtype = numpy.uint8 )
+        elif kind == b'tRNS':
+            alpha = payload
+        elif kind == b'IDAT':
+            idat.append( payload )
+        elif kind == b'IEND':
+            break
+    if header is None:
+        raise ValueError( 'Missing PNG header.' )
+    width, height, depth, ctype, compression, method, interlace = header
+    if ( ctype not in _CHANNELS ) or ( depth not in _CHANNELS[ ctype ][ 1 ] ):
+        raise ValueError(
+            'Unsupported PNG color type {} with depth {}.'.format(
+                ctype,
+                depth
+            )
+        )
+    if ( compression != 0 ) or ( method != 0 ) or ( interlace != 0 ):
+        raise ValueError( 'Unsupported PNG compression or interlacing.' )
+    if ( ctype == TYPE_PALETTE ) and ( palette is None ):
+        raise ValueError( 'Missing PNG palette.' )
+
+    # Reverse the filter of every row, and separate the samples.
+    channels = _CHANNELS[ ctype ][ 0 ]
+    bits     = channels * depth
+    stride   = ( width * bits + 7 ) // 8
+    try:
+        raw = zlib.decompress( b''.join( idat ) )
+    except zlib.error as error:
+        raise ValueError( 'Invalid PNG image data: {}'.format( error ) )
+    if len( raw ) < ( ( stride + 1 ) * height ):
+        raise ValueError( 'Truncated PNG image data.' )
+    rows    = _unfilter( raw, height, stride, max( 1, bits // 8 ) )
+    samples = _samples( rows, width, channels, depth )
+
+    # Expand every color type to 8-bit RGBA channels.
+    rgba = numpy.empty( ( height, width, 4 ), dtype = numpy.uint8 )
+    rgba[ ..., 3 ] = 0xFF
+    if ctype == TYPE_PALETTE:
+        entries = palette.reshape( ( -1, 3 ) )
+        index   = numpy.minimum( samples[ ..., 0 ], len( entries ) - 1 )
+        rgba[ ..., : 3 ] = entries[ index ]
+        if alpha is not None:
+            table = numpy.full( 256, 0xFF, dtype = numpy.uint8 )
+            table[ : len( alpha ) ] = bytearray( alpha )
+            rgba[ ..., 3 ] = table[ samples[ ..., 0 ] ]
+    else:
+        scaled = _to8( samples, depth )
+        if ctype in ( TYPE_GRAY, TYPE_GRAY_ALPHA ):
+            rgba[ ..., : 3 ] = scaled[ ..., 0, None ]
+        else:
+            rgba[ ..., : 3 ] = scaled[ ..., : 3 ]
+        if ctype in ( TYPE_GRAY_ALPHA, TYPE_RGBA ):
+            rgba[ ..., 3 ] = scaled[ ..., -1 ]
+        elif alpha is not None:
+            key = struct.unpack(
+                '>{}H'.format( channels ),
+                alpha[ : 2 * channels ]
+            )
+            rgba[ ( samples == key ).all( axis = -1 ), 3 ] = 0
+
+    return color.ColorAlpha.pack_many( rgba, order )
+
+
+#=============================================================================
+def encode( colors, order = None, level = 9 ):
+    """
+    Encodes an image as an 8-bit RGBA PNG image.
+
+    Each row is filtered with the standard filter (none, sub, or up) that
+    minimizes the sum of its filtered values.
+
+    @param colors The (h,w) array of packed, straight-alpha colors
+    @param order  The channel order of the packed colors (default is the
+                  `ColorAlpha.order` attribute)
+    @param level  The zlib compression level (0 to 9)
+    @return       The contents of a PNG file
+    @throws       ImportError if NumPy is not installed
+    @throws       ValueError if the image is not a 2-D array of colors
+    """
+    _require_numpy( 'png.encode()' )
+    colors = numpy.asarray( colors, dtype = numpy.uint32 )
+    if ( colors.ndim != 2 ) or ( colors.size == 0 ):
+        raise ValueError(
+            'Unable to encode an image with shape {}.'.format( colors.shape )
+        )
+    height, width = colors.shape
+    rows = color.ColorAlpha.unpack_many( colors, order ).reshape(
+        ( height, width * 4 )
+    )
+    header = struct.pack( '>IIBBBBB', width, height, 8, TYPE_RGBA, 0, 0, 0 )
+    return b''.join( (
+        SIGNATURE,
+        _chunk( b'IHDR', header ),
+        _chunk( b'IDAT', zlib.compress( _filter( rows, 4 ), level ) ),
+        _chunk( b'IEND', b'' )
+    ) )
+
+
+#=============================================================================
+def load( filename, order = None ):
+    """
+    Reads a PNG image from a file.
+
+    @param filename The name of the PNG file
+    @param order    The channel order of the packed colors (see: `decode()`)
+    @return         The (h,w) array of packed, straight-alpha colors
+    """
+    with open( filename, 'rb' ) as handle:
+        return decode( handle.read(), order )
+
+
+#=============================================================================
+def save( filename, colors, order = None ):
+    """
+    Writes an image to a PNG file.
+
+    @param filename The name of the PNG file
+    @param colors   The (h,w) array of packed, straight-alpha colors
+    @param order    The channel order of the packed colors (see: `encode()`)
+    """
+    data = encode( colors, order )
+    with open( filename, 'wb' ) as handle:
+        handle.write( data )
+
+
+#=============================================================================
+def size( data ):
+    """
+    Reads the dimensions of a PNG image from its header.
+
+    @param data The contents of a PNG file (at least the first 24 bytes)
+    @return     The (w,h) dimensions of the image
+    @throws     ValueError if the data is not a PNG image
+    """
+    if ( data[ : 8 ] != SIGNATURE ) or ( data[ 12 : 16 ] != b'IHDR' ):
+        raise ValueError( 'Missing PNG signature.' )
+    return struct.unpack( '>II', data[ 16 : 24 ] )
+
+
+#=============================================================================
+def _chunk( kind, payload ):
+    """
+    Builds a PNG chunk.
+
+    @param kind    The four-byte chunk type
+    @param payload The contents of the chunk
+    @return        The chunk's length, type, contents, and CRC
+    """
+    crc = zlib.crc32( kind + payload ) & 0xFFFFFFFF
+    return struct.pack( '>I', len( payload ) ) + kind + payload \
+         + struct.pack( '>I', crc )
+
+
+#=============================================================================
+def _chunks( data ):
+    """
+    Generates the chunks of a PNG file.
+
+    @param data The contents of a PNG file
+    @return     A generator of ( type, payload ) pairs
+    @throws     ValueError if a chunk is truncated or corrupted
+    """
+    offset = 8
+    while offset + 12 <= len( data ):
+        length, = struct.unpack( '>I', data[ offset : offset + 4 ] )
+        kind    = data[ offset + 4 : offset + 8 ]
+        payload = data[ offset + 8 : offset + 8 + length ]
+        end     = offset + 12 + length
+        if end > len( data ):
+            raise ValueError( 'Truncated PNG chunk.' )
+        crc, = struct.unpack( '>I', data[ end - 4 : end ] )
+        if crc != ( zlib.crc32( kind + payload ) & 0xFFFFFFFF ):
+            raise ValueError( 'Corrupted PNG chunk.' )
+        yield kind, payload
+        offset = end
+
+
+#=============================================================================
+def _filter( rows, bpp ):
+    """
+    Filters the rows of an image for compression.
+
+    @param rows The (h,stride) array of row bytes
+    @param bpp  The number of bytes per pixel
+    @return     The filtered image data (a filter type byte before each row)
+    """
+
+    # Compute every candidate filter for all rows at once.
+    above = numpy.zeros_like( rows )
+    above[ 1 : ] = rows[ : -1 ]
+    left  = numpy.zeros_like( rows )
+    left[ :, bpp : ] = rows[ :, : -bpp ]
+    candidates = numpy.stack( ( rows, rows - left, rows - above ) )
+
+    # Choose the filter with the smallest sum of (signed) differences.
+    signed = candidates.view( numpy.int8 ).astype( numpy.int32 )
+    choice = numpy.abs( signed ).sum( axis = 2 ).argmin( axis = 0 )
+    height = rows.shape[ 0 ]
+    result = numpy.empty( ( height, rows.shape[ 1 ] + 1 ), numpy.uint8 )
+    result[ :, 0 ]   = choice
+    result[ :, 1 : ] = candidates[ choice, numpy.arange( height ) ]
+    return result.tobytes()
+
+
+#=============================================================================
+def _samples( rows, width, channels, depth ):
+    """
+    Separates the samples of each pixel from the unfiltered rows.
+
+    @param rows     The (h,stride) array of unfiltered row bytes
+    @param width    The number of pixels in each row
+    @param channels The number of samples per pixel
+    @param depth    The number of bits per sample
+    @return         An (h,w,channels) array of sample values
+    """
+    height = rows.shape[ 0 ]
+    if depth == 8:
+        return rows[ :, : width * channels ].reshape( ( height, width, -1 ) )
+    if depth == 16:
+        wide = rows[ :, : width * channels * 2 ].copy().view( '>u2' )
+        return wide.astype( numpy.uint16 ).reshape( ( height, width, -1 ) )
+    bits   = numpy.unpackbits( rows, axis = 1 )
+    bits   = bits.reshape( ( height, -1, depth ) )
+    places = 1 << numpy.arange( depth - 1, -1, -1 )
+    values = ( bits * places.astype( numpy.uint8 ) ).sum( axis = 2 )
+    return values[ :, : width, None ].astype( numpy.uint8 )
+
+
+#=============================================================================
+def _to8( samples, depth ):
+    """
+    Scales samples of any bit depth to 8 bits.
+
+    @param samples The array of sample values
+    @param depth   The number of bits per sample
+    @return        The array of 8-bit sample values
+    """
+    if depth == 8:
+        return samples
+    if depth == 16:
+        return ( samples >> 8 ).astype( numpy.uint8 )
+    scale = 0xFF // ( ( 1 << depth ) - 1 )
+    return ( samples * scale ).astype( numpy.uint8 )
+
+
+#=============================================================================
+def _unfilter( raw, height, stride, bpp ):
+    """
+    Reverses the filter of every row of an image.
+
+    @param raw    The decompressed image data
+    @param height The number of rows
+    @param stride The number of bytes in each row (without the filter type)
+    @param bpp    The number of bytes per (whole) pixel
+    @return       The (h,stride) array of unfiltered row bytes
+    """
+    data  = numpy.frombuffer(
+        raw,
+        dtype = numpy.uint8,
+        count = height * ( stride + 1 )
+    )
+    data  = data.reshape( ( height, stride + 1 ) )
+    kinds = data[ :, 0 ]
+    rows  = data[ :, 1 : ].copy()
+    prior = numpy.zeros( stride, dtype = numpy.uint8 )
+    for index in range( height ):
+        kind = kinds[ index ]
+        line = rows[ index ]
+
+        # Sub and up filters are reversed with vectorized arithmetic.
+        if kind == 1:
+            if stride % bpp == 0:
+                lanes = line.reshape( ( -1, bpp ) )
+                numpy.cumsum(
+                    lanes,
+                    axis  = 0,
+                    dtype = numpy.uint8,
+                    out   = lanes
+                )
+            else:
+                for offset in range( bpp, stride ):
+                    line[ offset ] += line[ offset - bpp ]
+        elif kind == 2:
+            line += prior
+
+        # Average and Paeth filters depend on the previous unfiltered byte.
+        elif kind in ( 3, 4 ):
+            values = bytearray( line.tobytes() )
+            above  = bytearray( prior.tobytes() )
+            if kind == 3:
+                _unaverage( values, above, bpp )
+            else:
+                _unpaeth( values, above, bpp )
+            line[ : ] = numpy.frombuffer( values, dtype = numpy.uint8 )
+
+        elif kind != 0:
+            raise ValueError( 'Invalid PNG filter type: {}'.format( kind ) )
+        prior = line
+    return rows
+
+
+#=============================================================================
+def _unaverage( line, above, bpp ):
+    """
+    Reverses the average filter of a row in place.
+
+    @param line  The filtered row bytes
+    @param above The unfiltered bytes of the previous row
+    @param bpp   The number of bytes per (whole) pixel
+    """
+    for offset in range( bpp ):
+        line[ offset ] = ( line[ offset ] + ( above[ offset ] >> 1 ) ) & 0xFF
+    for offset in range( bpp, len( line ) ):
+        average = ( line[ offset - bpp ] + above[ offset ] ) >> 1
+        line[ offset ] = ( line[ offset ] + average ) & 0xFF
+
+
+#=============================================================================
+def _unpaeth( line, above, bpp ):
+    """
+    Reverses the Paeth filter of a row in place.
+
+    @param line  The filtered row bytes
+    @param above The unfiltered bytes of the previous row
+    @param bpp   The number of bytes per (whole) pixel
+    """
+    for offset in range( bpp ):
+        line[ offset ] = ( line[ offset ] + above[ offset ] ) & 0xFF
+    for offset in range( bpp, len( line ) ):
+        a  = line[ offset - bpp ]
+        b  = above[ offset ]
+        c  = above[ offset - bpp ]
+        pa = abs( b - c )
+        pb = abs( a - c )
+        pc = abs( a + b - c - c )
+        if ( pa <= pb ) and ( pa <= pc ):
+            predictor = a
+        elif pb <= pc:
+            predictor = b
+        else:
+            predictor = c
+        line[ offset ] = ( line[ offset ] + predictor ) & 0xFF
@@ -0,0 +1,420 @@
+#!/usr/bin/env python
+#=============================================================================
+#
+# Micro-benchmarks for hzgfx
+#
+#=============================================================================
+
+"""
+Micro-benchmarks for hzgfx
+==========================
+
+Times frequently-called operations in the package.  Each benchmark prints the
+average time per call for every variant it compares.  Run the script from the
+root of the repository (or with the package on the Python path), and name the
+benchmarks to run (all benchmarks are run by default).
+"""
+
+
+import collections
+import multiprocessing
+import os
+import random
+import sys
+import timeit
+
+
+__version__ = '0.0.0'
+
+
+#=============================================================================
+# Allow running the script from a source checkout.
+sys.path.insert( 0, os.path.join( os.path.dirname( __file__ ), os.pardir ) )
+
+import hzgfx.cartmap
+import hzgfx.interval
+
+
+#=============================================================================
+class LegacyInterval( object ):
+    """
+    Interval that computes derived attributes on every access (the original
+    `hzgfx.interval.Interval` implementation) used as a point of comparison.
+    """
+
+
+    #=========================================================================
+    def __init__( self, start, stop, step = 1 ):
+        self.start = start
+        self.stop  = stop
+        self.step  = step
+
+
+    #=========================================================================
+    def __contains__( self, value ):
+        if self.neg and ( ( value <= self.start ) and ( value > self.stop ) ):
+            return True
+        elif ( value >= self.start ) and ( value < self.stop ):
+            return True
+        return False
+
+
+    #=========================================================================
+    def __getattr__( self, name ):
+        if name == 'delta':
+            return self.stop - self.start
+        elif name == 'neg':
+            return self.start > self.stop
+        elif name == 'pos':
+            return self.start < self.stop
+        raise AttributeError( name )
+
+
+    #=========================================================================
+    def __getitem__( self, offset ):
+        length = len( self )
+        if type( offset ) is float:
+            offset = int( offset * length )
+        if offset < 0:
+            offset += length
+        if self.neg == True:
+            return self.stop + self.step * offset
+        return self.start + self.step * offset
+
+
+    #=========================================================================
+    def __len__( self ):
+        return int( abs( self.delta / self.step ) )
+
+
+#=============================================================================
+class LegacyPlane( object ):
+    """
+    Plane that looks up attributes through a chain of name comparisons (the
+    original `hzgfx.cartmap.Plane` implementation) used as a point of
+    comparison.
+    """
+
+
+    #=========================================================================
+    def __init__( self, lefttop, rightbot, step = 1 ):
+        self._cmake = hzgfx.cartmap.Point
+        self._dmake = hzgfx.cartmap.Dimension
+        if isinstance( step, ( tuple, list ) ):
+            xstep, ystep = step[ 0 : 2 ]
+        else:
+            xstep = step
+            ystep = step
+        left, top  = lefttop[ 0 : 2 ]
+        right, bot = rightbot[ 0 : 2 ]
+        self._x = hzgfx.interval.Interval( left, right, xstep )
+        self._y = hzgfx.interval.Interval( top, bot, ystep )
+
+
+    #=========================================================================
+    def __getattr__( self, name ):
+        if name == 'aspect':
+            return self._x.delta / self._y.delta
+        elif ( name == 'bottom' ) or ( name == 'b' ):
+            return self._y.stop
+        elif ( name == 'delta' ) or ( name == 'd' ):
+            return self._dmake( self._x.delta, self._y.delta )
+        elif ( name == 'deltax' ) or ( name == 'dx' ):
+            return self._x.delta
+        elif ( name == 'deltay' ) or ( name == 'dy' ):
+            return self._y.delta
+        elif ( name == 'dimensions' ) or ( name == 'dim' ):
+            return self._dmake( len( self._x ), len( self._y ) )
+        elif ( name == 'height' ) or ( name == 'h' ):
+            return len( self._y )
+        elif ( name == 'left' ) or ( name == 'l' ):
+            return self._x.start
+        elif ( name == 'lefttop' ) or ( name == 'lt' ):
+            return self._cmake( self._x.start, self._y.start )
+        elif ( name == 'right' ) or ( name == 'r' ):
+            return self._x.stop
+        elif ( name == 'rightbot' ) or ( name == 'rb' ):
+            return self._cmake( self._x.stop, self._y.stop )
+        elif ( name == 'top' ) or ( name == 't' ):
+            return self._y.start
+        elif ( name == 'width') or ( name == 'w' ):
+            return len( self._x )
+        raise AttributeError( 'Unknown attribute: {}'.format( name ) )
+
+
+#=============================================================================
+def bench_complex( number ):
+    """
+    Compares rendering the Mandelbrot set with pure-Python arithmetic, with
+    vectorized NumPy tiles, and with tiles spread across worker processes.
+
+    @param number The number of calls to time for each operation (unused;
+                  each rendering is timed once per run)
+    @return       A list of ( label, seconds per call ) results
+    """
+    plane = hzgfx.cartmap.ComplexPlane(
+        ( -2.0, -1.25 ),
+        ( 0.5, 1.25 ),
+        0.005
+    )
+    limit = 64
+
+    # Always use a process pool (even with a single CPU).
+    workers = max( 2, multiprocessing.cpu_count() )
+
+    def python():
+        counts = []
+        for y in plane._y:
+            for x in plane._x:
+                c = complex( x, y )
+                z = 0j
+                for count in range( limit ):
+                    if abs( z ) > 2.0:
+                        break
+                    z = z * z + c
+                else:
+                    count = limit
+                counts.append( count )
+        return counts
+
+    return [
+        ( 'complex pure-Python mandelbrot', measure( python, 1 ) ),
+        (
+            'complex vectorized mandelbrot',
+            measure( lambda: plane.mandelbrot( limit ), 1 )
+        ),
+        (
+            'complex {} workers mandelbrot'.format( workers ),
+            measure(
+                lambda: plane.mandelbrot( limit, workers = workers ),
+                1
+            )
+        )
+    ]
+
+
+#=============================================================================
+def bench_interval( number ):
+    """
+    Compares interval indexing and containment tests.
+
+    @param number The number of calls to time for each operation
+    @return       A list of ( label, seconds per call ) results
+    """
+    variants = [
+        ( 'legacy', LegacyInterval( 0, 1000, 2 ) ),
+        ( 'slotted', hzgfx.interval.Interval( 0, 1000, 2 ) )
+    ]
+    results = []
+    for name, itvl in variants:
+        results.append( (
+            'interval {} __getitem__'.format( name ),
+            measure( lambda: itvl[ 250 ], number )
+        ) )
+        results.append( (
+            'interval {} __contains__'.format( name ),
+            measure( lambda: 250 in itvl, number )
+        ) )
+    return results
+
+
+#=============================================================================
+def bench_intervaltree( number ):
+    """
+    Compares stabbing and overlap queries over many intervals using a linear
+    scan and an interval tree.
+
+    @param number The number of calls to time for each operation
+    @return       A list of ( label, seconds per call ) results
+    """
+    rng = random.Random( 42 )
+    intervals = []
+    for index in range( 20000 ):
+        start = rng.uniform( 0.0, 100000.0 )
+        intervals.append(
+            hzgfx.interval.RealInterval( start, start + rng.uniform( 1, 50 ) )
+        )
+    tree  = hzgfx.interval.IntervalTree( intervals )
+    tree.at( 0.0 )
+    scans   = max( 1, number // 1000 )
+    queries = max( 1, number // 10 )
+
+    # Replace the oldest interval with a new one before each query (as when
+    # tracking dirty regions).
+    window = collections.deque( intervals )
+
+    def update():
+        start = rng.uniform( 0.0, 100000.0 )
+        itvl  = hzgfx.interval.RealInterval( start, start + 25.0 )
+        window.append( itvl )
+        tree.add( itvl )
+        tree.remove( window.popleft() )
+        return tree.at( 5e4 )
+
+    def update_scan():
+        start = rng.uniform( 0.0, 100000.0 )
+        intervals.append(
+            hzgfx.interval.RealInterval( start, start + 25.0 )
+        )
+        del intervals[ 0 ]
+        return [ i for i in intervals if 5e4 in i ]
+
+    return [
+        (
+            'interval linear scan at()',
+            measure( lambda: [ i for i in intervals if 5e4 in i ], scans )
+        ),
+        (
+            'interval tree at()',
+            measure( lambda: tree.at( 5e4 ), queries )
+        ),
+        (
+            'interval tree overlap()',
+            measure( lambda: tree.overlap( ( 5e4, 5.01e4 ) ), queries )
+        ),
+        (
+            'interval linear scan add/remove/at()',
+            measure( update_scan, scans )
+        ),
+        (
+            'interval tree add/remove/at()',
+            measure( update, queries )
+        )
+    ]
+
+
+#=============================================================================
+def bench_plane( number ):
+    """
+    Compares creating planes, reading their attributes, and building maps
+    between them.
+
+    @param number The number of calls to time for each operation
+    @return       A list of ( label, seconds per call ) results
+    """
+    variants = [
+        ( 'legacy', LegacyPlane ),
+        ( 'slotted', hzgfx.cartmap.Plane )
+    ]
+    results = []
+    slow    = max( 1, number // 10 )
+    for name, make in variants:
+        plane  = make( ( 0.0, 0.0 ), ( 640.0, 480.0 ) )
+        target = make( ( -1.0, -1.0 ), ( 1.0, 1.0 ), 0.25 )
+        results.append( (
+            'plane {} create'.format( name ),
+            measure(
+                lambda: make( ( 0.0, 0.0 ), ( 640.0, 480.0 ) ),
+                slow
+            )
+        ) )
+        results.append( (
+            'plane {} left'.format( name ),
+            measure( lambda: plane.left, number )
+        ) )
+        results.append( (
+            'plane {} w'.format( name ),
+            measure( lambda: plane.w, number )
+        ) )
+        results.append( (
+            'plane {} aspect'.format( name ),
+            measure( lambda: plane.aspect, number )
+        ) )
+        results.append( (
+            'plane {} Map.map_clipped()'.format( name ),
+            measure(
+                lambda: hzgfx.cartmap.Map.map_clipped( plane, target ),
+                slow
+            )
+        ) )
+    return results
+
+
+#=============================================================================
+def measure( function, number ):
+    """
+    Measures the best average time per call of a function.
+
+    @param function The function to call (without arguments)
+    @param number   The number of calls in each timing run
+    @return         The best average number of seconds per call
+    """
+    timer = timeit.Timer( function )
+    return min( timer.repeat( repeat = 3, number = number ) ) / number
+
+
+#=============================================================================
+# Available benchmarks by name
+benchmarks = {
+    'complex'      : bench_complex,
+    'interval'     : bench_interval,
+    'intervaltree' : bench_intervaltree,
+    'plane'        : bench_plane
+}
+
+
+#=============================================================================
+def main( argv ):
+    """
+    Script execution entry point
+
+    @param argv List of arguments passed to the script
+    @return     Shell exit code (0 = success)
+    """
+
+    # imports when using this as a script
+    import argparse
+
+    # create and configure an argument parser
+    parser = argparse.ArgumentParser(
+        description = 'Micro-benchmarks for hzgfx',
+        add_help    = False
+    )
+    parser.add_argument(
+        '-h',
+        '--help',
+        default = False,
+        help    = 'Display this help message and exit.',
+        action  = 'help'
+    )
+    parser.add_argument(
+        '-n',
+        '--number',
+        default = 200000,
+        type    = int,
+        help    = 'Number of calls in each timing run (default: %(default)s).'
+    )
+    parser.add_argument(
+        '-v',
+        '--version',
+        default = False,
+        help    = 'Display script version and exit.',
+        action  = 'version',
+        version = __version__
+    )
+    parser.add_argument(
+        'names',
+        nargs   = '*',
+        help    = 'The benchmarks to run: {} (default: all).'.format(
+            ', '.join( sorted( benchmarks.keys() ) )
+        )
+    )
+
+    # parse the arguments
+    args = parser.parse_args( argv[ 1 : ] )
+    for name in args.names:
+        if name not in benchmarks:
+            parser.error( 'Unknown benchmark: {}'.format( name ) )
+
+    # run each requested benchmark, and report the time per call
+    for name in ( args.names or sorted( benchmarks.keys() ) ):
+        for label, seconds in benchmarks[ name ]( args.number ):
+            print( '{:<40} {:10.3f} us'.format( label, seconds * 1e6 ) )
+
+    # return success
+    return 0
+
+
+#=============================================================================
+if __name__ == "__main__":
+    sys.exit( main( sys.argv ) )
@@ -9,32 +9,476 @@
 Creates .ico Icon Files from SVG Images
 =======================================
 
-This script makes use of [Inkscape](http://inkscape.org/) and ImageMagick.
-The paths at the top of the file allow you to change the location of these
-programs per your installation.
+This script makes use of [Inkscape](http://inkscape.org/).  The path at the
+top of the file allows you to change the location of the program per your
+installation.  The rendered images are packed into each icon in-process (see:
+`hzgfx.ico`), so no other programs are needed.
 
 The icon that is produced contains multiple resolutions to maintain fidelity
-at all common uses for icons on a Windows desktop.
+at all common uses for icons on a Windows desktop.  Images narrower than
+`--png-width` (256 pixels by default) are stored as bitmaps, which every
+version of Windows can read, and larger images are stored as PNG files.
+Storing bitmaps requires NumPy;  without it, every image is stored as a PNG
+file (which Windows XP and earlier can not read).
 
 The source SVG document should use a page layout with square dimensions.  The
 way Inkscape is used, the document's page is used as the source area of the
 icon.
+
+Several icons can be built at once.  Every size of every icon is rasterized
+by a separate Inkscape process, and up to `--jobs` processes run at the same
+time.  If any image fails to rasterize, no more processes are started, and
+no icons are written.
+
+Images are kept in memory until they are written into an icon.  With
+`--pipe`, Inkscape writes each image to its standard output (this requires
+Inkscape 1.0 or later).  Otherwise, Inkscape writes each image to a private
+temporary file that is removed as soon as it is read.
+
+Starting Inkscape takes much longer than rasterizing an icon.  With
+`--downscale`, each icon is rasterized once at its largest size, and the
+smaller sizes are resampled from that image in-process (with either a box or
+a Lanczos filter).  Sizes that are hand-tuned in the SVG document (e.g. with
+pixel-aligned shapes) can still be rasterized separately with `--hinted`.
+Downscaling requires NumPy.
+
+With `--cache`, rendered images and icons are kept in a directory, and
+named by a hash of the source file, the image size, and the tool versions.
+Rebuilding an unchanged icon copies it from the cache without starting
+Inkscape.  Sources may be directories (every SVG file beneath them is
+built).  Use `--stats` to report cache usage, and `--prune` to limit its
+size.
 """
 
 
+import functools
+import hashlib
+import multiprocessing
+import multiprocessing.pool
 import os
 import re
 import subprocess
 import sys
+import tempfile
+import threading
 
 
 __version__ = '0.0.0'
 
 
+#=============================================================================
+# Allow running the script from a source checkout.
+sys.path.insert( 0, os.path.join( os.path.dirname( __file__ ), os.pardir ) )
+
+import hzgfx.color
+import hzgfx.ico
+import hzgfx.png
+
+
 #=============================================================================
 # Try not to rely on the user having their path set up. Adjust as needed.
 INKSCAPE = '/cygdrive/d/Program Files (x86)/Inkscape/inkscape.exe'
-CONVERT  = '/usr/bin/convert'
+
+
+#=============================================================================
+# The icon sizes (in pixels) exported for each ICO file
+SIZES = ( 128, 64, 48, 32, 24, 16 )
+
+
+#=============================================================================
+# Resampling filters for downscaled sizes by name
+FILTERS = {
+    'box'     : hzgfx.color.FILTER_BOX,
+    'lanczos' : hzgfx.color.FILTER_LANCZOS
+}
+
+
+#=============================================================================
+class BuildCache( object ):
+    """
+    On-disk cache of rendered PNG images, and ICO files.
+
+    Items are named by a hash of everything that determines their contents:
+    the bytes of the source SVG file, the size and rendering mode of each
+    image, and the version of the tools (this script, and the Inkscape
+    program).  Unchanged inputs are copied from the cache instead of being
+    rasterized and packed again.
+
+    Every item is a separate file.  Reading an item updates its modification
+    time, so pruning removes the least-recently-used items first.
+    """
+
+
+    #=========================================================================
+    def __init__( self, path, version = None ):
+        """
+        Initializes a BuildCache object.
+
+        @param path    The directory that holds the cache (created as needed)
+        @param version A string identifying the tools (default is the
+                       version of this script, and the Inkscape program)
+        """
+        self.path    = path
+        self.version = _tool_version() if version is None else version
+        self.hits    = 0
+        self.misses  = 0
+
+
+    #=========================================================================
+    def get( self, key ):
+        """
+        Reads an item from the cache.
+
+        @param key The key of the item (see: `key()`)
+        @return    The contents of the item (None if it is not cached)
+        """
+        path = self._item( key )
+        try:
+            with open( path, 'rb' ) as handle:
+                data = handle.read()
+            os.utime( path, None )
+        except ( IOError, OSError ):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return data
+
+
+    #=========================================================================
+    def key( self, *parts ):
+        """
+        Builds the key of an item from the parts that determine its contents.
+
+        @param parts Strings, byte strings, or numbers
+        @return      The hexadecimal key of the item
+        """
+        digest = hashlib.sha256()
+        for part in ( self.version, ) + parts:
+            if not isinstance( part, bytes ):
+                part = str( part ).encode( 'utf-8' )
+            digest.update( '{}:'.format( len( part ) ).encode( 'ascii' ) )
+            digest.update( part )
+        return digest.hexdigest()
+
+
+    #=========================================================================
+    def prune( self, limit ):
+        """
+        Removes the least-recently-used items until the cache fits a size
+        limit.
+
+        @param limit The maximum number of bytes used by cached items
+        @return      The number of items removed
+        """
+        items  = sorted( self._items(), key = lambda item: item[ 2 ] )
+        total  = sum( item[ 1 ] for item in items )
+        result = 0
+        for path, size, mtime in items:
+            if total <= limit:
+                break
+            os.unlink( path )
+            total  -= size
+            result += 1
+        return result
+
+
+    #=========================================================================
+    def put( self, key, data ):
+        """
+        Writes an item to the cache.
+
+        The item is written to a temporary file, and renamed so concurrent
+        builds never read partial items.
+
+        @param key  The key of the item (see: `key()`)
+        @param data The contents of the item
+        """
+        path = self._item( key )
+        if os.path.isdir( os.path.dirname( path ) ) == False:
+            try:
+                os.makedirs( os.path.dirname( path ) )
+            except OSError:
+                if os.path.isdir( os.path.dirname( path ) ) == False:
+                    raise
+        temp = '{}.{}.tmp'.format( path, os.getpid() )
+        with open( temp, 'wb' ) as handle:
+            handle.write( data )
+        try:
+            os.rename( temp, path )
+        except OSError:
+            os.unlink( temp )
+            if os.path.isfile( path ) == False:
+                raise
+
+
+    #=========================================================================
+    def stats( self ):
+        """
+        Reports the cache's usage statistics.
+
+        @return A dictionary with the number of item 'hits' and 'misses' (of
+                this object), the number of bytes used by cached items
+                ('nbytes'), and the number of cached items ('length')
+        """
+        sizes = [ item[ 1 ] for item in self._items() ]
+        return {
+            'hits'   : self.hits,
+            'misses' : self.misses,
+            'nbytes' : sum( sizes ),
+            'length' : len( sizes )
+        }
+
+
+    #=========================================================================
+    def _item( self, key ):
+        """
+        Names the file of an item (items are spread across subdirectories
+        named by the first two digits of their keys).
+        """
+        return os.path.join( self.path, key[ : 2 ], key )
+
+
+    #=========================================================================
+    def _items( self ):
+        """
+        Lists the ( file name, size, modification time ) of every item.
+        """
+        items = []
+        for path, directories, names in os.walk( self.path ):
+            for name in names:
+                if name.endswith( '.tmp' ):
+                    continue
+                info = os.stat( os.path.join( path, name ) )
+                items.append(
+                    ( os.path.join( path, name ), info.st_size, info.st_mtime )
+                )
+        return items
+
+
+#=============================================================================
+def _cleanup( pngs ):
+    """
+    Removes temporary PNG files (ignoring files that were never created).
+    """
+    for png in pngs:
+        if os.path.isfile( png ):
+            os.unlink( png )
+
+
+#=============================================================================
+def _downscale( data, sizes, filter ):
+    """
+    Reduces a rasterized image to smaller sizes.
+
+    @param data   The PNG image to reduce
+    @param sizes  The sizes (in pixels) of the reduced images
+    @param filter The resampling filter (one of the `hzgfx.color.FILTER_*`
+                  constants)
+    @return       A list of the PNG images of each size
+    """
+    colors = hzgfx.png.decode( data )
+    return [
+        hzgfx.png.encode(
+            hzgfx.color.resample( colors, ( size, size ), filter )
+        )
+        for size in sizes
+    ]
+
+
+#=============================================================================
+def _find_sources( paths ):
+    """
+    Expands directories into the SVG files they contain.
+
+    @param paths A list of SVG files, and directories to search
+    @return      A list of SVG files (the files in each directory are sorted)
+    """
+    sources = []
+    for path in paths:
+        if os.path.isdir( path ) == False:
+            sources.append( path )
+            continue
+        found = []
+        for directory, directories, names in os.walk( path ):
+            found.extend(
+                os.path.join( directory, name )
+                for name in names if name.endswith( '.svg' )
+            )
+        sources.extend( sorted( found ) )
+    return sources
+
+
+#=============================================================================
+def _pack( datas, png_width ):
+    """
+    Packs rendered images into an icon.
+
+    @param datas     The PNG images of each size
+    @param png_width The minimum width of images that are stored as PNG
+                     files (narrower images are decoded, and stored as
+                     bitmaps)
+    @return          The contents of the ICO file
+    """
+    datas = [
+        hzgfx.png.decode( data )
+        if hzgfx.png.size( data )[ 0 ] < png_width else data
+        for data in datas
+    ]
+    return hzgfx.ico.encode( datas, png_width = png_width )
+
+
+#=============================================================================
+def _parse_size( value ):
+    """
+    Parses a number of bytes with an optional K, M, or G suffix.
+    """
+    match = re.match( r'^\s*(\d+)\s*([KMG]?)B?\s*$', value, re.IGNORECASE )
+    if match is None:
+        raise ValueError( 'Invalid size: {}'.format( value ) )
+    power = ' KMG'.index( match.group( 2 ).upper() or ' ' )
+    return int( match.group( 1 ) ) * ( 1024 ** power )
+
+
+#=============================================================================
+def _plan( sizes, downscale, hinted ):
+    """
+    Chooses the sizes that are rasterized by Inkscape.
+
+    @param sizes     The sizes (in pixels) to export
+    @param downscale Set to resample smaller sizes from the largest size
+    @param hinted    The sizes that are always rasterized when downscaling
+    @return          The set of sizes to rasterize
+    """
+    if downscale == True:
+        return set( hinted ) | set( [ max( sizes ) ] )
+    return set( sizes )
+
+
+#=============================================================================
+def _png_keys( cache, filename, sizes, rendered, filter ):
+    """
+    Builds the cache keys of every size of a source file.
+
+    @param cache    The build cache
+    @param filename The source SVG file
+    @param sizes    The sizes (in pixels) to export
+    @param rendered The set of sizes rasterized by Inkscape
+    @param filter   The resampling filter of the other sizes
+    @return         A list of the keys of each size
+    @throws         IOError if the source file does not exist
+    """
+    with open( filename, 'rb' ) as handle:
+        digest = hashlib.sha256( handle.read() ).hexdigest()
+    keys = []
+    for size in sizes:
+        if size in rendered:
+            mode = 'render'
+        else:
+            mode = 'downscale {} {}'.format( max( sizes ), filter )
+        keys.append( cache.key( 'png', digest, size, mode ) )
+    return keys
+
+
+#=============================================================================
+def _rasterize( images, index, filename, size, pipe ):
+    """
+    Rasterizes one size of an SVG file into a list of images.
+
+    Without a pipe, Inkscape writes the image to a private temporary file
+    (so concurrent builds in the same directory never collide).
+
+    @param images   The list that receives the PNG image
+    @param index    The position of the image in the list
+    @param filename The source SVG file
+    @param size     The size (in pixels) of the image
+    @param pipe     Set to read the image from Inkscape's standard output
+    @return         The exit code of the Inkscape process (1 if the process
+                    succeeds, but does not produce a PNG image)
+    """
+    if pipe == True:
+        result, data = render( filename, size, size )
+    else:
+        handle, png = tempfile.mkstemp( suffix = '.png' )
+        os.close( handle )
+        try:
+            result = export( filename, size, size, png )
+            with open( png, 'rb' ) as handle:
+                data = handle.read()
+        finally:
+            os.unlink( png )
+    if ( result == 0 ) and ( data[ : 8 ] != hzgfx.png.SIGNATURE ):
+        result = 1
+    images[ index ] = data
+    return result
+
+
+#=============================================================================
+def _run_all( tasks, jobs = 1 ):
+    """
+    Runs tasks that start external processes using a bounded pool.
+
+    Once any task fails (or raises an exception), no more tasks are started
+    (tasks that are already running are allowed to finish).
+
+    @param tasks A list of functions (without arguments) that return a
+                 process exit code
+    @param jobs  The maximum number of tasks to run at the same time;  0 runs
+                 one task per CPU
+    @return      A list of the exit codes of each task, in order;  The exit
+                 code of a task that was not started is None.
+    """
+    if jobs == 0:
+        jobs = multiprocessing.cpu_count()
+    failed = threading.Event()
+
+    def run( task ):
+        if failed.is_set():
+            return None
+        result = None
+        try:
+            result = task()
+        finally:
+            if result != 0:
+                failed.set()
+        return result
+
+    # Run small jobs without a pool.
+    if ( jobs <= 1 ) or ( len( tasks ) <= 1 ):
+        return [ run( task ) for task in tasks ]
+
+    # Threads only wait on the processes, so they don't need to be separate
+    # processes.
+    pool = multiprocessing.pool.ThreadPool( min( jobs, len( tasks ) ) )
+    try:
+        return pool.map( run, tasks, chunksize = 1 )
+    finally:
+        pool.close()
+        pool.join()
+
+
+#=============================================================================
+def _temp_png( filename, size ):
+    """
+    Names the temporary PNG file for one size of an icon.
+    """
+    return re.sub( r'\.svg$', 'tmp{}.png'.format( size ), filename )
+
+
+#=============================================================================
+def _tool_version():
+    """
+    Identifies the version of the tools that build icons.
+
+    The Inkscape program is identified by its path, size and modification
+    time (so installing another version invalidates cached images without
+    starting the program).
+    """
+    try:
+        info = os.stat( INKSCAPE )
+        program = '{} {} {}'.format( INKSCAPE, info.st_size, info.st_mtime )
+    except OSError:
+        program = INKSCAPE
+    return 'inkicon {} {}'.format( __version__, program )
 
 
 #=============================================================================
@@ -64,37 +508,274 @@ def export( filename, width = 128, height = 128, png = None ):
 
 
 #=============================================================================
-def export_set( filename ):
+def export_many( filenames, sizes = SIZES, jobs = 1, **kwargs ):
     """
-    Exports an SVG to a set of PNGs for use in building an ICO file.
+    Exports several SVGs to sets of PNGs for use in building ICO files.
+
+    The images are rendered in memory (see: `render_many()`), and written to
+    temporary PNG files next to each source file.  If any export fails, no
+    PNG files are written.
+
+    @param filenames The list of source SVG files
+    @param sizes     The sizes (in pixels) to export
+    @param jobs      The maximum number of concurrent Inkscape processes;  0
+                     runs one process per CPU
+    @param kwargs    Downscaling, caching, and pipe options (see:
+                     `render_many()`)
+    @return          A list of the lists of PNG files for each source file
+    @throws          IOError if a source file does not exist
+    @throws          RuntimeError if any image fails to rasterize
     """
-    sizes = [ 128, 64, 48, 32, 24, 16 ]
-    pngs  = []
-    for size in sizes:
-        png    = re.sub( r'\.svg$', 'tmp{}.png'.format( size ), filename )
-        result = export( filename, size, size, png )
-        if result != 0:
-            for png in pngs:
-                os.unlink( png )
-            raise RuntimeError( 'Failed to rasterize image.' )
-        pngs.append( png )
+    images = render_many( filenames, sizes, jobs, **kwargs )
+    pngs   = [
+        [ _temp_png( name, size ) for size in sizes ] for name in filenames
+    ]
+
+    # Remove every PNG if anything goes wrong.
+    failed = True
+    try:
+        for names, datas in zip( pngs, images ):
+            for png, data in zip( names, datas ):
+                with open( png, 'wb' ) as handle:
+                    handle.write( data )
+        failed = False
+    finally:
+        if failed:
+            _cleanup( png for names in pngs for png in names )
     return pngs
 
 
 #=============================================================================
-def make_ico( filename, ico = None ):
+def export_set( filename, sizes = SIZES, jobs = 1, **kwargs ):
     """
-    Creates an ICO file using ImageMagick.
+    Exports an SVG to a set of PNGs for use in building an ICO file.
+
+    Keyword arguments select downscaling, caching, and pipes (see:
+    `render_many()`).
     """
-    if ico is None:
-        ico = re.sub( r'\.svg$', '.ico', filename )
-    pngs = export_set( filename )
-    command = [ CONVERT ]
-    command.extend( pngs )
-    command.append( ico )
-    result = subprocess.call( command )
-    for png in pngs:
-        os.unlink( png )
+    return export_many( [ filename ], sizes, jobs, **kwargs )[ 0 ]
+
+
+#=============================================================================
+def make_ico( filename, ico = None, jobs = 1, **kwargs ):
+    """
+    Creates an ICO file.
+    """
+    return make_icos( [ filename ], [ ico ], jobs, **kwargs )
+
+
+#=============================================================================
+def make_icos(
+    filenames,
+    icos      = None,
+    jobs      = 1,
+    downscale = False,
+    hinted    = (),
+    filter    = hzgfx.color.FILTER_LANCZOS,
+    cache     = None,
+    pipe      = False,
+    png_width = hzgfx.ico.PNG_WIDTH
+):
+    """
+    Creates several ICO files.
+
+    The images of every icon are rendered concurrently into memory, then
+    each set of images is written into its icon.
+
+    Icons found in the build cache are copied without rendering any images.
+    The key of each icon is built from the keys of its images, so changing
+    the source file, the sizes, or the tools builds a new icon.
+
+    @param filenames The list of source SVG files
+    @param icos      The list of ICO files to create (or None items to name
+                     them after their source files)
+    @param jobs      The maximum number of concurrent processes;  0 runs one
+                     process per CPU
+    @param downscale Set to resample smaller sizes from the largest size
+    @param hinted    The sizes that are always rasterized when downscaling
+    @param filter    The resampling filter used when downscaling
+    @param cache     The `BuildCache` of rendered images and icons (or None)
+    @param pipe      Set to read images from Inkscape's standard output
+    @param png_width The minimum width of images that are stored as PNG
+                     files;  Narrower images are stored as bitmaps when
+                     NumPy is installed (otherwise, every image is stored as
+                     a PNG file).
+    @return          Zero (for compatibility with the shell exit code)
+    @throws          IOError if a source file does not exist, or an icon
+                     can not be written
+    @throws          RuntimeError if any image fails to rasterize
+    """
+    if icos is None:
+        icos = [ None ] * len( filenames )
+    icos = [
+        re.sub( r'\.svg$', '.ico', name ) if ico is None else ico
+        for name, ico in zip( filenames, icos )
+    ]
+
+    # Bitmaps are decoded from the rendered images.
+    if hzgfx.png.numpy is None:
+        png_width = 0
+
+    # Copy cached icons.
+    rendered = _plan( SIZES, downscale, hinted )
+    pending  = []
+    for name, ico in zip( filenames, icos ):
+        key = None
+        if cache is not None:
+            key  = cache.key(
+                'ico',
+                png_width,
+                *_png_keys( cache, name, SIZES, rendered, filter )
+            )
+            data = cache.get( key )
+            if data is not None:
+                with open( ico, 'wb' ) as handle:
+                    handle.write( data )
+                continue
+        pending.append( ( name, ico, key ) )
+
+    # Build the other icons.
+    images = render_many(
+        [ name for name, ico, key in pending ],
+        jobs      = jobs,
+        downscale = downscale,
+        hinted    = hinted,
+        filter    = filter,
+        cache     = cache,
+        pipe      = pipe
+    )
+    for datas, ( name, ico, key ) in zip( images, pending ):
+        data = _pack( datas, png_width )
+        with open( ico, 'wb' ) as handle:
+            handle.write( data )
+        if cache is not None:
+            cache.put( key, data )
+    return 0
+
+
+#=============================================================================
+def render( filename, width = 128, height = 128 ):
+    """
+    Rasterizes the given SVG file at the requested dimensions into memory.
+
+    Inkscape writes the image to its standard output (this requires Inkscape
+    1.0 or later).
+
+    @param filename The source SVG file
+    @param width    The width (in pixels) of the image
+    @param height   The height (in pixels) of the image
+    @return         A ( process exit code, PNG image ) pair
+    @throws         IOError if the source file does not exist
+    """
+    if os.path.isfile( filename ) == False:
+        raise IOError(
+            'Unable to locate source SVG file at "{}"'.format( filename )
+        )
+    command = [
+        INKSCAPE,
+        filename,
+        '--export-area-page',
+        '--export-height={}'.format( height ),
+        '--export-width={}'.format( width ),
+        '--export-type=png',
+        '--export-filename=-'
+    ]
+    process = subprocess.Popen( command, stdout = subprocess.PIPE )
+    data    = process.communicate()[ 0 ]
+    return process.returncode, data
+
+
+#=============================================================================
+def render_many(
+    filenames,
+    sizes     = SIZES,
+    jobs      = 1,
+    downscale = False,
+    hinted    = (),
+    filter    = hzgfx.color.FILTER_LANCZOS,
+    cache     = None,
+    pipe      = False
+):
+    """
+    Renders several SVGs to sets of PNG images in memory.
+
+    All sizes of all files are rasterized concurrently.  With a pipe, each
+    image is read from the standard output of its Inkscape process.
+    Otherwise, Inkscape writes each image to a private temporary file that
+    is removed as soon as it is read.
+
+    When downscaling, each file is only rasterized at its largest size (and
+    at any hinted sizes).  The remaining sizes are resampled from the
+    largest image after every image is rasterized.
+
+    Images found in the build cache are used instead of being rendered.
+    Every other image is added to the cache after every render succeeds.
+
+    @param filenames The list of source SVG files
+    @param sizes     The sizes (in pixels) to render
+    @param jobs      The maximum number of concurrent Inkscape processes;  0
+                     runs one process per CPU
+    @param downscale Set to resample smaller sizes from the largest size
+    @param hinted    The sizes that are always rasterized separately when
+                     downscaling
+    @param filter    The resampling filter used when downscaling (one of the
+                     `hzgfx.color.FILTER_*` constants)
+    @param cache     The `BuildCache` of rendered images (or None)
+    @param pipe      Set to read images from Inkscape's standard output
+                     (instead of temporary files)
+    @return          A list of the lists of PNG images for each source file
+    @throws          IOError if a source file does not exist
+    @throws          RuntimeError if any image fails to rasterize
+    """
+    rendered = _plan( sizes, downscale, hinted )
+    largest  = list( sizes ).index( max( sizes ) )
+    images   = []
+    tasks    = []
+    reduced  = []
+    missed   = []
+    for name in filenames:
+        images.append( [ None ] * len( sizes ) )
+        if cache is None:
+            keys = [ None ] * len( sizes )
+        else:
+            keys = _png_keys( cache, name, sizes, rendered, filter )
+        smaller = []
+        for index, ( size, key ) in enumerate( zip( sizes, keys ) ):
+            data = None if key is None else cache.get( key )
+            if data is not None:
+                images[ -1 ][ index ] = data
+                continue
+            missed.append( ( images[ -1 ], index, key ) )
+            if size in rendered:
+                tasks.append( functools.partial(
+                    _rasterize,
+                    images[ -1 ],
+                    index,
+                    name,
+                    size,
+                    pipe
+                ) )
+            else:
+                smaller.append( index )
+        if len( smaller ) > 0:
+            reduced.append( ( images[ -1 ], smaller ) )
+
+    # Rasterize the images, then reduce the largest images.
+    results = _run_all( tasks, jobs )
+    if any( result != 0 for result in results ):
+        raise RuntimeError( 'Failed to rasterize image.' )
+    for datas, smaller in reduced:
+        reductions = _downscale(
+            datas[ largest ],
+            [ sizes[ index ] for index in smaller ],
+            filter
+        )
+        for index, data in zip( smaller, reductions ):
+            datas[ index ] = data
+    if cache is not None:
+        for datas, index, key in missed:
+            cache.put( key, datas[ index ] )
+    return images
 
 
 #=============================================================================
@@ -121,6 +802,68 @@ def main( argv ):
         help    = 'Display this help message and exit.',
         action  = 'help'
     )
+    parser.add_argument(
+        '-c',
+        '--cache',
+        default = None,
+        help    = 'Directory of the build cache (default: no cache).'
+    )
+    parser.add_argument(
+        '-d',
+        '--downscale',
+        default = False,
+        help    = 'Rasterize each icon once, and resample the smaller sizes.',
+        action  = 'store_true'
+    )
+    parser.add_argument(
+        '-f',
+        '--filter',
+        default = 'lanczos',
+        choices = sorted( FILTERS.keys() ),
+        help    = 'Resampling filter when downscaling (default: %(default)s).'
+    )
+    parser.add_argument(
+        '--hinted',
+        default = '',
+        help    = 'Comma-separated sizes to rasterize separately when '
+                  'downscaling.'
+    )
+    parser.add_argument(
+        '-j',
+        '--jobs',
+        default = 1,
+        type    = int,
+        help    = 'Number of concurrent processes; 0 uses one per CPU '
+                  '(default: %(default)s).'
+    )
+    parser.add_argument(
+        '-p',
+        '--pipe',
+        default = False,
+        help    = "Read images from Inkscape's standard output (requires "
+                  'Inkscape 1.0 or later).',
+        action  = 'store_true'
+    )
+    parser.add_argument(
+        '--png-width',
+        default = hzgfx.ico.PNG_WIDTH,
+        type    = int,
+        help    = 'Store images narrower than this as bitmaps (requires '
+                  'NumPy);  0 stores every image as PNG (default: '
+                  '%(default)s).'
+    )
+    parser.add_argument(
+        '--prune',
+        default = None,
+        help    = 'Remove the least-recently-used cache items until the '
+                  'cache fits this size (e.g. 50M).'
+    )
+    parser.add_argument(
+        '--stats',
+        default = False,
+        help    = 'Display cache statistics after building.',
+        action  = 'store_true'
+    )
     parser.add_argument(
         '-v',
         '--version',
@@ -130,15 +873,53 @@ def main( argv ):
         version = __version__
     )
     parser.add_argument(
-        'source',
-        help = 'The source SVG file.'
+        'sources',
+        nargs = '*',
+        help  = 'The source SVG files, or directories of SVG files.'
     )
 
     # parse the arguments
     args = parser.parse_args( argv[ 1 : ] )
+    if args.jobs < 0:
+        parser.error( 'Invalid number of jobs: {}'.format( args.jobs ) )
+    try:
+        hinted = [ int( size ) for size in args.hinted.split( ',' ) if size ]
+    except ValueError:
+        parser.error( 'Invalid hinted sizes: {}'.format( args.hinted ) )
+    limit = None
+    if args.prune is not None:
+        try:
+            limit = _parse_size( args.prune )
+        except ValueError as error:
+            parser.error( str( error ) )
+    if ( args.cache is None ) and ( args.stats or ( limit is not None ) ):
+        parser.error( 'The --stats and --prune options require --cache.' )
+    if ( len( args.sources ) == 0 ) and ( args.stats == False ) \
+    and ( limit is None ):
+        parser.error( 'No source files given.' )
+    cache = None if args.cache is None else BuildCache( args.cache )
 
-    # make the .ico file from the .svg file
-    result = make_ico( args.source )
+    # make the .ico files from the .svg files
+    result = make_icos(
+        _find_sources( args.sources ),
+        jobs      = args.jobs,
+        downscale = args.downscale,
+        hinted    = hinted,
+        filter    = FILTERS[ args.filter ],
+        cache     = cache,
+        pipe      = args.pipe,
+        png_width = args.png_width
+    )
+
+    # maintain the cache
+    if limit is not None:
+        print( 'Pruned {} cache items.'.format( cache.prune( limit ) ) )
+    if args.stats == True:
+        stats = cache.stats()
+        print(
+            'Cache: {length} items, {nbytes} bytes, {hits} hits, '
+            '{misses} misses'.format( **stats )
+        )
 
     # return result
     return result
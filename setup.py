@@ -39,6 +39,9 @@ setup(
     author_email = 'zac.hester@gmail.com',
     license      = 'BSD',
     packages     = [ 'hzgfx' ],
+    extras_require = {
+        'numpy' : [ 'numpy' ]
+    },
     zip_safe     = False
 )
 
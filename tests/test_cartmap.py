@@ -10,6 +10,11 @@ cartmap Module Unit Tests
 """
 
 
+import array
+import cmath
+import math
+import pickle
+import threading
 import unittest
 
 import hzgfx.cartmap
@@ -17,6 +22,14 @@ import hzgfx.interval
 
 
 
+#=============================================================================
+def distance( x, y ):
+    """
+    Computes the distance from the origin (evaluated over planes).
+    """
+    return ( x ** 2 + y ** 2 ) ** 0.5
+
+
 #=============================================================================
 class TestLinearMap( unittest.TestCase ):
     """
@@ -222,6 +235,113 @@ class TestLinearMap( unittest.TestCase ):
         self.assertEqual( 100, lmap[ -5.0 ] )
 
 
+    #=========================================================================
+    def test_compose( self ):
+        """
+        Tests the compose and __matmul__ methods.
+        """
+
+        # Data to widget, then widget to device.
+        data   = hzgfx.cartmap.LinearMap( ( 0.0, 1.0 ), ( 0, 100 ) )
+        device = hzgfx.cartmap.LinearMap( ( 0, 100 ), ( 480, 0 ) )
+        lmap = device.compose( data )
+        self.assertIs( data.source, lmap.source )
+        self.assertIs( device.target, lmap.target )
+        for point in ( 0.0, 0.25, 0.5, 1.0, 2.0 ):
+            self.assertAlmostEqual( device[ data[ point ] ], lmap[ point ] )
+        lmap = device.__matmul__( data )
+        self.assertAlmostEqual( 360.0, lmap[ 0.25 ] )
+        self.assertIs( NotImplemented, device.__matmul__( 5 ) )
+        with self.assertRaises( TypeError ):
+            device.compose( 5 )
+
+        # Clipped and filled maps compose the same way.
+        clipped = hzgfx.cartmap.LinearMap( ( 0, 8 ), ( 0, 8 ), ( 2, 6 ) )
+        filled  = hzgfx.cartmap.LinearMap( ( 0, 8 ), ( 0, 8 ), None, ( 2, 6 ) )
+        lmap = filled.compose( clipped )
+        for point in range( 8 ):
+            self.assertAlmostEqual( float( point ), lmap[ point ] )
+
+
+    #=========================================================================
+    def test_inverse( self ):
+        """
+        Tests the inverse method.
+        """
+        lmaps = [
+            hzgfx.cartmap.LinearMap( ( 5.0, -5.0 ), ( 0, 100 ) ),
+            hzgfx.cartmap.LinearMap( ( 0, 8 ), ( 0, 8 ), clip = ( 2, 6 ) ),
+            hzgfx.cartmap.LinearMap( ( 0, 8 ), ( 0, 8 ), fill = ( 2, 6 ) ),
+            hzgfx.cartmap.LinearMap( ( 0, 8 ), ( 0, 8 ), ( 1, 5 ), ( 2, 4 ) )
+        ]
+        for lmap in lmaps:
+            inverse = lmap.inverse()
+            self.assertIs( lmap.source, inverse.target )
+            self.assertIs( lmap.target, inverse.source )
+            self.assertIs( lmap._clip, inverse._fill )
+            self.assertIs( lmap._fill, inverse._clip )
+            for point in ( -5.0, -2.5, 0.0, 1.0, 3.0, 7.0 ):
+                self.assertAlmostEqual( point, inverse[ lmap[ point ] ] )
+
+
+    #=========================================================================
+    @unittest.skipIf( hzgfx.cartmap.numpy is None, 'NumPy is not installed' )
+    def test_translate_array( self ):
+        """
+        Tests the translate method with arrays of points.
+        """
+        numpy = hzgfx.cartmap.numpy
+        lmap = hzgfx.cartmap.LinearMap( ( 5.0, -5.0 ), ( 0, 100 ) )
+        points = [ 5.0, 2.5, 0.0, -2.5, -5.0 ]
+        expected = [ 0.0, 25.0, 50.0, 75.0, 100.0 ]
+
+        # Make sure all supported input types translate the same way.
+        arrays = [
+            numpy.array( points ),
+            array.array( 'd', points ),
+            memoryview( numpy.array( points ) )
+        ]
+        for values in arrays:
+            actual = lmap.translate( values )
+            self.assertListEqual( expected, actual.tolist() )
+
+        # Check translation into preallocated output buffers.
+        out = numpy.zeros( 5 )
+        self.assertIs( out, lmap.translate( numpy.array( points ), out ) )
+        self.assertListEqual( expected, out.tolist() )
+        out = array.array( 'd', [ 0.0 ] * 5 )
+        self.assertIs( out, lmap.translate( points, out ) )
+        self.assertListEqual( expected, out.tolist() )
+        out = numpy.zeros( 5 )
+        lmap.translate( points, memoryview( out ) )
+        self.assertListEqual( expected, out.tolist() )
+        with self.assertRaises( ValueError ):
+            out = numpy.zeros( 5 )
+            out.flags.writeable = False
+            lmap.translate( points, out )
+
+        # Check masks and missing values for points outside the target.
+        lmap = hzgfx.cartmap.LinearMap( ( 0, 8 ), ( 0, 8 ) )
+        lmap.set_fill( ( 2, 6 ) )
+        points = numpy.arange( 8 )
+        expected = [ False, False, True, True, True, True, False, False ]
+        self.assertListEqual( expected, lmap.mask( points ).tolist() )
+        self.assertEqual(
+            [ lmap.mask( p ) for p in range( 8 ) ],
+            expected
+        )
+        out = numpy.zeros( 8, dtype = bool )
+        self.assertIs( out, lmap.mask( points, out ) )
+        self.assertListEqual( expected, out.tolist() )
+        actual = lmap.translate( points, missing = -1.0 )
+        self.assertListEqual(
+            [ -1.0, -1.0, 0.0, 2.0, 4.0, 6.0, -1.0, -1.0 ],
+            actual.tolist()
+        )
+        self.assertEqual( -1.0, lmap.translate( 7, missing = -1.0 ) )
+        self.assertEqual( 6.0, lmap.translate( 5, missing = -1.0 ) )
+
+
 #=============================================================================
 class TestPlane( unittest.TestCase ):
     """
@@ -351,6 +471,39 @@ class TestPlane( unittest.TestCase ):
             dummy = plane.fakeyfaker
 
 
+    #=========================================================================
+    def test_immutable( self ):
+        """
+        Tests that planes can not be modified, and compare by value.
+        """
+        plane = hzgfx.cartmap.Plane( ( 1.0, 3.0 ), ( 3.0, 4.0 ), 0.5 )
+        with self.assertRaises( AttributeError ):
+            plane.left = 2.0
+        with self.assertRaises( AttributeError ):
+            plane.l = 2.0
+        with self.assertRaises( AttributeError ):
+            plane.extra = 2.0
+        with self.assertRaises( AttributeError ):
+            del plane.left
+        self.assertEqual( 1.0, plane.left )
+        same = hzgfx.cartmap.Plane( ( 1.0, 3.0 ), ( 3.0, 4.0 ), 0.5 )
+        self.assertEqual( plane, same )
+        self.assertEqual( hash( plane ), hash( same ) )
+        self.assertNotEqual(
+            plane,
+            hzgfx.cartmap.Plane( ( 1.0, 3.0 ), ( 3.0, 4.0 ), 0.25 )
+        )
+        self.assertNotEqual(
+            plane,
+            hzgfx.cartmap.ComplexPlane( ( 1.0, 3.0 ), ( 3.0, 4.0 ), 0.5 )
+        )
+        copied = pickle.loads( pickle.dumps( plane ) )
+        self.assertEqual( plane, copied )
+        self.assertTupleEqual( plane.dimensions, copied.dimensions )
+        plane = hzgfx.cartmap.ComplexPlane( ( -2.0, -1.0 ), ( 1.0, 1.0 ) )
+        self.assertEqual( plane, pickle.loads( pickle.dumps( plane ) ) )
+
+
     #=========================================================================
     def test_str( self ):
         """
@@ -365,6 +518,185 @@ class TestPlane( unittest.TestCase ):
         self.assertEqual( expected, str( plane ) )
 
 
+    #=========================================================================
+    @unittest.skipIf( hzgfx.cartmap.numpy is None, 'NumPy is not installed' )
+    def test_meshgrid( self ):
+        """
+        Tests generating coordinate arrays for the whole plane.
+        """
+        plane = hzgfx.cartmap.Plane( ( 10, 20 ), ( 16, 24 ), ( 2, 1 ) )
+        x, y = plane.meshgrid()
+        self.assertTupleEqual( ( 4, 3 ), x.shape )
+        self.assertListEqual( [ 10, 12, 14 ], x[ 0 ].tolist() )
+        self.assertListEqual( [ 20, 21, 22, 23 ], y[ :, 0 ].tolist() )
+        x, y = plane.meshgrid( sparse = True )
+        self.assertTupleEqual( ( 1, 3 ), x.shape )
+        self.assertTupleEqual( ( 4, 1 ), y.shape )
+
+
+    #=========================================================================
+    @unittest.skipIf( hzgfx.cartmap.numpy is None, 'NumPy is not installed' )
+    def test_chunks( self ):
+        """
+        Tests generating coordinates one tile at a time.
+        """
+        numpy = hzgfx.cartmap.numpy
+        plane = hzgfx.cartmap.Plane( ( 0.0, 0.0 ), ( 1.0, 0.5 ), 0.1 )
+        x, y = plane.meshgrid()
+        self.assertTupleEqual( ( 5, 10 ), x.shape )
+
+        # Tiles cover the plane exactly once.
+        covered = numpy.zeros( x.shape, dtype = int )
+        tiles = list( plane.chunks( ( 4, 3 ) ) )
+        self.assertEqual( 6, len( tiles ) )
+        for tile in tiles:
+            covered[ tile.rows, tile.columns ] += 1
+            self.assertTrue( ( x[ tile.rows, tile.columns ] == tile.x ).all() )
+            self.assertTrue( ( y[ tile.rows, tile.columns ] == tile.y ).all() )
+        self.assertTrue( ( covered == 1 ).all() )
+        self.assertTupleEqual( ( 2, 2 ), tiles[ -1 ].x.shape )
+
+        # Sparse tiles broadcast to the same coordinates.
+        for tile in plane.chunks( 4, sparse = True ):
+            self.assertEqual( 1, tile.x.shape[ 0 ] )
+            self.assertEqual( 1, tile.y.shape[ 1 ] )
+            grid = numpy.broadcast_arrays( tile.x, tile.y )
+            expected = x[ tile.rows, tile.columns ]
+            self.assertTrue( ( expected == grid[ 0 ] ).all() )
+
+        # Points are given row by row within each tile.
+        points = list( plane.points( ( 10, 2 ) ) )
+        self.assertEqual( 3, len( points ) )
+        self.assertTupleEqual( ( 20, 2 ), points[ 0 ].shape )
+        self.assertListEqual( [ 0.1, 0.0 ], points[ 0 ][ 1 ].tolist() )
+        self.assertListEqual( [ 0.0, 0.1 ], points[ 0 ][ 10 ].tolist() )
+
+        with self.assertRaises( ValueError ):
+            next( plane.chunks( ( 0, 4 ) ) )
+
+
+    #=========================================================================
+    @unittest.skipIf( hzgfx.cartmap.numpy is None, 'NumPy is not installed' )
+    def test_evaluate( self ):
+        """
+        Tests evaluating functions over the plane.
+        """
+        numpy = hzgfx.cartmap.numpy
+        plane = hzgfx.cartmap.Plane( ( -2.0, -1.0 ), ( 2.0, 1.0 ), 0.05 )
+        x, y = plane.meshgrid()
+        expected = distance( x, y )
+
+        # Evaluation in this process (with any function).
+        calls = []
+        result = plane.evaluate(
+            lambda x, y: ( x ** 2 + y ** 2 ) ** 0.5,
+            tile     = 16,
+            progress = lambda done, total: calls.append( ( done, total ) )
+        )
+        self.assertTupleEqual( expected.shape, result.shape )
+        self.assertTrue( numpy.allclose( expected, result ) )
+        self.assertListEqual( [ ( i, 15 ) for i in range( 1, 16 ) ], calls )
+
+        # Evaluation in worker processes.
+        calls = []
+        result = plane.evaluate(
+            distance,
+            workers  = 2,
+            tile     = ( 32, 8 ),
+            dtype    = numpy.float32,
+            progress = lambda done, total: calls.append( done )
+        )
+        self.assertEqual( numpy.float32, result.dtype )
+        self.assertTrue( numpy.allclose( expected, result ) )
+        self.assertListEqual( list( range( 1, 16 ) ), calls )
+
+        # Canceling the evaluation.
+        for workers in ( 1, 2 ):
+            cancel = threading.Event()
+            result = plane.evaluate(
+                distance,
+                workers  = workers,
+                tile     = 8,
+                progress = lambda done, total: cancel.set(),
+                cancel   = cancel
+            )
+            self.assertIsNone( result )
+
+
+#=============================================================================
+class TestComplexPlane( unittest.TestCase ):
+    """
+    Tests the ComplexPlane class.
+    """
+
+
+    #=========================================================================
+    def escape_time( self, z, c, func, limit, radius ):
+        """
+        Counts iterations for one value using plain Python arithmetic.
+        """
+        for count in range( limit ):
+            if abs( z ) > radius:
+                return count
+            z = z * z + c if func is None else func( z )
+        return limit
+
+
+    #=========================================================================
+    @unittest.skipIf( hzgfx.cartmap.numpy is None, 'NumPy is not installed' )
+    def test_grid( self ):
+        """
+        Tests generating complex coordinates.
+        """
+        plane = hzgfx.cartmap.ComplexPlane( ( -1.0, -0.5 ), ( 1.0, 0.5 ), 0.5 )
+        grid = plane.grid()
+        self.assertTupleEqual( ( 2, 4 ), grid.shape )
+        self.assertEqual( complex( -1.0, -0.5 ), grid[ 0, 0 ] )
+        self.assertEqual( complex( 0.5, 0.0 ), grid[ 1, 3 ] )
+
+
+    #=========================================================================
+    @unittest.skipIf( hzgfx.cartmap.numpy is None, 'NumPy is not installed' )
+    def test_escape( self ):
+        """
+        Tests escape-time rendering.
+        """
+        numpy = hzgfx.cartmap.numpy
+        plane = hzgfx.cartmap.ComplexPlane(
+            ( -2.0, -1.25 ),
+            ( 0.5, 1.25 ),
+            0.1
+        )
+        grid = plane.grid()
+
+        # The Mandelbrot set starts every position from zero.
+        counts = plane.mandelbrot( limit = 40, tile = 8 )
+        self.assertEqual( numpy.int32, counts.dtype )
+        expected = [
+            self.escape_time( 0j, c, None, 40, 2.0 ) for c in grid.flat
+        ]
+        self.assertListEqual( expected, counts.reshape( -1 ).tolist() )
+        self.assertEqual( 40, counts[ 12, 20 ] )
+        parallel = plane.mandelbrot( limit = 40, tile = 8, workers = 2 )
+        self.assertTrue( ( counts == parallel ).all() )
+
+        # Julia sets start from each position.
+        c = complex( -0.8, 0.156 )
+        counts = plane.julia( c, limit = 30 )
+        expected = [
+            self.escape_time( z, c, None, 30, 2.0 ) for z in grid.flat
+        ]
+        self.assertListEqual( expected, counts.reshape( -1 ).tolist() )
+
+        # Functions are iterated from each position.
+        counts = plane.escape( numpy.sin, 20, 3.0, workers = 2, tile = 10 )
+        expected = [
+            self.escape_time( z, None, cmath.sin, 20, 3.0 )
+            for z in grid.flat
+        ]
+        self.assertListEqual( expected, counts.reshape( -1 ).tolist() )
+
+
 #=============================================================================
 class TestMap( unittest.TestCase ):
     """
@@ -388,6 +720,57 @@ class TestMap( unittest.TestCase ):
         self.assertTupleEqual( exp_vline, pmap.vertical )
 
 
+    #=========================================================================
+    def test_compose( self ):
+        """
+        Tests the compose and __matmul__ methods.
+        """
+        widget = hzgfx.cartmap.Map( ( 2.0, 10.0 ), ( -1.0, 50.0 ) )
+        window = hzgfx.cartmap.Map( ( 1.0, 5.0 ), ( 1.0, 20.0 ) )
+        device = hzgfx.cartmap.Map( ( 0.5, 0.0 ), ( 2.0, -4.0 ) )
+        pmap = device.compose( window.compose( widget ) )
+        point = ( 3.0, 7.0 )
+        expected = device.translate(
+            window.translate( widget.translate( point ) )
+        )
+        self.assertTupleEqual( expected, pmap.translate( point ) )
+        pmap = device.__matmul__( window ).__matmul__( widget )
+        self.assertTupleEqual( expected, pmap.translate( point ) )
+        self.assertIs( NotImplemented, device.__matmul__( 5 ) )
+        with self.assertRaises( TypeError ):
+            device.compose( 5 )
+
+        # Composing with an affine transform produces an affine transform.
+        xform = widget.__matmul__( hzgfx.cartmap.Affine() )
+        self.assertIs( NotImplemented, xform )
+        xform = hzgfx.cartmap.Affine().__rmatmul__( widget )
+        self.assertIsInstance( xform, hzgfx.cartmap.Affine )
+        self.assertTupleEqual(
+            widget.translate( point ),
+            xform.translate( point )
+        )
+
+
+    #=========================================================================
+    def test_inverse( self ):
+        """
+        Tests the inverse method.
+        """
+        splane = hzgfx.cartmap.Plane( ( 100, 50 ) )
+        tplane = hzgfx.cartmap.Plane( (  25, 25 ) )
+        pmap = hzgfx.cartmap.Map.map_clipped( splane, tplane )
+        inverse = pmap.inverse()
+        self.assertTupleEqual(
+            ( 10.0, 25.0 ),
+            inverse.translate( pmap.translate( ( 10, 25 ) ) )
+        )
+        identity = inverse.compose( pmap )
+        self.assertTupleEqual( ( 1.0, 0.0 ), identity.horizontal )
+        self.assertTupleEqual( ( 1.0, 0.0 ), identity.vertical )
+        with self.assertRaises( ValueError ):
+            hzgfx.cartmap.Map( ( 0.0, 1.0 ) ).inverse()
+
+
     #=========================================================================
     def test_map_extremes( self ):
         """
@@ -400,6 +783,11 @@ class TestMap( unittest.TestCase ):
         exp_vline = hzgfx.cartmap.Line( 0.25, 0.0 )
         self.assertTupleEqual( exp_hline, pmap.horizontal )
         self.assertTupleEqual( exp_vline, pmap.vertical )
+        splane = hzgfx.cartmap.Plane( ( 0, 0 ), ( 10, 20 ) )
+        tplane = hzgfx.cartmap.Plane( ( 5, 100 ), ( 25, 60 ) )
+        pmap = hzgfx.cartmap.Map.map_extremes( splane, tplane )
+        self.assertTupleEqual( ( 2.0, 5.0 ), pmap.horizontal )
+        self.assertTupleEqual( ( -2.0, 100.0 ), pmap.vertical )
 
 
     #=========================================================================
@@ -414,6 +802,99 @@ class TestMap( unittest.TestCase ):
         exp_vline = hzgfx.cartmap.Line( 0.25, 6.25 )
         self.assertTupleEqual( exp_hline, pmap.horizontal )
         self.assertTupleEqual( exp_vline, pmap.vertical )
+        splane = hzgfx.cartmap.Plane( ( 50, 100 ) )
+        pmap = hzgfx.cartmap.Map.map_clipped(
+            splane,
+            tplane,
+            hzgfx.cartmap.AXIS_VERTICAL
+        )
+        exp_hline = hzgfx.cartmap.Line( 0.25, 6.25 )
+        exp_vline = hzgfx.cartmap.Line( 0.25, 0.0 )
+        self.assertTupleEqual( exp_hline, pmap.horizontal )
+        self.assertTupleEqual( exp_vline, pmap.vertical )
+
+
+    #=========================================================================
+    def test_fit( self ):
+        """
+        Tests the fit method.
+        """
+        cartmap = hzgfx.cartmap
+        splane = cartmap.Plane( ( 100, 50 ) )
+        tplane = cartmap.Plane( ( 10, 20 ), ( 35, 45 ) )
+        pmap = cartmap.Map.fit( splane, tplane )
+        self.assertTupleEqual( ( 0.25, 10.0 ), pmap.horizontal )
+        self.assertTupleEqual( ( 0.25, 26.25 ), pmap.vertical )
+        pmap = cartmap.Map.fit( splane, tplane, cartmap.FIT_COVER )
+        self.assertTupleEqual( ( 0.5, -2.5 ), pmap.horizontal )
+        self.assertTupleEqual( ( 0.5, 20.0 ), pmap.vertical )
+        pmap = cartmap.Map.fit( splane, tplane, cartmap.FIT_STRETCH )
+        self.assertTupleEqual( ( 0.25, 10.0 ), pmap.horizontal )
+        self.assertTupleEqual( ( 0.5, 20.0 ), pmap.vertical )
+        self.assertTupleEqual(
+            cartmap.Map.map_extremes( splane, tplane ).vertical,
+            pmap.vertical
+        )
+
+        # Align the unused space, and keep the direction of flipped axes.
+        pmap = cartmap.Map.fit( splane, tplane, align = ( 0.0, 1.0 ) )
+        self.assertTupleEqual( ( 0.25, 32.5 ), pmap.vertical )
+        tplane = cartmap.Plane( ( 0, 25 ), ( 25, 0 ) )
+        pmap = cartmap.Map.fit( splane, tplane, align = 0 )
+        self.assertTupleEqual( ( 0.25, 0.0 ), pmap.horizontal )
+        self.assertTupleEqual( ( -0.25, 25.0 ), pmap.vertical )
+        xform = cartmap.Affine.fit( splane, tplane, align = 0 )
+        self.assertEqual( cartmap.Affine.from_map( pmap ), xform )
+        with self.assertRaises( ValueError ):
+            cartmap.Map.fit( splane, tplane, 3 )
+
+
+    #=========================================================================
+    @unittest.skipIf( hzgfx.cartmap.numpy is None, 'NumPy is not installed' )
+    def test_fit_many( self ):
+        """
+        Tests the fit_many method.
+        """
+        cartmap = hzgfx.cartmap
+        sources = [
+            cartmap.Plane( ( 100, 50 ) ),
+            cartmap.Plane( ( 50, 100 ) ),
+            cartmap.Plane( ( -1.0, 1.0 ), ( 1.0, -1.0 ), 0.1 )
+        ]
+        targets = [
+            cartmap.Plane( ( 10, 20 ), ( 35, 45 ) ),
+            cartmap.Plane( ( 0, 25 ), ( 25, 0 ) ),
+            cartmap.Plane( ( 640, 480 ) )
+        ]
+        align = ( 0.2, 0.7 )
+        for mode in (
+            cartmap.FIT_CONTAIN,
+            cartmap.FIT_COVER,
+            cartmap.FIT_STRETCH
+        ):
+            maps = cartmap.Map.fit_many( sources, targets, mode, align )
+            self.assertEqual( 3, len( maps ) )
+            for source, target, pmap in zip( sources, targets, maps ):
+                expected = cartmap.Map.fit( source, target, mode, align )
+                for axis in ( 'horizontal', 'vertical' ):
+                    for actual, value in zip(
+                        getattr( pmap, axis ),
+                        getattr( expected, axis )
+                    ):
+                        self.assertAlmostEqual( value, actual )
+
+        # Single planes and arrays of extremes are paired with every plane.
+        extremes = [ ( 0, 0, 100, 50 ), ( 0, 0, 50, 100 ) ]
+        maps = cartmap.Map.fit_many( extremes, targets[ 0 ] )
+        self.assertTupleEqual( ( 0.25, 10.0 ), maps[ 0 ].horizontal )
+        self.assertTupleEqual( ( 0.25, 26.25 ), maps[ 0 ].vertical )
+        self.assertTupleEqual( ( 0.25, 16.25 ), maps[ 1 ].horizontal )
+        self.assertTupleEqual( ( 0.25, 20.0 ), maps[ 1 ].vertical )
+        self.assertListEqual( [], cartmap.Map.fit_many( [], [] ) )
+        with self.assertRaises( ValueError ):
+            cartmap.Map.fit_many( [ ( 0, 0, 1 ) ], targets[ 0 ] )
+        with self.assertRaises( ValueError ):
+            cartmap.Map.fit_many( sources, targets, -1 )
 
 
     #=========================================================================
@@ -430,10 +911,13 @@ class TestMap( unittest.TestCase ):
         self.assertTupleEqual( exp_origin, pmap.translate() )
         exp_point = hzgfx.cartmap.Point( 2.5, 12.5 )
         self.assertTupleEqual( exp_point, pmap.translate( ( 10, 25 ) ) )
-        exp_point = hzgfx.cartmap.Point( 3, 13 )
+        exp_point = hzgfx.cartmap.Point(
+            int( round( 2.5 ) ),
+            int( round( 12.5 ) )
+        )
         point = pmap.translate( ( 10, 25 ), True )
         self.assertTupleEqual( exp_point, point )
-        exp_point = hzgfx.cartmap.Point( 2.5, 13 )
+        exp_point = hzgfx.cartmap.Point( 2.5, int( round( 12.5 ) ) )
         point = pmap.translate( ( 10, 25 ), ( False, True ) )
         self.assertTupleEqual( exp_point, point )
 
@@ -442,6 +926,384 @@ class TestMap( unittest.TestCase ):
         ### ZIH - test negative extremes, centered origins, off-centered
 
 
+    #=========================================================================
+    @unittest.skipIf( hzgfx.cartmap.numpy is None, 'NumPy is not installed' )
+    def test_translate_many( self ):
+        """
+        Tests the translate_many method.
+        """
+        numpy = hzgfx.cartmap.numpy
+        splane = hzgfx.cartmap.Plane( ( 100, 50 ) )
+        tplane = hzgfx.cartmap.Plane( (  25, 25 ) )
+        pmap = hzgfx.cartmap.Map.map_clipped( splane, tplane )
+        points = [ ( 0, 0 ), ( 10, 25 ), ( -10, -25 ) ]
+
+        # Make sure all input arrangements agree with single translation.
+        expected = [ tuple( pmap.translate( p ) ) for p in points ]
+        arrays = [
+            points,
+            iter( points ),
+            numpy.array( points ),
+            ( numpy.array( [ 0, 10, -10 ] ), numpy.array( [ 0, 25, -25 ] ) )
+        ]
+        for array in arrays:
+            actual = pmap.translate_many( array )
+            self.assertEqual( ( 3, 2 ), actual.shape )
+            self.assertListEqual( expected, [ tuple( p ) for p in actual ] )
+
+        # Check rounding to the nearest integer on both axes.
+        expected = [ tuple( pmap.translate( p, True ) ) for p in points ]
+        actual = pmap.translate_many( points, True )
+        self.assertTrue( numpy.issubdtype( actual.dtype, numpy.integer ) )
+        self.assertListEqual( expected, [ tuple( p ) for p in actual ] )
+
+        # Check rounding to the nearest integer per axis.
+        expected = [
+            tuple( pmap.translate( p, ( False, True ) ) ) for p in points
+        ]
+        actual = pmap.translate_many( points, ( False, True ) )
+        self.assertListEqual( expected, [ tuple( p ) for p in actual ] )
+
+        # Check halfway values round like the built-in `round()` in both
+        # paths.
+        points = [ ( 10, 25 ), ( -10, -25 ), ( 30, -5 ), ( -30, 5 ) ]
+        expected = [
+            tuple( int( round( v ) ) for v in pmap.translate( p ) )
+            for p in points
+        ]
+        self.assertListEqual(
+            expected,
+            [ tuple( pmap.translate( p, True ) ) for p in points ]
+        )
+        actual = pmap.translate_many( points, True )
+        self.assertListEqual( expected, [ tuple( p ) for p in actual ] )
+
+        # Check empty and invalid batches.
+        self.assertEqual( ( 0, 2 ), pmap.translate_many( [] ).shape )
+        with self.assertRaises( ValueError ):
+            pmap.translate_many( [ ( 1, 2, 3 ) ] )
+
+
+
+#=============================================================================
+class TestAffine( unittest.TestCase ):
+    """
+    Tests the Affine class.
+    """
+
+
+    #=========================================================================
+    def assertPointAlmostEqual( self, expected, actual ):
+        """
+        Asserts two points are equal within a small tolerance.
+        """
+        self.assertAlmostEqual( expected[ 0 ], actual[ 0 ] )
+        self.assertAlmostEqual( expected[ 1 ], actual[ 1 ] )
+
+
+    #=========================================================================
+    def test_init( self ):
+        """
+        Tests the __init__ method.
+        """
+        xform = hzgfx.cartmap.Affine()
+        self.assertTupleEqual(
+            ( ( 1.0, 0.0, 0.0 ), ( 0.0, 1.0, 0.0 ), ( 0.0, 0.0, 1.0 ) ),
+            xform.matrix
+        )
+        xform = hzgfx.cartmap.Affine( 1, 2, 3, 4, 5, 6 )
+        self.assertTupleEqual(
+            ( ( 1.0, 2.0, 3.0 ), ( 4.0, 5.0, 6.0 ), ( 0.0, 0.0, 1.0 ) ),
+            xform.matrix
+        )
+        self.assertEqual( hzgfx.cartmap.Affine( 1, 2, 3, 4, 5, 6 ), xform )
+        self.assertNotEqual( hzgfx.cartmap.Affine(), xform )
+
+
+    #=========================================================================
+    def test_constructors( self ):
+        """
+        Tests the transform constructors.
+        """
+        xform = hzgfx.cartmap.Affine.translation( 3, -2 )
+        self.assertTupleEqual( ( 4, 0 ), xform.translate( ( 1, 2 ) ) )
+        xform = hzgfx.cartmap.Affine.scaling( 2 )
+        self.assertTupleEqual( ( 2, 4 ), xform.translate( ( 1, 2 ) ) )
+        xform = hzgfx.cartmap.Affine.scaling( 2, -1 )
+        self.assertTupleEqual( ( 2, -2 ), xform.translate( ( 1, 2 ) ) )
+        xform = hzgfx.cartmap.Affine.shear( 1.0 )
+        self.assertTupleEqual( ( 3, 2 ), xform.translate( ( 1, 2 ) ) )
+        xform = hzgfx.cartmap.Affine.rotation( math.pi / 2.0 )
+        self.assertPointAlmostEqual( ( -2, 1 ), xform.translate( ( 1, 2 ) ) )
+        xform = hzgfx.cartmap.Affine.rotation( math.pi, ( 1, 1 ) )
+        self.assertPointAlmostEqual( ( 1, 0 ), xform.translate( ( 1, 2 ) ) )
+
+        # Make sure map-based transforms match the maps.
+        splane = hzgfx.cartmap.Plane( ( 100, 50 ) )
+        tplane = hzgfx.cartmap.Plane( (  25, 25 ) )
+        pmap = hzgfx.cartmap.Map.map_clipped( splane, tplane )
+        xform = hzgfx.cartmap.Affine.map_clipped( splane, tplane )
+        self.assertEqual( hzgfx.cartmap.Affine.from_map( pmap ), xform )
+        self.assertTupleEqual(
+            pmap.translate( ( 10, 25 ) ),
+            xform.translate( ( 10, 25 ) )
+        )
+        pmap = hzgfx.cartmap.Map.map_extremes( splane, tplane )
+        xform = hzgfx.cartmap.Affine.map_extremes( splane, tplane )
+        self.assertTupleEqual(
+            pmap.translate( ( 10, 25 ), True ),
+            xform.translate( ( 10, 25 ), True )
+        )
+
+
+    #=========================================================================
+    def test_compose( self ):
+        """
+        Tests the compose, chain, and __matmul__ methods.
+        """
+        move  = hzgfx.cartmap.Affine.translation( 10, 0 )
+        scale = hzgfx.cartmap.Affine.scaling( 2 )
+
+        # Composition applies the argument first.
+        self.assertTupleEqual(
+            ( 12, 4 ),
+            move.compose( scale ).translate( ( 1, 2 ) )
+        )
+        self.assertTupleEqual(
+            ( 22, 4 ),
+            scale.compose( move ).translate( ( 1, 2 ) )
+        )
+        self.assertEqual( move.compose( scale ), move.__matmul__( scale ) )
+        self.assertIs( NotImplemented, move.__matmul__( 5 ) )
+
+        # Chains apply transforms in the order given.
+        xform = hzgfx.cartmap.Affine.chain(
+            scale,
+            move,
+            hzgfx.cartmap.Map( ( -1.0, 0.0 ), ( 1.0, 5.0 ) )
+        )
+        self.assertTupleEqual( ( -12, 9 ), xform.translate( ( 1, 2 ) ) )
+        self.assertEqual(
+            hzgfx.cartmap.Affine(),
+            hzgfx.cartmap.Affine.chain()
+        )
+        with self.assertRaises( TypeError ):
+            move.compose( 'fake' )
+
+
+    #=========================================================================
+    def test_inverse( self ):
+        """
+        Tests the inverse method.
+        """
+        xform = hzgfx.cartmap.Affine.chain(
+            hzgfx.cartmap.Affine.scaling( 2, 3 ),
+            hzgfx.cartmap.Affine.rotation( 0.5 ),
+            hzgfx.cartmap.Affine.shear( 0.25, 0.5 ),
+            hzgfx.cartmap.Affine.translation( 7, -3 )
+        )
+        point = xform.translate( ( 1.5, -2.5 ) )
+        self.assertPointAlmostEqual(
+            ( 1.5, -2.5 ),
+            xform.inverse().translate( point )
+        )
+        with self.assertRaises( ValueError ):
+            hzgfx.cartmap.Affine.scaling( 0, 1 ).inverse()
+
+
+    #=========================================================================
+    @unittest.skipIf( hzgfx.cartmap.numpy is None, 'NumPy is not installed' )
+    def test_translate_many( self ):
+        """
+        Tests the translate_many method.
+        """
+        xform = hzgfx.cartmap.Affine.chain(
+            hzgfx.cartmap.Affine.rotation( 0.3 ),
+            hzgfx.cartmap.Affine.translation( 2, 1 )
+        )
+        points = [ ( 0, 0 ), ( 1.5, 2 ), ( -4, 3 ) ]
+        actual = xform.translate_many( points )
+        for point, result in zip( points, actual ):
+            self.assertPointAlmostEqual( xform.translate( point ), result )
+        actual = xform.translate_many( points, ( True, False ) )
+        for point, result in zip( points, actual ):
+            self.assertPointAlmostEqual(
+                xform.translate( point, ( True, False ) ),
+                result
+            )
+
+        # Check halfway values round like the built-in `round()` in both
+        # paths.
+        xform = hzgfx.cartmap.Affine.translation( 0.5, -0.5 )
+        points = [ ( 0, 0 ), ( 1, 1 ), ( -2, 2 ) ]
+        expected = [
+            tuple( int( round( v ) ) for v in xform.translate( p ) )
+            for p in points
+        ]
+        self.assertListEqual(
+            expected,
+            [ tuple( xform.translate( p, True ) ) for p in points ]
+        )
+        actual = xform.translate_many( points, True )
+        self.assertListEqual( expected, [ tuple( p ) for p in actual ] )
+
+
+#=============================================================================
+class TestTileCache( unittest.TestCase ):
+    """
+    Tests the TileCache class.
+    """
+
+
+    #=========================================================================
+    def setUp( self ):
+        """
+        Counts the positions computed by the cached function.
+        """
+        self.computed = 0
+
+
+    #=========================================================================
+    def count( self, x, y ):
+        """
+        Computes the distance from the origin, and counts the positions.
+        """
+        self.computed += x.size
+        return distance( x, y )
+
+
+    #=========================================================================
+    @unittest.skipIf( hzgfx.cartmap.numpy is None, 'NumPy is not installed' )
+    def test_render( self ):
+        """
+        Tests rendering with cached tiles after panning and zooming.
+        """
+        numpy = hzgfx.cartmap.numpy
+        cache = hzgfx.cartmap.TileCache( tile = 16 )
+        plane = hzgfx.cartmap.Plane( ( -1.0, 1.0 ), ( 1.0, -1.0 ), 0.05 )
+        actual = cache.render( plane, self.count )
+        self.assertTrue( numpy.allclose( plane.evaluate( distance ), actual ) )
+        self.assertEqual( 16 * 16 * 16, self.computed )
+        self.assertEqual( 16, len( cache ) )
+
+        # Panning by less than a tile computes no new tiles.
+        self.computed = 0
+        plane = hzgfx.cartmap.Plane( ( -0.6, 1.2 ), ( 1.4, -0.8 ), 0.05 )
+        actual = cache.render( plane, self.count )
+        self.assertTrue( numpy.allclose( plane.evaluate( distance ), actual ) )
+        self.assertEqual( 0, self.computed )
+
+        # Panning farther computes only the newly-exposed tiles.
+        plane = hzgfx.cartmap.Plane( ( 0.0, 1.0 ), ( 2.0, -1.0 ), 0.05 )
+        actual = cache.render( plane, self.count )
+        self.assertTrue( numpy.allclose( plane.evaluate( distance ), actual ) )
+        self.assertEqual( 4 * 16 * 16, self.computed )
+
+        # Zooming in reuses the positions shared with the coarser tiles.
+        self.computed = 0
+        plane = hzgfx.cartmap.Plane( ( -0.4, 0.4 ), ( 0.4, -0.4 ), 0.025 )
+        actual = cache.render( plane, self.count )
+        self.assertTrue( numpy.allclose( plane.evaluate( distance ), actual ) )
+        self.assertEqual( 6 * 16 * 16 * 3 // 4, self.computed )
+
+        # Views of the same coordinates through a map share the tiles.
+        self.computed = 0
+        pmap = hzgfx.cartmap.Map( ( 0.05, -1.0 ), ( -0.05, 1.0 ) )
+        actual = cache.render(
+            hzgfx.cartmap.Plane( ( 40, 40 ) ),
+            self.count,
+            pmap = pmap
+        )
+        plane = hzgfx.cartmap.Plane( ( -1.0, 1.0 ), ( 1.0, -1.0 ), 0.05 )
+        self.assertTrue( numpy.allclose( plane.evaluate( distance ), actual ) )
+        self.assertEqual( 0, self.computed )
+
+        # Different keys (or data types) do not share tiles.
+        cache.render( plane, self.count, key = 'other' )
+        self.assertEqual( 16 * 16 * 16, self.computed )
+
+        # Escape-time rules with the same parameters share tiles.
+        plane = hzgfx.cartmap.ComplexPlane( ( -2.0, -1.0 ), ( 0.5, 1.0 ), 0.1 )
+        rule = hzgfx.cartmap.EscapeTime.mandelbrot( 20 )
+        counts = cache.render( plane, rule, dtype = numpy.int32 )
+        self.assertEqual( numpy.int32, counts.dtype )
+        self.assertTrue( ( plane.mandelbrot( 20 ) == counts ).all() )
+        hits = cache.hits
+        cache.render(
+            plane,
+            hzgfx.cartmap.EscapeTime.mandelbrot( 20 ),
+            dtype = numpy.int32
+        )
+        self.assertGreater( cache.hits, hits )
+
+
+    #=========================================================================
+    @unittest.skipIf( hzgfx.cartmap.numpy is None, 'NumPy is not installed' )
+    def test_render_empty( self ):
+        """
+        Tests rendering planes without any positions.
+        """
+        cache = hzgfx.cartmap.TileCache()
+        plane = hzgfx.cartmap.Plane( ( 0, 0 ), ( 0, 4 ) )
+        self.assertEqual( ( 4, 0 ), cache.render( plane, self.count ).shape )
+        for plane in (
+            hzgfx.cartmap.Plane( ( 0, 0 ), ( 4, 0 ) ),
+            hzgfx.cartmap.Plane( ( 0, 0 ), ( 0, 0 ) )
+        ):
+            self.assertEqual(
+                plane.evaluate( self.count ).shape,
+                cache.render( plane, self.count ).shape
+            )
+        self.assertEqual( 0, self.computed )
+        self.assertEqual( 0, len( cache ) )
+
+
+    #=========================================================================
+    @unittest.skipIf( hzgfx.cartmap.numpy is None, 'NumPy is not installed' )
+    def test_budget( self ):
+        """
+        Tests discarding tiles to stay within the memory budget.
+        """
+        tile  = 16 * 16 * 8
+        cache = hzgfx.cartmap.TileCache( budget = 4 * tile, tile = 16 )
+        plane = hzgfx.cartmap.Plane( ( 0.0, 0.0 ), ( 2.0, 2.0 ), 0.125 )
+        cache.render( plane, self.count )
+        self.assertEqual( 1, len( cache ) )
+        plane = hzgfx.cartmap.Plane( ( 0.0, 0.0 ), ( 6.0, 2.0 ), 0.125 )
+        cache.render( plane, self.count )
+        self.assertEqual( 3, len( cache ) )
+        plane = hzgfx.cartmap.Plane( ( 0.0, 2.0 ), ( 6.0, 4.0 ), 0.125 )
+        cache.render( plane, self.count )
+        self.assertEqual( 4, len( cache ) )
+        self.assertEqual( 4 * tile, cache.nbytes )
+
+        # The least-recently-used tiles are discarded first.
+        self.computed = 0
+        plane = hzgfx.cartmap.Plane( ( 4.0, 2.0 ), ( 6.0, 4.0 ), 0.125 )
+        cache.render( plane, self.count )
+        self.assertEqual( 0, self.computed )
+        plane = hzgfx.cartmap.Plane( ( 0.0, 0.0 ), ( 2.0, 2.0 ), 0.125 )
+        cache.render( plane, self.count )
+        self.assertEqual( 16 * 16, self.computed )
+
+        # Shrinking the budget discards tiles immediately.
+        cache.budget = tile
+        self.assertEqual( 1, len( cache ) )
+        self.assertDictEqual(
+            {
+                'hits'   : cache.hits,
+                'misses' : cache.misses,
+                'budget' : tile,
+                'nbytes' : tile,
+                'length' : 1
+            },
+            cache.stats()
+        )
+        self.assertRaises( ValueError, setattr, cache, 'budget', -1 )
+        cache.clear()
+        self.assertEqual( 0, len( cache ) )
+        self.assertEqual( 0, cache.nbytes )
+
 # Run tests when run directly from the shell.
 if __name__ == '__main__':
     unittest.main()
@@ -10,6 +10,7 @@ color Module Unit Tests
 """
 
 
+import sys
 import unittest
 
 import hzgfx.color
@@ -71,3 +72,741 @@ class ColorTests( unittest.TestCase ):
             self.assertEqual( case[ 1 ], c._int, msg = str( case[ 0 ] ) )
             self.assertEqual( case[ 2 ], c._rgb, msg = str( case[ 0 ] ) )
 
+
+    #=========================================================================
+    def test_hex_cache( self ):
+        """
+        Tests caching parsed color strings.
+        """
+        cache = hzgfx.color.LRUCache( lambda key: key * 2, 2 )
+        self.assertEqual( 2, cache( 1 ) )
+        self.assertEqual( 4, cache( 2 ) )
+        self.assertEqual( 2, cache( 1 ) )
+        self.assertEqual( 6, cache( 3 ) )
+        self.assertDictEqual(
+            { 'hits' : 1, 'misses' : 3, 'size' : 2, 'length' : 2 },
+            cache.stats()
+        )
+        self.assertEqual( 4, cache( 2 ) )
+        self.assertEqual( 4, cache.misses )
+        self.assertEqual( 2, cache( 1 ) )
+        self.assertEqual( 5, cache.misses )
+        cache.size = 1
+        self.assertEqual( 1, len( cache ) )
+        self.assertEqual( 2, cache( 1 ) )
+        self.assertEqual( 2, cache.hits )
+        cache.size = 0
+        self.assertEqual( 6, cache( 3 ) )
+        self.assertEqual( 0, len( cache ) )
+        cache.clear()
+        self.assertEqual( ( 0, 0 ), ( cache.hits, cache.misses ) )
+        with self.assertRaises( ValueError ):
+            cache.size = -1
+
+        hex_cache = hzgfx.color.hex_cache
+        hex_cache.clear()
+        self.assertEqual( 0x123456, int( hzgfx.color.Color( '#123456' ) ) )
+        self.assertEqual( 0x123456, int( hzgfx.color.Color( '#123456' ) ) )
+        self.assertEqual( ( 1, 1 ), ( hex_cache.hits, hex_cache.misses ) )
+        with self.assertRaises( ValueError ):
+            hzgfx.color.Color( '#12345Z' )
+
+
+    #=========================================================================
+    def test_from_hex( self ):
+        """
+        Tests interned, immutable colors.
+        """
+        color = hzgfx.color.Color.from_hex( '#F07' )
+        self.assertIsInstance( color, hzgfx.color.FrozenColor )
+        self.assertEqual( 0xFF0077, int( color ) )
+        self.assertTupleEqual( ( 255, 0, 0x77 ), color.__tuple__() )
+        self.assertEqual( '#FF0077', str( color ) )
+        self.assertIs( color, hzgfx.color.Color.from_hex( '#F07' ) )
+        with self.assertRaises( AttributeError ):
+            color.set( 0 )
+        with self.assertRaises( AttributeError ):
+            color.strmode = color.STR_PLAIN
+        self.assertEqual( 0xFF0077, int( color ) )
+
+
+    #=========================================================================
+    @unittest.skipIf( hzgfx.color.numpy is None, 'NumPy is not installed' )
+    def test_parse_many( self ):
+        """
+        Tests converting batches of colors from various types/formats.
+        """
+        numpy = hzgfx.color.numpy
+
+        # color in an object
+        class CObj( object ):
+            r = 66
+            g = 55
+            b = 44
+
+        # test cases as: input batch, expected packed integers
+        cases = [
+            ( [ 0, 1, 256, 0xFFFFFF ], [ 0, 1, 256, 0xFFFFFF ] ),
+            (
+                [ '#000000', '#FFFFFF', 'F07', '0x112233', '#abc', 'ff' ],
+                [ 0, 0xFFFFFF, 0xFF0077, 0x112233, 0xAABBCC, 0xFF ]
+            ),
+            ( [ u'#123456', u'fff' ], [ 0x123456, 0xFFFFFF ] ),
+            ( numpy.array( [ '#123456', '#F08' ] ), [ 0x123456, 0xFF0088 ] ),
+            ( [ ( 99, 88, 77 ), [ 1, 2, 3 ] ], [ 0x63584D, 0x010203 ] ),
+            ( numpy.array( [ [ 99, 88, 77 ] ] ), [ 0x63584D ] ),
+            ( [ { 'r' : 99, 'g' : 88, 'b' : 77 } ], [ 0x63584D ] ),
+            ( [ CObj(), CObj() ], [ 0x42372C, 0x42372C ] ),
+            ( [ hzgfx.color.Color( 0x123456 ) ], [ 0x123456 ] ),
+            ( iter( [ 5, 6 ] ), [ 5, 6 ] ),
+            ( [], [] )
+        ]
+
+        # run each test case
+        for case in cases:
+            actual = hzgfx.color.Color.parse_many( case[ 0 ] )
+            self.assertEqual( numpy.uint32, actual.dtype )
+            self.assertListEqual( case[ 1 ], actual.tolist() )
+
+        # make sure all elements agree with single color parsing
+        strings = [ '#{:06X}'.format( i * 0x1F3D ) for i in range( 500 ) ]
+        actual = hzgfx.color.Color.parse_many( strings )
+        expected = [ int( hzgfx.color.Color( s ) ) for s in strings ]
+        self.assertListEqual( expected, actual.tolist() )
+
+        # short and long forms parse the same way on both paths
+        strings = [ '#1234', '123', '#123456', '0x12345678', 'ABCDE' ]
+        actual = hzgfx.color.Color.parse_many( strings )
+        expected = [ int( hzgfx.color.Color( s ) ) for s in strings ]
+        self.assertListEqual( expected, actual.tolist() )
+        self.assertEqual( 0x001234, actual[ 0 ] )
+
+        # invalid colors
+        invalid = [ [ '#12G' ], [ '#' ], [ '#123456789' ], [ '#12', '#12x' ] ]
+        for case in invalid:
+            with self.assertRaises( ValueError ):
+                hzgfx.color.Color.parse_many( case )
+        with self.assertRaises( TypeError ):
+            hzgfx.color.Color.parse_many( [ None ] )
+
+
+    #=========================================================================
+    @unittest.skipIf( hzgfx.color.numpy is None, 'NumPy is not installed' )
+    def test_pack_many( self ):
+        """
+        Tests packing and unpacking batches of colors.
+        """
+        rgb = [ ( 0, 0, 0 ), ( 255, 255, 255 ), ( 0x11, 0x22, 0x33 ) ]
+        packed = hzgfx.color.Color.pack_many( rgb )
+        self.assertListEqual( [ 0, 0xFFFFFF, 0x112233 ], packed.tolist() )
+        unpacked = hzgfx.color.Color.unpack_many( packed )
+        self.assertEqual( hzgfx.color.numpy.uint8, unpacked.dtype )
+        self.assertListEqual( rgb, [ tuple( c ) for c in unpacked ] )
+        self.assertEqual( ( 0, 3 ), hzgfx.color.Color.unpack_many( [] ).shape )
+        self.assertEqual( 0, len( hzgfx.color.Color.pack_many( [] ) ) )
+        with self.assertRaises( ValueError ):
+            hzgfx.color.Color.pack_many( [ 1, 2, 3 ] )
+
+
+
+    #=========================================================================
+    def test_spaces( self ):
+        """
+        Tests converting single colors between color spaces.
+        """
+        Color = hzgfx.color.Color
+        red = Color( '#FF0000' )
+        self.assertEqual( ( 0.0, 1.0, 1.0 ), red.to_hsv() )
+        self.assertEqual( ( 0.0, 1.0, 0.5 ), red.to_hsl() )
+        white = Color( '#FFFFFF' )
+        for actual, expected in zip( white.to_lab(), ( 100.0, 0.0, 0.0 ) ):
+            self.assertAlmostEqual( expected, actual, places = 3 )
+        expected = ( 0.95047, 1.0, 1.08883 )
+        for actual, expected in zip( white.to_xyz(), expected ):
+            self.assertAlmostEqual( expected, actual, places = 4 )
+        gray = Color( '#808080' )
+        for channel in gray.to_linear():
+            self.assertAlmostEqual( 0.2158605, channel, places = 6 )
+
+        # Make sure all conversions round-trip.
+        for value in ( 0x000000, 0xFFFFFF, 0x336699, 0xF0E010, 0x0A0B0C ):
+            color = Color( value )
+            conversions = [
+                ( color.to_hsv, Color.from_hsv ),
+                ( color.to_hsl, Color.from_hsl ),
+                ( color.to_linear, Color.from_linear ),
+                ( color.to_xyz, Color.from_xyz ),
+                ( color.to_lab, Color.from_lab )
+            ]
+            for to_space, from_space in conversions:
+                self.assertEqual( value, int( from_space( to_space() ) ) )
+
+
+    #=========================================================================
+    @unittest.skipIf( hzgfx.color.numpy is None, 'NumPy is not installed' )
+    def test_convert_many( self ):
+        """
+        Tests converting arrays of colors between color spaces.
+        """
+        numpy = hzgfx.color.numpy
+        Color = hzgfx.color.Color
+        rng = numpy.random.RandomState( 7 )
+        rgb = rng.randint( 0, 256, ( 4, 25, 3 ) ).astype( numpy.uint8 )
+        colors = [ Color( tuple( c ) ) for c in rgb.reshape( -1, 3 ) ]
+        spaces = [
+            ( hzgfx.color.SPACE_LINEAR, Color.to_linear ),
+            ( hzgfx.color.SPACE_HSV, Color.to_hsv ),
+            ( hzgfx.color.SPACE_HSL, Color.to_hsl ),
+            ( hzgfx.color.SPACE_XYZ, Color.to_xyz ),
+            ( hzgfx.color.SPACE_LAB, Color.to_lab )
+        ]
+        for space, to_space in spaces:
+
+            # Batch conversions agree with single conversions.
+            actual = hzgfx.color.convert_many(
+                rgb,
+                hzgfx.color.SPACE_SRGB,
+                space
+            )
+            self.assertEqual( rgb.shape, actual.shape )
+            expected = numpy.array( [ to_space( c ) for c in colors ] )
+            self.assertTrue(
+                numpy.allclose( expected, actual.reshape( -1, 3 ) ),
+                msg = str( space )
+            )
+
+            # Batch conversions round-trip to 8-bit sRGB.
+            back = hzgfx.color.convert_many(
+                actual,
+                space,
+                hzgfx.color.SPACE_SRGB
+            )
+            self.assertEqual( numpy.uint8, back.dtype )
+            self.assertTrue( numpy.array_equal( rgb, back ), str( space ) )
+
+        # Floating-point sRGB and conversions between other spaces.
+        lab = hzgfx.color.convert_many(
+            rgb / 255.0,
+            hzgfx.color.SPACE_SRGB,
+            hzgfx.color.SPACE_LAB
+        )
+        hsv = hzgfx.color.convert_many(
+            lab,
+            hzgfx.color.SPACE_LAB,
+            hzgfx.color.SPACE_HSV
+        )
+        expected = numpy.array( [ c.to_hsv() for c in colors ] )
+        self.assertTrue(
+            numpy.allclose( expected, hsv.reshape( -1, 3 ), atol = 1e-5 )
+        )
+        with self.assertRaises( ValueError ):
+            hzgfx.color.convert_many( rgb, hzgfx.color.SPACE_SRGB, 99 )
+
+        # Linear channels encode to the same levels as single conversions.
+        linear = numpy.concatenate( (
+            rng.random_sample( ( 4000, 3 ) ),
+            rng.random_sample( ( 1000, 3 ) ) * 0.01,
+            [ [ 0.0, 1.0, 0.5 ], [ -0.5, 1.5, 0.0031308 ] ]
+        ) )
+        srgb = hzgfx.color.convert_many(
+            linear,
+            hzgfx.color.SPACE_LINEAR,
+            hzgfx.color.SPACE_SRGB
+        )
+        expected = [
+            Color.from_linear( c ).__tuple__() for c in linear.tolist()
+        ]
+        self.assertListEqual( expected, [ tuple( c ) for c in srgb.tolist() ] )
+
+        # Halfway channel values round up in both paths.
+        levels = [ 0.5, 1.5, 2.5, 127.5, 254.5 ]
+        hsv = numpy.array( [ ( 0.0, 0.0, v / 255.0 ) for v in levels ] )
+        expected = [ 1, 2, 3, 128, 255 ]
+        self.assertListEqual(
+            expected,
+            [ int( Color.from_hsv( c ) ) & 0xFF for c in hsv.tolist() ]
+        )
+        srgb = hzgfx.color.convert_many(
+            hsv,
+            hzgfx.color.SPACE_HSV,
+            hzgfx.color.SPACE_SRGB
+        )
+        self.assertListEqual( expected, srgb[ :, 0 ].tolist() )
+
+#=============================================================================
+@unittest.skipIf( hzgfx.color.numpy is None, 'NumPy is not installed' )
+class ColorArrayTests( unittest.TestCase ):
+    """
+    Tests the ColorArray class
+    """
+
+
+    #=========================================================================
+    def test_init( self ):
+        """
+        Tests creating color arrays from various types/formats.
+        """
+        numpy = hzgfx.color.numpy
+        colors = hzgfx.color.ColorArray( 4 )
+        self.assertEqual( 4, len( colors ) )
+        self.assertListEqual( [ 0, 0, 0, 0 ], colors.data.tolist() )
+        packed = numpy.array( [ 0x112233, 0x445566 ], dtype = numpy.uint32 )
+        colors = hzgfx.color.ColorArray( packed )
+        self.assertIs( packed, colors.data )
+        colors = hzgfx.color.ColorArray( [ '#112233', '#445566' ] )
+        self.assertListEqual( [ 0x112233, 0x445566 ], colors.data.tolist() )
+        colors = hzgfx.color.ColorArray( numpy.array( [ [ 1, 2, 3 ] ] ) )
+        self.assertListEqual( [ 0x010203 ], colors.data.tolist() )
+        colors = hzgfx.color.ColorArray( packed )
+        self.assertIs( packed, numpy.asarray( colors ) )
+        self.assertEqual( packed.tobytes(), colors.tobytes() )
+
+
+    #=========================================================================
+    def test_getitem( self ):
+        """
+        Tests indexing and slicing color arrays.
+        """
+        colors = hzgfx.color.ColorArray( [ 0x112233, 0x445566, 0x778899 ] )
+        color = colors[ 1 ]
+        self.assertIsInstance( color, hzgfx.color.Color )
+        self.assertEqual( 0x445566, int( color ) )
+        self.assertEqual( 0x778899, int( colors[ -1 ] ) )
+        self.assertListEqual(
+            [ 0x112233, 0x445566, 0x778899 ],
+            [ int( c ) for c in colors ]
+        )
+
+        # Unit-step slices share the buffer.
+        view = colors[ 1 : ]
+        self.assertIsInstance( view, hzgfx.color.ColorArray )
+        view[ 0 ] = '#ABCDEF'
+        self.assertEqual( 0xABCDEF, int( colors[ 1 ] ) )
+        view = colors[ : : 2 ]
+        self.assertListEqual( [ 0x112233, 0x778899 ], view.data.tolist() )
+
+        # Modify colors by index and by slice.
+        colors[ 0 ] = ( 1, 2, 3 )
+        colors[ 1 : 3 ] = [ '#000000', '#FFFFFF' ]
+        self.assertListEqual(
+            [ 0x010203, 0x000000, 0xFFFFFF ],
+            colors.data.tolist()
+        )
+        colors[ : ] = hzgfx.color.ColorArray( [ 7, 8, 9 ] )
+        self.assertListEqual( [ 7, 8, 9 ], colors.data.tolist() )
+
+
+    #=========================================================================
+    def test_channels( self ):
+        """
+        Tests the zero-copy channel views.
+        """
+        colors = hzgfx.color.ColorArray( [ 0x112233, 0x445566 ] )
+        self.assertListEqual( [ 0x11, 0x44 ], colors.r.tolist() )
+        self.assertListEqual( [ 0x22, 0x55 ], colors.g.tolist() )
+        self.assertListEqual( [ 0x33, 0x66 ], colors.b.tolist() )
+        self.assertListEqual(
+            [ [ 0x11, 0x22, 0x33 ], [ 0x44, 0x55, 0x66 ] ],
+            colors.rgb.tolist()
+        )
+
+        # Writing to channels modifies the colors.
+        colors.g[ : ] = 0
+        colors.rgb[ 1, 0 ] = 0xFF
+        self.assertListEqual( [ 0x110033, 0xFF0066 ], colors.data.tolist() )
+        with self.assertRaises( AttributeError ):
+            dummy = colors.fakeyfaker
+
+
+    #=========================================================================
+    def test_buffer( self ):
+        """
+        Tests sharing the color buffer without copying.
+        """
+        numpy = hzgfx.color.numpy
+        colors = hzgfx.color.ColorArray( [ 0x112233, 0x445566 ] )
+        view = memoryview( colors.data )
+        self.assertEqual( ( 4, ( 2, ) ), ( view.itemsize, view.shape ) )
+        view[ 1 ] = 0x778899
+        self.assertEqual( 0x778899, int( colors[ 1 ] ) )
+        self.assertTrue(
+            numpy.shares_memory( colors.data, numpy.asarray( colors ) )
+        )
+
+        # Python classes can only export buffers on Python 3.12 and newer.
+        if sys.version_info >= ( 3, 12 ):
+            view = memoryview( colors )
+            view[ 0 ] = 0xABCDEF
+            self.assertEqual( 0xABCDEF, int( colors[ 0 ] ) )
+        else:
+            with self.assertRaises( TypeError ):
+                memoryview( colors )
+
+
+#=============================================================================
+class ColorAlphaTests( unittest.TestCase ):
+    """
+    Tests the ColorAlpha class
+    """
+
+
+    #=========================================================================
+    def tearDown( self ):
+        """
+        Restores the default channel order.
+        """
+        hzgfx.color.ColorAlpha.order = hzgfx.color.ColorAlpha.ORDER_ARGB
+
+
+    #=========================================================================
+    def test_set( self ):
+        """
+        Tests setting color values from various types/formats.
+        """
+
+        # color with alpha in an object
+        class CObj( object ):
+            r = 66
+            g = 55
+            b = 44
+            a = 33
+
+        # test cases as: input, expected ARGB integer, expected tuple
+        cases = [
+            (             0, 0x00000000, (    0,    0,    0,    0 ) ),
+            (    0x80FF0000, 0x80FF0000, (  255,    0,    0, 0x80 ) ),
+            (     '#000000', 0xFF000000, (    0,    0,    0,  255 ) ),
+            (   '#11223344', 0x44112233, ( 0x11, 0x22, 0x33, 0x44 ) ),
+            (        'F07C', 0xCCFF0077, (  255,    0, 0x77, 0xCC ) ),
+            (       '#1234', 0x44112233, ( 0x11, 0x22, 0x33, 0x44 ) ),
+            (  '0x11223344', 0x44112233, ( 0x11, 0x22, 0x33, 0x44 ) ),
+            ( ( 1, 2, 3, 4 ), 0x04010203, (   1,    2,    3,    4 ) ),
+            (    ( 1, 2, 3 ), 0xFF010203, (   1,    2,    3,  255 ) ),
+            (
+                { 'r' : 99, 'g' : 88, 'b' : 77, 'a' : 66 },
+                0x4263584D,
+                ( 99, 88, 77, 66 )
+            ),
+            (
+                { 'r' : 99, 'g' : 88, 'b' : 77 },
+                0xFF63584D,
+                ( 99, 88, 77, 255 )
+            ),
+            (        CObj(), 0x2142372C, (   66,   55,   44,   33 ) )
+        ]
+
+        # run each test case
+        c = hzgfx.color.ColorAlpha()
+        for case in cases:
+            c.set( case[ 0 ] )
+            self.assertEqual( case[ 1 ], int( c ), msg = str( case[ 0 ] ) )
+            self.assertEqual( case[ 2 ], c.__tuple__(), str( case[ 0 ] ) )
+
+
+    #=========================================================================
+    def test_order( self ):
+        """
+        Tests numeric input and output in RGBA order.
+        """
+        c = hzgfx.color.ColorAlpha( '#11223344' )
+        self.assertEqual( 0x44112233, int( c ) )
+        self.assertEqual( '#11223344', str( c ) )
+        c.strmode = c.STR_LITERAL
+        self.assertEqual( '0x11223344', str( c ) )
+        hzgfx.color.ColorAlpha.order = hzgfx.color.ColorAlpha.ORDER_RGBA
+        self.assertEqual( 0x11223344, int( c ) )
+        self.assertEqual( '0x11223344', str( c ) )
+        c.set( 0xAABBCCDD )
+        self.assertEqual( ( 0xAA, 0xBB, 0xCC, 0xDD ), c.__tuple__() )
+        self.assertEqual(
+            ( 1, 2, 3, 4 ),
+            hzgfx.color.ColorAlpha.int2rgba(
+                0x04010203,
+                hzgfx.color.ColorAlpha.ORDER_ARGB
+            )
+        )
+
+
+    #=========================================================================
+    def test_str( self ):
+        """
+        Tests that every string mode parses back to the same color.
+        """
+        modes = (
+            hzgfx.color.ColorAlpha.STR_PLAIN,
+            hzgfx.color.ColorAlpha.STR_POUNDS,
+            hzgfx.color.ColorAlpha.STR_POUNDS3,
+            hzgfx.color.ColorAlpha.STR_LITERAL
+        )
+        for order in ( 'ARGB', 'RGBA' ):
+            hzgfx.color.ColorAlpha.order = getattr(
+                hzgfx.color.ColorAlpha,
+                'ORDER_' + order
+            )
+            for mode in modes:
+                c = hzgfx.color.ColorAlpha( ( 0x11, 0x22, 0x33, 0x44 ) )
+                c.strmode = mode
+                copy = hzgfx.color.ColorAlpha( str( c ) )
+                self.assertEqual( c.__tuple__(), copy.__tuple__(), str( c ) )
+
+
+    #=========================================================================
+    @unittest.skipIf( hzgfx.color.numpy is None, 'NumPy is not installed' )
+    def test_composite( self ):
+        """
+        Tests batch compositing against straightforward per-pixel math.
+        """
+        numpy = hzgfx.color.numpy
+        ColorAlpha = hzgfx.color.ColorAlpha
+        ops = {
+            hzgfx.color.OP_OVER : lambda sa, da : ( 1.0, 1.0 - sa ),
+            hzgfx.color.OP_IN   : lambda sa, da : ( da, 0.0 ),
+            hzgfx.color.OP_OUT  : lambda sa, da : ( 1.0 - da, 0.0 ),
+            hzgfx.color.OP_ATOP : lambda sa, da : ( da, 1.0 - sa )
+        }
+        rng = numpy.random.RandomState( 5 )
+        for order in ( ColorAlpha.ORDER_ARGB, ColorAlpha.ORDER_RGBA ):
+            straight = rng.randint( 0, 2 ** 32, ( 2, 8, 8 ) ).astype( 'u4' )
+            layers = hzgfx.color.premultiply( straight, order )
+            self.assertEqual( ( 2, 8, 8 ), layers.shape )
+            source = layers[ 0 ].reshape( -1 ).tolist()
+            dest = layers[ 1 ].reshape( -1 ).tolist()
+            for op, factors in ops.items():
+                actual = hzgfx.color.composite(
+                    layers[ 0 ],
+                    layers[ 1 ],
+                    op,
+                    order
+                )
+                self.assertEqual( ( 8, 8 ), actual.shape )
+                for s, d, a in zip( source, dest, actual.reshape( -1 ) ):
+                    src = ColorAlpha.int2rgba( s, order )
+                    dst = ColorAlpha.int2rgba( d, order )
+                    fa, fb = factors( src[ 3 ] / 255.0, dst[ 3 ] / 255.0 )
+                    expected = [
+                        min( 255.0, sc * fa + dc * fb )
+                        for sc, dc in zip( src, dst )
+                    ]
+                    result = ColorAlpha.int2rgba( int( a ), order )
+                    for e, c in zip( expected, result ):
+                        self.assertLessEqual( abs( e - c ), 1.0 )
+        with self.assertRaises( ValueError ):
+            hzgfx.color.composite( layers[ 0 ], layers[ 1 ], 99 )
+
+
+    #=========================================================================
+    @unittest.skipIf( hzgfx.color.numpy is None, 'NumPy is not installed' )
+    def test_premultiply( self ):
+        """
+        Tests premultiplying and unpremultiplying packed colors.
+        """
+        numpy = hzgfx.color.numpy
+        colors = numpy.array(
+            [ 0xFF336699, 0x80FF8000, 0x00FFFFFF, 0x40102030 ],
+            dtype = numpy.uint32
+        )
+        premul = hzgfx.color.premultiply( colors )
+        self.assertListEqual(
+            [ 0xFF336699, 0x80804000, 0x00000000, 0x4004080C ],
+            premul.tolist()
+        )
+        straight = hzgfx.color.unpremultiply( premul )
+        self.assertListEqual(
+            [ 0xFF336699, 0x80FF8000, 0x00000000, 0x40102030 ],
+            straight.tolist()
+        )
+
+        # Convert in place using RGBA ordering.
+        colors = numpy.array( [ 0xFF800080 ], dtype = numpy.uint32 )
+        order = hzgfx.color.ColorAlpha.ORDER_RGBA
+        hzgfx.color.premultiply( colors, order, out = colors )
+        self.assertListEqual( [ 0x80400080 ], colors.tolist() )
+        hzgfx.color.unpremultiply( colors, order, out = colors )
+        self.assertListEqual( [ 0xFF800080 ], colors.tolist() )
+
+
+    #=========================================================================
+    @unittest.skipIf( hzgfx.color.numpy is None, 'NumPy is not installed' )
+    def test_pack_many( self ):
+        """
+        Tests packing and unpacking batches of RGBA channels.
+        """
+        ColorAlpha = hzgfx.color.ColorAlpha
+        rgba = [ [ ( 0x33, 0x66, 0x99, 0xFF ), ( 0xFF, 0x80, 0x00, 0x40 ) ] ]
+        packed = ColorAlpha.pack_many( rgba )
+        self.assertTupleEqual( ( 1, 2 ), packed.shape )
+        self.assertListEqual( [ [ 0xFF336699, 0x40FF8000 ] ], packed.tolist() )
+        self.assertListEqual(
+            [ [ list( rgba[ 0 ][ 0 ] ), list( rgba[ 0 ][ 1 ] ) ] ],
+            ColorAlpha.unpack_many( packed ).tolist()
+        )
+        order  = ColorAlpha.ORDER_RGBA
+        packed = ColorAlpha.pack_many( rgba, order )
+        self.assertListEqual( [ [ 0x336699FF, 0xFF800040 ] ], packed.tolist() )
+        self.assertListEqual(
+            [ 0xFF, 0x80, 0x00, 0x40 ],
+            ColorAlpha.unpack_many( packed, order )[ 0, 1 ].tolist()
+        )
+        with self.assertRaises( ValueError ):
+            ColorAlpha.pack_many( [ ( 1, 2, 3 ) ] )
+
+
+    #=========================================================================
+    @unittest.skipIf( hzgfx.color.numpy is None, 'NumPy is not installed' )
+    def test_resample( self ):
+        """
+        Tests resizing images of packed colors.
+        """
+        numpy = hzgfx.color.numpy
+        ColorAlpha = hzgfx.color.ColorAlpha
+
+        # Uniform images keep their color with every filter.
+        solid = numpy.full( ( 20, 30 ), 0x80336699, dtype = numpy.uint32 )
+        for filter in ( hzgfx.color.FILTER_BOX, hzgfx.color.FILTER_LANCZOS ):
+            for size in ( ( 10, 7 ), ( 3, 3 ), ( 45, 40 ) ):
+                result = hzgfx.color.resample( solid, size, filter )
+                self.assertTupleEqual( size[ : : -1 ], result.shape )
+                self.assertTrue( ( result == 0x80336699 ).all() )
+
+        # Reductions average light (not sRGB values) and ignore transparent
+        # colors.
+        box  = hzgfx.color.FILTER_BOX
+        rgba = numpy.zeros( ( 4, 4, 4 ), dtype = numpy.uint8 )
+        rgba[ :, : : 2 ] = ( 255, 255, 255, 255 )
+        rgba[ :, 1 : : 2 ] = ( 0, 0, 0, 255 )
+        image  = ColorAlpha.pack_many( rgba )
+        result = hzgfx.color.resample( image, ( 2, 2 ), box )
+        self.assertListEqual(
+            [ 188, 188, 188, 255 ],
+            ColorAlpha.unpack_many( result )[ 0, 0 ].tolist()
+        )
+        rgba[ :, 1 : : 2 ] = ( 0, 0, 0, 0 )
+        image  = ColorAlpha.pack_many( rgba )
+        result = hzgfx.color.resample( image, ( 1, 1 ), box )
+        self.assertListEqual(
+            [ 255, 255, 255, 128 ],
+            ColorAlpha.unpack_many( result )[ 0, 0 ].tolist()
+        )
+        result = hzgfx.color.resample( image, ( 2, 1 ) )
+        channels = ColorAlpha.unpack_many( result )
+        self.assertTrue( ( channels[ ..., : 3 ] == 255 ).all() )
+        with self.assertRaises( ValueError ):
+            hzgfx.color.resample( image, ( 2, 2 ), 99 )
+        with self.assertRaises( ValueError ):
+            hzgfx.color.resample( image, ( 0, 2 ) )
+
+
+#=============================================================================
+@unittest.skipIf( hzgfx.color.numpy is None, 'NumPy is not installed' )
+class PaletteTests( unittest.TestCase ):
+    """
+    Tests the Palette class
+    """
+
+
+    #=========================================================================
+    def setUp( self ):
+        """
+        Creates a small test palette.
+        """
+        self.colors = [
+            0x000000, 0xFFFFFF, 0xFF0000, 0x00FF00, 0x0000FF, 0x808080
+        ]
+
+
+    #=========================================================================
+    def tearDown( self ):
+        """
+        Discards any cached palettes.
+        """
+        hzgfx.color.Palette.clear_cache()
+
+
+    #=========================================================================
+    def test_init( self ):
+        """
+        Tests palette construction and color access.
+        """
+        palette = hzgfx.color.Palette( self.colors )
+        self.assertEqual( 6, len( palette ) )
+        self.assertEqual( 0xFF0000, int( palette[ 2 ] ) )
+        with self.assertRaises( ValueError ):
+            hzgfx.color.Palette( [] )
+        with self.assertRaises( ValueError ):
+            hzgfx.color.Palette( self.colors, hzgfx.color.SPACE_HSV )
+        with self.assertRaises( ValueError ):
+            hzgfx.color.Palette( self.colors, bits = 9 )
+
+
+    #=========================================================================
+    def test_nearest( self ):
+        """
+        Tests finding nearest palette colors.
+        """
+        numpy = hzgfx.color.numpy
+        palette = hzgfx.color.Palette( self.colors )
+        queries = [ 0x101010, 0xF0F0F0, 0xE01010, 0x10E010, 0x1010E0 ]
+        expected = [ 0, 1, 2, 3, 4 ]
+        self.assertListEqual( expected, palette.nearest( queries ).tolist() )
+        self.assertListEqual(
+            expected,
+            palette.nearest( queries, exact = True ).tolist()
+        )
+        self.assertListEqual(
+            [ 0x000000, 0x808080 ],
+            palette.quantize( [ '#050505', '#7A8088' ] ).tolist()
+        )
+
+        # Channel arrays keep their shape.
+        rgb = numpy.array( [ [ [ 250, 5, 5 ], [ 120, 130, 125 ] ] ] )
+        self.assertListEqual(
+            [ [ 2, 5 ] ],
+            palette.nearest( rgb.astype( numpy.uint8 ) ).tolist()
+        )
+        self.assertListEqual(
+            [ [ 2, 5 ] ],
+            palette.nearest( rgb, channels = True ).tolist()
+        )
+        with self.assertRaises( ValueError ):
+            palette.nearest( queries, channels = True )
+
+        # Packed images with three columns are not mistaken for channels.
+        packed = numpy.array(
+            [ [ 0xFFFFFF ] * 3, [ 0x000000, 0xE01010, 0x1010E0 ] ],
+            dtype = numpy.uint32
+        )
+        expected = [ [ 1, 1, 1 ], [ 0, 2, 4 ] ]
+        self.assertListEqual( expected, palette.nearest( packed ).tolist() )
+        self.assertListEqual(
+            expected,
+            palette.nearest( packed.astype( int ), exact = True ).tolist()
+        )
+        self.assertListEqual(
+            [ [ 0xFFFFFF ] * 3, [ 0x000000, 0xFF0000, 0x0000FF ] ],
+            palette.quantize( packed, channels = False ).tolist()
+        )
+
+        # The lookup cube agrees with exact queries for most colors.
+        rng = numpy.random.RandomState( 9 )
+        packed = rng.randint( 0, 2 ** 24, ( 64, 64 ) ).astype( 'u4' )
+        for space in ( hzgfx.color.SPACE_SRGB, hzgfx.color.SPACE_LAB ):
+            palette = hzgfx.color.Palette( self.colors, space )
+            fast = palette.nearest( packed )
+            exact = palette.nearest( packed, exact = True )
+            self.assertEqual( ( 64, 64 ), fast.shape )
+            self.assertGreater( ( fast == exact ).mean(), 0.95 )
+
+
+    #=========================================================================
+    def test_get( self ):
+        """
+        Tests sharing built palettes.
+        """
+        palette = hzgfx.color.Palette.get( self.colors )
+        self.assertIs( palette, hzgfx.color.Palette.get( self.colors ) )
+        self.assertIsNot(
+            palette,
+            hzgfx.color.Palette.get( self.colors, bits = 4 )
+        )
+        hzgfx.color.Palette.clear_cache()
+        self.assertIsNot( palette, hzgfx.color.Palette.get( self.colors ) )
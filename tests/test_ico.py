@@ -0,0 +1,228 @@
+#=============================================================================
+#
+# ico Module Unit Tests
+#
+#=============================================================================
+
+"""
+ico Module Unit Tests
+=====================
+"""
+
+
+import os
+import shutil
+import struct
+import tempfile
+import unittest
+
+import hzgfx.color
+import hzgfx.ico
+import hzgfx.png
+
+
+#=============================================================================
+def bitmap( width, height, bits, pixels, mask, palette = b'', used = 0 ):
+    """
+    Builds a DIB payload from bottom-up rows of pixels and mask bits.
+    """
+    header = struct.pack(
+        '<IiiHHIIiiII', 40, width, height * 2, 1, bits, 0, 0, 0, 0, used, 0
+    )
+    return header + palette + pixels + mask
+
+
+#=============================================================================
+@unittest.skipIf( hzgfx.ico.numpy is None, 'NumPy is not installed' )
+class TestICO( unittest.TestCase ):
+    """
+    Tests the ico module.
+    """
+
+
+    #=========================================================================
+    def rgba( self, colors ):
+        """
+        Unpacks colors into nested lists of RGBA channels.
+        """
+        return hzgfx.color.ColorAlpha.unpack_many( colors ).tolist()
+
+
+    #=========================================================================
+    def test_round_trip( self ):
+        """
+        Tests encoding and decoding icons.
+        """
+        numpy  = hzgfx.ico.numpy
+        rng    = numpy.random.RandomState( 5 )
+        images = []
+        for width, height in ( ( 16, 16 ), ( 33, 7 ), ( 48, 48 ) ):
+            rgba = rng.randint( 0, 256, ( height, width, 4 ) )
+            rgba[ 0, : 5, 3 ] = 0
+            images.append(
+                hzgfx.color.ColorAlpha.pack_many( rgba.astype( numpy.uint8 ) )
+            )
+        data = hzgfx.ico.encode( images, png_width = 48 )
+        kind, entries = hzgfx.ico.entries( data )
+        self.assertEqual( hzgfx.ico.TYPE_ICON, kind )
+        self.assertEqual(
+            [ ( 16, 16, None ), ( 33, 7, None ), ( 48, 48, None ) ],
+            [ entry[ : 3 ] for entry in entries ]
+        )
+        self.assertNotEqual( hzgfx.png.SIGNATURE, entries[ 0 ].payload[ : 8 ] )
+        self.assertEqual( hzgfx.png.SIGNATURE, entries[ 2 ].payload[ : 8 ] )
+        for expected, actual in zip( images, hzgfx.ico.decode( data ) ):
+            self.assertTrue( ( expected == actual ).all() )
+
+        # The largest size is listed as zero.
+        image = numpy.zeros( ( 256, 256 ), dtype = numpy.uint32 )
+        data  = hzgfx.ico.encode( [ image ] )
+        self.assertEqual( b'\x00\x00', data[ 6 : 8 ] )
+        self.assertEqual(
+            ( 256, 256 ),
+            hzgfx.ico.entries( data )[ 1 ][ 0 ][ : 2 ]
+        )
+        self.assertEqual( ( 256, 256 ), hzgfx.ico.decode( data )[ 0 ].shape )
+
+
+    #=========================================================================
+    def test_payloads( self ):
+        """
+        Tests writing encoded images, and cursors.
+        """
+        numpy = hzgfx.ico.numpy
+        image = numpy.full( ( 24, 32 ), 0x80402010, dtype = numpy.uint32 )
+        png   = hzgfx.png.encode( image )
+        data  = hzgfx.ico.encode(
+            [ png, image ],
+            hotspots = [ ( 3, 4 ), ( 31, 23 ) ]
+        )
+        kind, entries = hzgfx.ico.entries( data )
+        self.assertEqual( hzgfx.ico.TYPE_CURSOR, kind )
+        self.assertEqual( ( 32, 24, ( 3, 4 ), png ), entries[ 0 ] )
+        self.assertEqual( ( 31, 23 ), entries[ 1 ].hotspot )
+        for actual in hzgfx.ico.decode( data ):
+            self.assertTrue( ( image == actual ).all() )
+
+        # Bitmaps can be copied between files.
+        copy = hzgfx.ico.encode( [ entries[ 1 ].payload ] )
+        self.assertEqual( entries[ 1 ].payload, copy[ 22 : ] )
+        self.assertEqual( b'\x01\x00\x20\x00', copy[ 10 : 14 ] )
+
+
+    #=========================================================================
+    def test_save( self ):
+        """
+        Tests writing and reading icon files.
+        """
+        numpy = hzgfx.ico.numpy
+        image = numpy.full( ( 32, 32 ), 0x80402010, dtype = numpy.uint32 )
+        path  = tempfile.mkdtemp()
+        try:
+            filename = os.path.join( path, 'test.ico' )
+            hzgfx.ico.save( filename, [ image ], png_width = 64 )
+            with open( filename, 'rb' ) as handle:
+                entries = hzgfx.ico.entries( handle.read() )[ 1 ]
+            self.assertNotEqual(
+                hzgfx.png.SIGNATURE,
+                entries[ 0 ].payload[ : 8 ]
+            )
+            hzgfx.ico.save( filename, [ image ], png_width = 32 )
+            with open( filename, 'rb' ) as handle:
+                entries = hzgfx.ico.entries( handle.read() )[ 1 ]
+            self.assertEqual(
+                hzgfx.png.SIGNATURE,
+                entries[ 0 ].payload[ : 8 ]
+            )
+            actual = hzgfx.ico.load( filename )[ 0 ]
+            self.assertTrue( ( image == actual ).all() )
+        finally:
+            shutil.rmtree( path )
+
+
+    #=========================================================================
+    def test_bitmaps( self ):
+        """
+        Tests decoding palette, and 24-bit bitmaps.
+        """
+
+        # 1-bit palette (top row: 1 0 1, bottom row: 0 1 1)
+        payload = bitmap(
+            3, 2, 1,
+            b'\x60\x00\x00\x00\xa0\x00\x00\x00',
+            b'\x00\x00\x00\x00\x20\x00\x00\x00',
+            b'\x30\x20\x10\x00\xd0\xe0\xf0\x00',
+            2
+        )
+        data = hzgfx.ico.encode( [ payload ] )
+        self.assertListEqual(
+            [
+                [ [ 240, 224, 208, 255 ], [ 16, 32, 48, 255 ],
+                  [ 240, 224, 208, 0 ] ],
+                [ [ 16, 32, 48, 255 ], [ 240, 224, 208, 255 ],
+                  [ 240, 224, 208, 255 ] ]
+            ],
+            self.rgba( hzgfx.ico.decode( data )[ 0 ] )
+        )
+
+        # 4-bit palette, and 24-bit colors with transparency masks
+        payloads = [
+            bitmap(
+                2, 1, 4,
+                b'\x21\x00\x00\x00',
+                b'\x40\x00\x00\x00',
+                b'\x00\x00\x00\x00\x01\x02\x03\x00\x04\x05\x06\x00',
+                3
+            ),
+            bitmap( 1, 1, 24, b'\x01\x02\x03\x00', b'\x80\x00\x00\x00' )
+        ]
+        images = hzgfx.ico.decode( hzgfx.ico.encode( payloads ) )
+        self.assertListEqual(
+            [ [ [ 6, 5, 4, 255 ], [ 3, 2, 1, 0 ] ] ],
+            self.rgba( images[ 0 ] )
+        )
+        self.assertListEqual(
+            [ [ [ 3, 2, 1, 0 ] ] ],
+            self.rgba( images[ 1 ] )
+        )
+
+
+    #=========================================================================
+    def test_errors( self ):
+        """
+        Tests rejecting invalid icons and images.
+        """
+        numpy = hzgfx.ico.numpy
+        image = numpy.zeros( ( 2, 2 ), dtype = numpy.uint32 )
+        data  = hzgfx.ico.encode( [ image ] )
+        with self.assertRaises( ValueError ):
+            hzgfx.ico.entries( data[ : 5 ] )
+        with self.assertRaises( ValueError ):
+            hzgfx.ico.entries( b'\x00\x00\x03\x00' + data[ 4 : ] )
+        with self.assertRaises( ValueError ):
+            hzgfx.ico.entries( data[ : -1 ] )
+        with self.assertRaises( ValueError ):
+            hzgfx.ico.encode( [ image ], hotspots = [] )
+        for hotspot in ( ( 70000, 0 ), ( 0, -1 ), ( 2, 0 ), ( 1, 2 ) ):
+            with self.assertRaises( ValueError ):
+                hzgfx.ico.encode( [ image ], hotspots = [ hotspot ] )
+        self.assertEqual(
+            ( 1, 1 ),
+            hzgfx.ico.entries(
+                hzgfx.ico.encode( [ image ], hotspots = [ ( 1, 1 ) ] )
+            )[ 1 ][ 0 ].hotspot
+        )
+        with self.assertRaises( ValueError ):
+            hzgfx.ico.encode( [ b'GIF89a' ] )
+        with self.assertRaises( ValueError ):
+            hzgfx.ico.encode( [ numpy.zeros( ( 1, 257 ), numpy.uint32 ) ] )
+        with self.assertRaises( ValueError ):
+            hzgfx.ico.encode( [ image[ 0 ] ] )
+        payload = bitmap( 1, 1, 16, b'\x00' * 4, b'\x00' * 4 )
+        with self.assertRaises( ValueError ):
+            hzgfx.ico.decode( hzgfx.ico.encode( [ payload ] ) )
+
+
+# Run tests when run directly from the shell.
+if __name__ == '__main__':
+    unittest.main()
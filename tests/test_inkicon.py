@@ -0,0 +1,500 @@
+#=============================================================================
+#
+# inkicon Script Unit Tests
+#
+#=============================================================================
+
+"""
+inkicon Script Unit Tests
+=========================
+
+Inkscape is replaced by a small stub script that writes solid-color images,
+and records how it was run.
+"""
+
+
+import os
+import shutil
+import stat
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(
+    0,
+    os.path.join( os.path.dirname( __file__ ), os.pardir, 'scripts' )
+)
+
+import hzgfx.color
+import hzgfx.ico
+import hzgfx.png
+import inkicon
+
+
+#=============================================================================
+# Stand-in for Inkscape:  Writes a solid-color PNG image of the requested
+# dimensions (to a file, or to its standard output), and logs the number of
+# stubs running at the same time.  Sources named "bad" write an image, and
+# fail.
+RASTERIZER = '''
+import os, struct, sys, time, zlib
+def chunk( kind, payload ):
+    return struct.pack( '>I', len( payload ) ) + kind + payload \\
+         + struct.pack( '>I', zlib.crc32( kind + payload ) & 0xFFFFFFFF )
+options = dict( arg[ 2 : ].split( '=', 1 ) for arg in sys.argv[ 2 : ]
+    if '=' in arg )
+output  = options.get( 'export-png', options.get( 'export-filename' ) )
+width   = int( options[ 'export-width' ] )
+height  = int( options[ 'export-height' ] )
+here    = os.path.dirname( os.path.abspath( __file__ ) )
+running = os.path.join( here, 'running', str( os.getpid() ) )
+open( running, 'w' ).close()
+count = len( os.listdir( os.path.dirname( running ) ) )
+time.sleep( 0.1 )
+rows = b'\\x00' + b'\\x20\\x40\\x60\\xff' * width
+data = b'\\x89PNG\\r\\n\\x1a\\n' \\
+     + chunk( b'IHDR',
+         struct.pack( '>IIBBBBB', width, height, 8, 6, 0, 0, 0 ) ) \\
+     + chunk( b'IDAT', zlib.compress( rows * height ) ) \\
+     + chunk( b'IEND', b'' )
+if output == '-':
+    getattr( sys.stdout, 'buffer', sys.stdout ).write( data )
+else:
+    with open( output, 'wb' ) as handle:
+        handle.write( data )
+with open( os.path.join( here, 'rasterizer.log' ), 'a' ) as handle:
+    handle.write( '{} {} {} {}\\n'.format(
+        sys.argv[ 1 ], count, width, 'pipe' if output == '-' else 'file' ) )
+os.unlink( running )
+sys.exit( 1 if 'bad' in sys.argv[ 1 ] else 0 )
+'''
+
+
+#=============================================================================
+class TestInkIcon( unittest.TestCase ):
+    """
+    Tests the inkicon script.
+    """
+
+
+    #=========================================================================
+    def setUp( self ):
+        """
+        Creates stub programs, and source files in a temporary directory.
+        """
+        self.path = tempfile.mkdtemp()
+        os.mkdir( os.path.join( self.path, 'running' ) )
+        self.program     = inkicon.INKSCAPE
+        inkicon.INKSCAPE = self.stub( 'rasterizer.py', RASTERIZER )
+        self.tempdir     = tempfile.tempdir
+        tempfile.tempdir = os.path.join( self.path, 'tmp' )
+        os.mkdir( tempfile.tempdir )
+        self.sources = []
+        for name in ( 'one.svg', 'two.svg', 'bad.svg' ):
+            self.sources.append( os.path.join( self.path, name ) )
+            with open( self.sources[ -1 ], 'w' ) as handle:
+                handle.write( '<svg/>' )
+
+
+    #=========================================================================
+    def tearDown( self ):
+        """
+        Restores the program, and removes the temporary directory.
+        """
+        self.assertEqual( [], os.listdir( tempfile.tempdir ) )
+        inkicon.INKSCAPE = self.program
+        tempfile.tempdir = self.tempdir
+        shutil.rmtree( self.path )
+
+
+    #=========================================================================
+    def files( self, suffix = '.png' ):
+        """
+        Lists the files in the temporary directory with a suffix.
+        """
+        return sorted(
+            name for name in os.listdir( self.path ) if name.endswith( suffix )
+        )
+
+
+    #=========================================================================
+    def icon( self, name, png_width = hzgfx.ico.PNG_WIDTH ):
+        """
+        Lists the ( width, height ) of each image in an ICO file, and checks
+        that only narrower images are stored as bitmaps (when NumPy is
+        installed).
+        """
+        if hzgfx.png.numpy is None:
+            png_width = 0
+        with open( os.path.join( self.path, name ), 'rb' ) as handle:
+            kind, entries = hzgfx.ico.entries( handle.read() )
+        for entry in entries:
+            self.assertEqual(
+                entry.width >= png_width,
+                entry.payload[ : 8 ] == hzgfx.png.SIGNATURE,
+                entry[ : 2 ]
+            )
+        return [ ( entry.width, entry.height ) for entry in entries ]
+
+
+    #=========================================================================
+    def log( self, outputs = False ):
+        """
+        Reads the ( source, concurrent stubs, width ) items logged by the stub
+        (or the outputs of the stub:  'file' or 'pipe').
+        """
+        with open( os.path.join( self.path, 'rasterizer.log' ) ) as handle:
+            lines = [ line.split() for line in handle ]
+        if outputs == True:
+            return [ line[ 3 ] for line in lines ]
+        return [
+            ( os.path.basename( name ), int( n ), int( width ) )
+            for name, n, width, output in lines
+        ]
+
+
+    #=========================================================================
+    def main( self, *args ):
+        """
+        Runs the script, and captures its output.
+        """
+        path    = os.path.join( self.path, 'stdout.txt' )
+        streams = ( sys.stdout, sys.stderr )
+        with open( path, 'w' ) as sys.stdout:
+            sys.stderr = sys.stdout
+            try:
+                result = inkicon.main( [ 'inkicon.py' ] + list( args ) )
+            finally:
+                sys.stdout, sys.stderr = streams
+        with open( path ) as handle:
+            return result, handle.read()
+
+
+    #=========================================================================
+    def stub( self, name, source ):
+        """
+        Creates an executable stub program.
+        """
+        path = os.path.join( self.path, name )
+        with open( path, 'w' ) as handle:
+            handle.write( '#!{}\n{}'.format( sys.executable, source ) )
+        os.chmod( path, os.stat( path ).st_mode | stat.S_IEXEC )
+        return path
+
+
+    #=========================================================================
+    def test_export_set( self ):
+        """
+        Tests exporting every size of an icon.
+        """
+        pngs = inkicon.export_set( self.sources[ 0 ], jobs = 3 )
+        self.assertEqual( len( inkicon.SIZES ), len( pngs ) )
+        for size, png in zip( inkicon.SIZES, pngs ):
+            self.assertEqual(
+                'onetmp{}.png'.format( size ),
+                os.path.basename( png )
+            )
+            with open( png, 'rb' ) as handle:
+                self.assertEqual(
+                    ( size, size ),
+                    hzgfx.png.size( handle.read() )
+                )
+        counts = [ count for name, count, width in self.log() ]
+        self.assertEqual( len( inkicon.SIZES ), len( counts ) )
+        self.assertGreater( max( counts ), 1 )
+        self.assertLessEqual( max( counts ), 3 )
+
+
+    #=========================================================================
+    def test_export_serial( self ):
+        """
+        Tests exporting with a single process at a time.
+        """
+        pngs = inkicon.export_many( self.sources[ : 2 ], ( 32, 16 ) )
+        self.assertEqual( 2, len( pngs ) )
+        self.assertEqual(
+            [ 1, 1, 1, 1 ],
+            [ n for name, n, width in self.log() ]
+        )
+        self.assertEqual(
+            [ 'onetmp16.png', 'onetmp32.png', 'twotmp16.png', 'twotmp32.png' ],
+            self.files()
+        )
+
+
+    #=========================================================================
+    @unittest.skipIf( hzgfx.png.numpy is None, 'NumPy is not installed' )
+    def test_cache( self ):
+        """
+        Tests skipping unchanged images and icons.
+        """
+        cache = inkicon.BuildCache( os.path.join( self.path, 'cache' ) )
+        inkicon.make_icos( self.sources[ : 2 ], cache = cache )
+        self.assertEqual( 12, len( self.log() ) )
+        with open( os.path.join( self.path, 'one.ico' ), 'rb' ) as handle:
+            icon = handle.read()
+        os.unlink( os.path.join( self.path, 'one.ico' ) )
+
+        # Unchanged icons are copied (and identical sources share items).
+        inkicon.make_icos( self.sources[ : 2 ], cache = cache )
+        self.assertEqual( 12, len( self.log() ) )
+        with open( os.path.join( self.path, 'one.ico' ), 'rb' ) as handle:
+            self.assertEqual( icon, handle.read() )
+        self.assertEqual(
+            { 'hits' : 2, 'misses' : 14, 'length' : 7 },
+            dict(
+                ( name, value ) for name, value in cache.stats().items()
+                if name != 'nbytes'
+            )
+        )
+        self.assertEqual( [], self.files() )
+
+        # Only changed sources are rasterized.
+        with open( self.sources[ 0 ], 'w' ) as handle:
+            handle.write( '<svg></svg>' )
+        inkicon.make_icos( self.sources[ : 2 ], cache = cache )
+        self.assertEqual(
+            [ 'one.svg' ] * 6,
+            [ item[ 0 ] for item in self.log()[ 12 : ] ]
+        )
+
+        # Cached images are reused by other sizes and modes.
+        inkicon.make_icos(
+            self.sources[ 1 : 2 ],
+            cache     = cache,
+            downscale = True
+        )
+        pngs = inkicon.export_set(
+            self.sources[ 1 ],
+            ( 48, 16 ),
+            cache = cache
+        )
+        self.assertEqual( 18, len( self.log() ) )
+        self.assertEqual(
+            [ ( 48, 48 ), ( 16, 16 ) ],
+            [ hzgfx.png.load( png ).shape for png in pngs ]
+        )
+        inkicon._cleanup( pngs )
+
+        # Changing the tools invalidates everything.
+        other = inkicon.BuildCache( cache.path, 'other' )
+        inkicon.make_icos( self.sources[ 1 : 2 ], cache = other )
+        self.assertEqual( 24, len( self.log() ) )
+        self.assertEqual( ( 0, 7 ), ( other.hits, other.misses ) )
+        self.assertNotEqual( cache.version, other.version )
+
+
+    #=========================================================================
+    def test_cache_prune( self ):
+        """
+        Tests removing the least-recently-used cache items.
+        """
+        cache = inkicon.BuildCache( os.path.join( self.path, 'cache' ) )
+        keys  = [ cache.key( 'item', index ) for index in range( 4 ) ]
+        for index, key in enumerate( keys ):
+            cache.put( key, b'x' * 100 )
+            os.utime( cache._item( key ), ( 1000 + index, 1000 + index ) )
+        self.assertEqual( b'x' * 100, cache.get( keys[ 0 ] ) )
+        self.assertIsNone( cache.get( cache.key( 'item', 4 ) ) )
+        self.assertEqual(
+            { 'hits' : 1, 'misses' : 1, 'nbytes' : 400, 'length' : 4 },
+            cache.stats()
+        )
+        self.assertEqual( 2, cache.prune( 250 ) )
+        self.assertIsNone( cache.get( keys[ 1 ] ) )
+        self.assertIsNone( cache.get( keys[ 2 ] ) )
+        self.assertIsNotNone( cache.get( keys[ 0 ] ) )
+        self.assertIsNotNone( cache.get( keys[ 3 ] ) )
+        self.assertEqual( 0, cache.prune( 250 ) )
+        self.assertEqual( 2, cache.prune( 0 ) )
+        self.assertEqual( 0, cache.stats()[ 'length' ] )
+        self.assertNotEqual( cache.key( 'a', 'bc' ), cache.key( 'ab', 'c' ) )
+        self.assertEqual( 50 * 1024 * 1024, inkicon._parse_size( '50M' ) )
+        self.assertEqual( 300, inkicon._parse_size( '300' ) )
+        with self.assertRaises( ValueError ):
+            inkicon._parse_size( '5X' )
+
+
+    #=========================================================================
+    def test_directory( self ):
+        """
+        Tests building every icon in a directory with the cache commands.
+        """
+        path  = os.path.join( self.path, 'icons' )
+        cache = os.path.join( self.path, 'cache' )
+        os.makedirs( os.path.join( path, 'more' ) )
+        for name in ( 'a.svg', 'b.txt', os.path.join( 'more', 'c.svg' ) ):
+            with open( os.path.join( path, name ), 'w' ) as handle:
+                handle.write( '<svg/>' )
+        self.assertEqual(
+            [
+                os.path.join( path, 'a.svg' ),
+                os.path.join( path, 'more', 'c.svg' ),
+                self.sources[ 0 ]
+            ],
+            inkicon._find_sources( [ path, self.sources[ 0 ] ] )
+        )
+        result, output = self.main( '-c', cache, '--stats', path )
+        self.assertEqual( 0, result )
+        self.assertEqual(
+            'Cache: 7 items, {} bytes, 0 hits, 14 misses\n'.format(
+                inkicon.BuildCache( cache ).stats()[ 'nbytes' ]
+            ),
+            output
+        )
+        self.assertTrue( os.path.isfile( os.path.join( path, 'a.ico' ) ) )
+        result, output = self.main( '-c', cache, '--stats', path )
+        self.assertTrue( output.startswith( 'Cache: 7 items' ) )
+        self.assertTrue( output.endswith( ' 2 hits, 0 misses\n' ) )
+        self.assertEqual( 12, len( self.log() ) )
+        result, output = self.main( '-c', cache, '--prune', '0' )
+        self.assertEqual( 'Pruned 7 cache items.\n', output )
+        with self.assertRaises( SystemExit ):
+            self.main( '--stats', path )
+
+
+    #=========================================================================
+    @unittest.skipIf( hzgfx.png.numpy is None, 'NumPy is not installed' )
+    def test_export_downscale( self ):
+        """
+        Tests rasterizing each icon once, and resampling smaller sizes.
+        """
+        pngs = inkicon.export_many(
+            self.sources[ : 2 ],
+            jobs      = 2,
+            downscale = True,
+            hinted    = ( 16, 20 )
+        )
+        self.assertEqual(
+            [
+                ( 'one.svg', 16 ), ( 'one.svg', 128 ),
+                ( 'two.svg', 16 ), ( 'two.svg', 128 )
+            ],
+            sorted( ( name, width ) for name, n, width in self.log() )
+        )
+        color = hzgfx.color.ColorAlpha.pack_many( [ 0x20, 0x40, 0x60, 0xFF ] )
+        for names in pngs:
+            for size, png in zip( inkicon.SIZES, names ):
+                colors = hzgfx.png.load( png )
+                self.assertEqual( ( size, size ), colors.shape )
+                self.assertTrue( ( colors == color ).all() )
+
+        # Both filters produce every size.
+        result = inkicon.main(
+            [ 'inkicon.py', '-d', '-f', 'box', self.sources[ 1 ] ]
+        )
+        self.assertEqual( 0, result )
+        self.assertEqual(
+            [ ( size, size ) for size in inkicon.SIZES ],
+            self.icon( 'two.ico' )
+        )
+        self.assertEqual( ( 'two.svg', 1, 128 ), self.log()[ -1 ] )
+
+        # Downscaled sizes are removed with the others after a failure.
+        inkicon._cleanup( png for names in pngs for png in names )
+        with self.assertRaises( RuntimeError ):
+            inkicon.export_set( self.sources[ 2 ], downscale = True )
+        self.assertEqual( [], self.files() )
+
+
+    #=========================================================================
+    def test_export_failure( self ):
+        """
+        Tests removing every PNG when an export fails.
+        """
+        with self.assertRaises( RuntimeError ):
+            inkicon.export_many( self.sources, jobs = 4 )
+        self.assertEqual( [], self.files() )
+
+        # No more processes are started after a failure.
+        with self.assertRaises( RuntimeError ):
+            inkicon.export_many( self.sources[ 2 : ] + self.sources, jobs = 1 )
+        self.assertEqual( [], self.files() )
+        self.assertEqual( ( 'bad.svg', 1, 128 ), self.log()[ -1 ] )
+
+        # Missing sources raise errors, and leave no PNGs behind.
+        with self.assertRaises( IOError ):
+            inkicon.export_many(
+                [ self.sources[ 0 ], os.path.join( self.path, 'none.svg' ) ],
+                jobs = 2
+            )
+        self.assertEqual( [], self.files() )
+
+        # No more processes are started after a missing source.
+        os.unlink( os.path.join( self.path, 'rasterizer.log' ) )
+        for jobs in ( 1, 2 ):
+            with self.assertRaises( IOError ):
+                inkicon.export_many(
+                    [ os.path.join( self.path, 'none.svg' ) ] + self.sources,
+                    jobs = jobs
+                )
+            self.assertFalse(
+                os.path.exists( os.path.join( self.path, 'rasterizer.log' ) )
+            )
+        self.assertEqual( [], self.files() )
+
+
+    #=========================================================================
+    def test_make_icos_pipe( self ):
+        """
+        Tests creating ICO files from images read through pipes.
+        """
+        result, output = self.main( '-p', '-j', '2', *self.sources[ : 2 ] )
+        self.assertEqual( 0, result )
+        self.assertEqual( [ 'pipe' ] * 12, self.log( True ) )
+        self.assertEqual(
+            [ ( size, size ) for size in inkicon.SIZES ],
+            self.icon( 'one.ico' )
+        )
+        self.assertEqual( [], self.files() )
+        images = inkicon.render_many( self.sources[ : 1 ], ( 16, ) )
+        self.assertEqual( [ 'file' ], self.log( True )[ 12 : ] )
+        self.assertEqual( ( 16, 16 ), hzgfx.png.size( images[ 0 ][ 0 ] ) )
+
+        # Failures, and programs that do not write images, write no icons.
+        os.unlink( os.path.join( self.path, 'one.ico' ) )
+        with self.assertRaises( RuntimeError ):
+            inkicon.make_icos( self.sources, pipe = True )
+        self.assertEqual( [ 'two.ico' ], self.files( '.ico' ) )
+        inkicon.INKSCAPE = self.stub( 'empty.py', 'pass' )
+        with self.assertRaises( RuntimeError ):
+            inkicon.make_ico( self.sources[ 0 ], pipe = True )
+        self.assertEqual( [ 'two.ico' ], self.files( '.ico' ) )
+
+
+    #=========================================================================
+    def test_make_icos( self ):
+        """
+        Tests creating several ICO files.
+        """
+        argv   = [ 'inkicon.py', '--jobs', '4' ] + self.sources[ : 2 ]
+        result = inkicon.main( argv )
+        self.assertEqual( 0, result )
+        self.assertEqual( [ 'one.ico', 'two.ico' ], self.files( '.ico' ) )
+        self.assertEqual( [], self.files() )
+        self.assertEqual(
+            [ ( size, size ) for size in inkicon.SIZES ],
+            self.icon( 'two.ico' )
+        )
+        ico = os.path.join( self.path, 'icon.ico' )
+        self.assertEqual( 0, inkicon.make_ico( self.sources[ 0 ], ico, 2 ) )
+        self.assertEqual( len( inkicon.SIZES ), len( self.icon( ico ) ) )
+        with self.assertRaises( RuntimeError ):
+            inkicon.make_icos( self.sources, jobs = 0 )
+        self.assertEqual( [], self.files() )
+
+        # The smallest PNG size can be chosen.
+        for png_width in ( '0', '48' ):
+            result, output = self.main(
+                '--png-width', png_width, self.sources[ 0 ]
+            )
+            self.assertEqual( 0, result )
+            self.assertEqual(
+                [ ( size, size ) for size in inkicon.SIZES ],
+                self.icon( 'one.ico', int( png_width ) )
+            )
+
+
+# Run tests when run directly from the shell.
+if __name__ == '__main__':
+    unittest.main()
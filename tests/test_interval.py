@@ -10,6 +10,10 @@ interval Module Unit Tests
 """
 
 
+import copy
+import decimal
+import fractions
+import pickle
 import unittest
 
 import hzgfx.interval
@@ -102,6 +106,17 @@ class Testinterval( unittest.TestCase ):
         self.assertEqual( 8.0, interval.stop )
         self.assertEqual( 1, interval.step )
 
+        # Non-integral real numbers create real intervals.
+        interval = hzgfx.interval.interval( 0, fractions.Fraction( 1, 2 ) )
+        self.assertIsInstance( interval, hzgfx.interval.RealInterval )
+        interval = hzgfx.interval.interval( 0, decimal.Decimal( '0.5' ) )
+        self.assertIsInstance( interval, hzgfx.interval.RealInterval )
+
+        # Complex numbers are not real (and can not be ordered).
+        self.assertFalse( hzgfx.interval._isreal( 4j ) )
+        with self.assertRaises( TypeError ):
+            hzgfx.interval.interval( 0, 4j )
+
 
 #=============================================================================
 class TestInterval( unittest.TestCase ):
@@ -288,6 +303,33 @@ class TestInterval( unittest.TestCase ):
         self.assertEqual( 2, len( interval ) )
 
 
+    #=========================================================================
+    def test_immutable( self ):
+        """
+        Tests interval immutability, equality, and hashing.
+        """
+        interval = hzgfx.interval.Interval( 0, 8, 2 )
+        with self.assertRaises( AttributeError ):
+            interval.stop = 10
+        with self.assertRaises( AttributeError ):
+            interval.extra = 1
+        with self.assertRaises( AttributeError ):
+            del interval.start
+        self.assertEqual( 8, interval.stop )
+        self.assertEqual( 4, len( interval ) )
+
+        same = hzgfx.interval.Interval( 0, 8, 2 )
+        self.assertEqual( interval, same )
+        self.assertEqual( hash( interval ), hash( same ) )
+        self.assertNotEqual( interval, hzgfx.interval.Interval( 0, 8 ) )
+        self.assertNotEqual( interval, hzgfx.interval.RealInterval( 0, 8, 2 ) )
+        self.assertEqual( interval, pickle.loads( pickle.dumps( interval ) ) )
+        self.assertEqual( interval, copy.deepcopy( interval ) )
+
+        with self.assertRaises( ValueError ):
+            hzgfx.interval.Interval( 0, 8, 0 )
+
+
     #=========================================================================
     def test_str( self ):
         """
@@ -326,6 +368,144 @@ class TestInterval( unittest.TestCase ):
             value = interval.getpos( 1.001 )
 
 
+    #=========================================================================
+    def test_slice( self ):
+        """
+        Tests slicing intervals into sub-intervals.
+        """
+        interval = hzgfx.interval.Interval( 0, 20, 2 )
+        sub = interval[ 2 : 6 ]
+        self.assertIsInstance( sub, hzgfx.interval.Interval )
+        self.assertEqual( '[4,12);2', str( sub ) )
+        self.assertListEqual( [ 4, 6, 8, 10 ], list( sub ) )
+        sub = interval[ 1 : : 2 ]
+        self.assertListEqual( [ 2, 6, 10, 14, 18 ], list( sub ) )
+        self.assertListEqual( [ 16, 18 ], list( interval[ -2 : ] ) )
+        self.assertEqual( 0, len( interval[ 5 : 5 ] ) )
+
+        # Slices always agree with indexing into the original interval.
+        for interval in (
+            hzgfx.interval.Interval( 0, 10, 3 ),
+            hzgfx.interval.Interval( 10, 0 ),
+            hzgfx.interval.RealInterval( -1.0, 1.0, 0.2 )
+        ):
+            values = [ interval[ i ] for i in range( len( interval ) ) ]
+            for positions in (
+                slice( None ),
+                slice( 1, None, 2 ),
+                slice( None, None, -1 ),
+                slice( 8, 2, -3 ),
+                slice( 3, 3 )
+            ):
+                sub      = interval[ positions ]
+                expected = values[ positions ]
+                self.assertEqual( len( expected ), len( sub ) )
+                for i, value in enumerate( expected ):
+                    self.assertAlmostEqual( value, sub[ i ] )
+                    self.assertIn( value, sub )
+
+                # Iteration and arrays produce the same values in order.
+                self.assertEqual( len( expected ), len( list( sub ) ) )
+                for value, actual in zip( expected, sub ):
+                    self.assertAlmostEqual( value, actual )
+                if hzgfx.interval.numpy is not None:
+                    for value, actual in zip( expected, sub.values() ):
+                        self.assertAlmostEqual( value, actual )
+
+        # Reversed slices contain their values, and nothing beyond them.
+        sub = hzgfx.interval.Interval( 0, 10, 3 )[ : : -1 ]
+        self.assertListEqual( [ 6, 3, 0 ], [ sub[ i ] for i in range( 3 ) ] )
+        self.assertListEqual( [ 6, 3, 0 ], list( sub ) )
+        self.assertIn( 0, sub )
+        self.assertNotIn( 9, sub )
+        self.assertNotIn( -3, sub )
+        self.assertEqual( 2, sub.getpos( 0 ) )
+        sub = hzgfx.interval.Interval( 0, 20, 2 )[ 8 : 1 : -3 ]
+        self.assertListEqual( [ 16, 10, 4 ], list( sub ) )
+        self.assertEqual( 3, len( sub ) )
+        self.assertListEqual( [ 10, 4 ], list( sub[ 1 : ] ) )
+        self.assertListEqual( [ 4, 10, 16 ], list( sub[ : : -1 ] ) )
+
+        # Real slices contain the exact values of the original interval.
+        interval = hzgfx.interval.RealInterval( 0.0, 1.0, 0.1 )
+        self.assertIn( interval[ 7 ], interval[ 2 : -3 ] )
+        for positions in (
+            slice( 2, -3 ),
+            slice( 1, None, 3 ),
+            slice( -2, 0, -1 ),
+            slice( None, None, -2 )
+        ):
+            sub = interval[ positions ]
+            for i in range( len( interval ) )[ positions ]:
+                self.assertIn( interval[ i ], sub )
+
+
+    #=========================================================================
+    @unittest.skipIf(
+        hzgfx.interval.numpy is None,
+        'NumPy is not installed'
+    )
+    def test_many( self ):
+        """
+        Tests the array methods.
+        """
+        numpy = hzgfx.interval.numpy
+
+        interval = hzgfx.interval.Interval( 0, 8, 2 )
+        values = interval.values()
+        self.assertEqual( 'i', values.dtype.kind )
+        self.assertListEqual( list( interval ), values.tolist() )
+        interval = hzgfx.interval.Interval( 10, 0 )
+        self.assertListEqual( list( interval ), interval.values().tolist() )
+        values = interval.values( 'f' )
+        self.assertEqual( numpy.float32, values.dtype )
+
+        interval = hzgfx.interval.Interval( 0, 10 )
+        values = numpy.array( [ -1, 0, 5, 9, 10, 11 ] )
+        self.assertListEqual(
+            [ False, True, True, True, False, False ],
+            interval.contains_many( values ).tolist()
+        )
+        self.assertListEqual(
+            [ v in interval for v in values.tolist() ],
+            interval.contains_many( values ).tolist()
+        )
+        with self.assertRaises( ValueError ):
+            interval.getpos_many( values )
+        self.assertListEqual(
+            [ -1, 0, 5, 9, -1, -1 ],
+            interval.getpos_many( values, missing = -1 ).tolist()
+        )
+
+        # Halfway values round like the built-in `round()` in both lookups.
+        interval = hzgfx.interval.Interval( 0, 10, 2 )
+        values = numpy.array( [ 1, 3, 5, 7 ] )
+        self.assertListEqual(
+            [ int( round( v / 2.0 ) ) for v in values.tolist() ],
+            interval.getpos_many( values ).tolist()
+        )
+        self.assertListEqual(
+            [ interval.getpos( v ) for v in values.tolist() ],
+            interval.getpos_many( values ).tolist()
+        )
+
+        interval = hzgfx.interval.RealInterval( -1.0, 1.0, 0.2 )
+        values = numpy.array( [ -1.0, -0.8, 0.79, 0.9, 1.0 ] )
+        self.assertTrue( interval.contains_many( values ).all() )
+        self.assertListEqual(
+            [ interval.getpos( v ) for v in values.tolist() ],
+            interval.getpos_many( values ).tolist()
+        )
+        out = numpy.zeros( ( 2, 3 ), dtype = bool )
+        values = numpy.array( [ [ -2.0, -1.0, 0.0 ], [ 1.0, 1.5, 0.5 ] ] )
+        result = interval.contains_many( values, out = out )
+        self.assertIs( out, result )
+        self.assertListEqual(
+            [ [ False, True, True ], [ True, False, True ] ],
+            out.tolist()
+        )
+
+
 #=============================================================================
 class TestRealInterval( unittest.TestCase ):
     """
@@ -417,6 +597,318 @@ class TestRealInterval( unittest.TestCase ):
         interval = hzgfx.interval.RealInterval( 0.2, 0.7, 0.2 )
         self.assertEqual( 3, len( interval ) )
 
+        # Negative intervals
+        interval = hzgfx.interval.RealInterval( 10, 0 )
+        self.assertEqual( 11, len( interval ) )
+        interval = hzgfx.interval.RealInterval( 5.0, -5.0, 0.5 )
+        self.assertEqual( 21, len( interval ) )
+        self.assertEqual( 5.0, list( interval )[ 0 ] )
+        self.assertEqual( -5.0, list( interval )[ -1 ] )
+
+
+    #=========================================================================
+    def test_exact( self ):
+        """
+        Tests exact arithmetic mode.
+        """
+        Fraction = fractions.Fraction
+
+        interval = hzgfx.interval.RealInterval( 0.0, 0.6, 0.2, exact = True )
+        self.assertTrue( interval.exact )
+        self.assertEqual( Fraction( 1, 5 ), interval.step )
+        self.assertEqual( 4, len( interval ) )
+        self.assertListEqual(
+            [ Fraction( 0 ), Fraction( 1, 5 ), Fraction( 2, 5 ) ],
+            list( interval )[ : 3 ]
+        )
+        self.assertIn( 0.6, interval )
+        self.assertEqual( 3, interval.getpos( 0.6 ) )
+        self.assertNotEqual(
+            interval,
+            hzgfx.interval.RealInterval( 0.0, 0.6, 0.2 )
+        )
+        self.assertEqual( interval, pickle.loads( pickle.dumps( interval ) ) )
+        self.assertTrue( interval[ 1 : ].exact )
+
+        # Long intervals have exact lengths and endpoints.
+        interval = hzgfx.interval.interval( 0.0, 100000.0, 0.1, exact = True )
+        self.assertIsInstance( interval, hzgfx.interval.RealInterval )
+        self.assertEqual( 1000001, len( interval ) )
+        self.assertEqual( 100000, interval[ -1 ] )
+
+        # Other representations
+        interval = hzgfx.interval.RealInterval( '1/3', 2, '1/3', exact = True )
+        self.assertEqual( 6, len( interval ) )
+        interval = hzgfx.interval.interval(
+            decimal.Decimal( '0.5' ),
+            exact = True
+        )
+        self.assertEqual( Fraction( 1, 2 ), interval.stop )
+
+
+    #=========================================================================
+    @unittest.skipIf(
+        hzgfx.interval.numpy is None,
+        'NumPy is not installed'
+    )
+    def test_exact_values( self ):
+        """
+        Tests producing correctly-rounded values from exact intervals.
+        """
+        numpy = hzgfx.interval.numpy
+        interval = hzgfx.interval.RealInterval( 0, 1000, 0.1, exact = True )
+        values = interval.values()
+        self.assertEqual( numpy.float64, values.dtype )
+        self.assertEqual( 10001, len( values ) )
+        self.assertListEqual(
+            [ i / 10.0 for i in range( 10001 ) ],
+            values.tolist()
+        )
+        interval = hzgfx.interval.RealInterval( 1.0, -1.0, 0.5, exact = True )
+        self.assertListEqual(
+            [ 1.0, 0.5, 0.0, -0.5, -1.0 ],
+            interval.values().tolist()
+        )
+        values = numpy.array( [ -1.0, 0.26, 1.0, 1.1 ] )
+        self.assertListEqual(
+            [ True, True, True, False ],
+            interval.contains_many( values ).tolist()
+        )
+
+
+#=============================================================================
+class TestIntervalSet( unittest.TestCase ):
+    """
+    Tests the IntervalSet class.
+    """
+
+
+    #=========================================================================
+    def test_init( self ):
+        """
+        Tests coalescing ranges.
+        """
+        iset = hzgfx.interval.IntervalSet(
+            [ ( 5, 8 ), ( 0, 2 ), ( 1, 3 ), ( 8, 10 ), ( 4, 4 ) ]
+        )
+        self.assertListEqual( [ ( 0, 3 ), ( 5, 10 ) ], list( iset ) )
+        self.assertEqual( 2, len( iset ) )
+        self.assertEqual( '[0,3) [5,10)', str( iset ) )
+        iset = hzgfx.interval.IntervalSet( [
+            hzgfx.interval.Interval( 10, 0 ),
+            hzgfx.interval.Interval( 12, 15 )
+        ] )
+        self.assertListEqual( [ ( 1, 11 ), ( 12, 15 ) ], list( iset ) )
+        self.assertEqual( '{}', str( hzgfx.interval.IntervalSet() ) )
+
+
+    #=========================================================================
+    def test_init_interval( self ):
+        """
+        Tests converting intervals into ranges.
+        """
+
+        # Every value of a descending interval is in the set.
+        interval = hzgfx.interval.Interval( 10, 0, -2 )
+        iset = hzgfx.interval.IntervalSet( [ interval ] )
+        self.assertListEqual( [ ( 2, 12 ) ], list( iset ) )
+        for value in interval:
+            self.assertIn( value, iset )
+        self.assertIn( 10, iset )
+        self.assertNotIn( 0, iset )
+        self.assertListEqual(
+            [ ( 0, 9 ) ],
+            list( hzgfx.interval.IntervalSet(
+                [ hzgfx.interval.Interval( 0, 10, 3 ) ]
+            ) )
+        )
+
+        # Closed intervals can not be represented.
+        real = hzgfx.interval.RealInterval( 0.0, 1.0 )
+        self.assertIn( 1.0, real )
+        with self.assertRaises( ValueError ):
+            hzgfx.interval.IntervalSet( [ real ] )
+        with self.assertRaises( ValueError ):
+            hzgfx.interval.IntervalSet().add( real )
+
+
+    #=========================================================================
+    def test_contains( self ):
+        """
+        Tests membership and range lookups.
+        """
+        iset = hzgfx.interval.IntervalSet( [ ( 0, 3 ), ( 5, 10 ) ] )
+        self.assertIn( 0, iset )
+        self.assertIn( 2.5, iset )
+        self.assertNotIn( 3, iset )
+        self.assertNotIn( 4, iset )
+        self.assertIn( 5, iset )
+        self.assertNotIn( 10, iset )
+        self.assertNotIn( -1, iset )
+        self.assertEqual( ( 5, 10 ), iset.find( 7 ) )
+        self.assertIsNone( iset.find( 4 ) )
+        self.assertTrue( iset.overlaps( ( 2, 4 ) ) )
+        self.assertTrue( iset.overlaps( ( 4, 6 ) ) )
+        self.assertFalse( iset.overlaps( ( 3, 5 ) ) )
+        self.assertFalse( iset.overlaps( ( 6, 6 ) ) )
+
+
+    #=========================================================================
+    def test_algebra( self ):
+        """
+        Tests set algebra and modification.
+        """
+        IntervalSet = hzgfx.interval.IntervalSet
+        a = IntervalSet( [ ( 0, 10 ), ( 20, 30 ) ] )
+        b = IntervalSet( [ ( 5, 25 ) ] )
+        self.assertListEqual( [ ( 0, 30 ) ], list( a | b ) )
+        self.assertListEqual( [ ( 5, 10 ), ( 20, 25 ) ], list( a & b ) )
+        self.assertListEqual( [ ( 0, 5 ), ( 25, 30 ) ], list( a - b ) )
+        self.assertListEqual( [ ( 10, 20 ) ], list( b - a ) )
+        self.assertEqual(
+            IntervalSet( [ ( 0, 5 ) ] ),
+            a.difference( b, [ ( 20, 40 ) ] )
+        )
+        self.assertEqual( a, a.union( [ ( 2, 3 ) ] ) )
+        self.assertNotEqual( a, b )
+
+        a.add( ( 10, 20 ) )
+        self.assertListEqual( [ ( 0, 30 ) ], list( a ) )
+        a.discard( ( 5, 6 ) )
+        a.discard( ( 25, 40 ) )
+        self.assertListEqual( [ ( 0, 5 ), ( 6, 25 ) ], list( a ) )
+        a.add( ( 40, 50 ) )
+        a.discard( ( 0, 5 ) )
+        self.assertListEqual( [ ( 6, 25 ), ( 40, 50 ) ], list( a ) )
+
+
+    #=========================================================================
+    @unittest.skipIf(
+        hzgfx.interval.numpy is None,
+        'NumPy is not installed'
+    )
+    def test_contains_many( self ):
+        """
+        Tests membership of arrays of values.
+        """
+        iset = hzgfx.interval.IntervalSet( [ ( 0, 3 ), ( 5, 10 ) ] )
+        values = [ -1, 0, 2.5, 3, 4, 5, 9.9, 10 ]
+        self.assertListEqual(
+            [ v in iset for v in values ],
+            iset.contains_many( values ).tolist()
+        )
+
+
+#=============================================================================
+class TestIntervalTree( unittest.TestCase ):
+    """
+    Tests the IntervalTree class.
+    """
+
+
+    #=========================================================================
+    def test_at( self ):
+        """
+        Tests finding intervals containing a value.
+        """
+        Interval = hzgfx.interval.Interval
+        RealInterval = hzgfx.interval.RealInterval
+        intervals = [
+            Interval( 0, 10 ),
+            Interval( 5, 15 ),
+            RealInterval( 10.0, 20.0 ),
+            Interval( 30, 25 ),
+            Interval( 7, 7 )
+        ]
+        tree = hzgfx.interval.IntervalTree( intervals )
+        self.assertEqual( 5, len( tree ) )
+        cases = [ -1, 0, 5, 7, 9.5, 10, 15, 20, 20.5, 25, 26, 30 ]
+        for value in cases:
+            self.assertListEqual(
+                sorted( [ i for i in intervals if value in i ], key = id ),
+                sorted( tree.at( value ), key = id ),
+                msg = str( value )
+            )
+
+        tree.remove( intervals[ 0 ] )
+        self.assertListEqual( [ intervals[ 1 ] ], tree.at( 5 ) )
+        tree.add( intervals[ 0 ] )
+        self.assertEqual( 2, len( tree.at( 5 ) ) )
+        self.assertListEqual( [], hzgfx.interval.IntervalTree().at( 0 ) )
+
+
+    #=========================================================================
+    def test_overlap( self ):
+        """
+        Tests finding intervals overlapping a range.
+        """
+        Interval = hzgfx.interval.Interval
+        RealInterval = hzgfx.interval.RealInterval
+        intervals = [
+            Interval( 0, 10 ),
+            Interval( 5, 15 ),
+            RealInterval( 10.0, 20.0 ),
+            Interval( 30, 25 )
+        ]
+        tree = hzgfx.interval.IntervalTree( intervals )
+        cases = [
+            ( ( 10, 12 ), [ 1, 2 ] ),
+            ( ( 20, 25 ), [ 2 ] ),
+            ( ( 21, 25 ), [] ),
+            ( ( 21, 26 ), [ 3 ] ),
+            ( ( -5, 0 ), [] ),
+            ( ( -5, 100 ), [ 0, 1, 2, 3 ] ),
+            ( ( 12, 12 ), [] ),
+            ( Interval( 25, 20 ), [] ),
+            ( Interval( 26, 20 ), [ 3 ] ),
+            ( RealInterval( 30.0, 40.0 ), [ 3 ] )
+        ]
+        for query, expected in cases:
+            self.assertListEqual(
+                expected,
+                sorted( intervals.index( i ) for i in tree.overlap( query ) ),
+                msg = str( query )
+            )
+
+
+    #=========================================================================
+    def test_updates( self ):
+        """
+        Tests queries between adding and removing intervals.
+        """
+        Interval  = hzgfx.interval.Interval
+        intervals = [ Interval( i, i + 8 ) for i in range( 0, 200, 4 ) ]
+        tree      = hzgfx.interval.IntervalTree( intervals )
+        for step in range( 100 ):
+
+            # Alternate adding and removing intervals with queries.
+            if step % 3 == 0:
+                itvl = intervals.pop( ( step * 7 ) % len( intervals ) )
+                tree.remove( itvl )
+            else:
+                itvl = Interval( step * 2, step * 2 + ( step % 5 ) + 1 )
+                intervals.append( itvl )
+                tree.add( itvl )
+            value = ( step * 13 ) % 200
+            self.assertListEqual(
+                sorted( [ i for i in intervals if value in i ], key = id ),
+                sorted( tree.at( value ), key = id ),
+                msg = str( step )
+            )
+            expected = [
+                id( i ) for i in intervals
+                if ( i.start < value + 3 ) and ( value < i.stop )
+            ]
+            actual = tree.overlap( ( value, value + 3 ) )
+            self.assertListEqual(
+                sorted( expected ),
+                sorted( id( i ) for i in actual ),
+                msg = str( step )
+            )
+        self.assertEqual( len( intervals ), len( tree ) )
+        with self.assertRaises( ValueError ):
+            tree.remove( Interval( -5, -1 ) )
+
 
 # Run tests when run directly from the shell.
 if __name__ == '__main__':
@@ -0,0 +1,199 @@
+#=============================================================================
+#
+# png Module Unit Tests
+#
+#=============================================================================
+
+"""
+png Module Unit Tests
+=====================
+"""
+
+
+import struct
+import unittest
+import zlib
+
+import hzgfx.color
+import hzgfx.png
+
+
+#=============================================================================
+def chunk( kind, payload ):
+    """
+    Builds a PNG chunk.
+    """
+    return struct.pack( '>I', len( payload ) ) + kind + payload \
+         + struct.pack( '>I', zlib.crc32( kind + payload ) & 0xFFFFFFFF )
+
+
+#=============================================================================
+def build( width, height, depth, ctype, rows, filters = None, extra = () ):
+    """
+    Builds a PNG file from rows of unfiltered bytes (using the given filter
+    type for each row).
+    """
+    bpp = max( 1, { 0 : 1, 2 : 3, 3 : 1, 4 : 2, 6 : 4 }[ ctype ] * depth // 8 )
+    if filters is None:
+        filters = [ 0 ] * len( rows )
+    data  = bytearray()
+    prior = bytearray( len( rows[ 0 ] ) )
+    for kind, row in zip( filters, rows ):
+        row = bytearray( row )
+        data.append( kind )
+        for offset, value in enumerate( row ):
+            a = row[ offset - bpp ] if offset >= bpp else 0
+            b = prior[ offset ]
+            c = prior[ offset - bpp ] if offset >= bpp else 0
+            if kind == 1:
+                value -= a
+            elif kind == 2:
+                value -= b
+            elif kind == 3:
+                value -= ( a + b ) >> 1
+            elif kind == 4:
+                p = a + b - c
+                if ( abs( p - a ) <= abs( p - b ) ) \
+                and ( abs( p - a ) <= abs( p - c ) ):
+                    value -= a
+                elif abs( p - b ) <= abs( p - c ):
+                    value -= b
+                else:
+                    value -= c
+            data.append( value & 0xFF )
+        prior = row
+    header = struct.pack( '>IIBBBBB', width, height, depth, ctype, 0, 0, 0 )
+    return hzgfx.png.SIGNATURE + chunk( b'IHDR', header ) \
+         + b''.join( chunk( kind, payload ) for kind, payload in extra ) \
+         + chunk( b'IDAT', zlib.compress( bytes( data ) ) ) \
+         + chunk( b'IEND', b'' )
+
+
+#=============================================================================
+@unittest.skipIf( hzgfx.png.numpy is None, 'NumPy is not installed' )
+class TestPNG( unittest.TestCase ):
+    """
+    Tests the png module.
+    """
+
+
+    #=========================================================================
+    def rgba( self, colors ):
+        """
+        Unpacks colors into nested lists of RGBA channels.
+        """
+        return hzgfx.color.ColorAlpha.unpack_many( colors ).tolist()
+
+
+    #=========================================================================
+    def test_round_trip( self ):
+        """
+        Tests encoding and decoding images.
+        """
+        numpy = hzgfx.png.numpy
+        rng   = numpy.random.RandomState( 7 )
+        rgba  = rng.randint( 0, 256, ( 9, 13, 4 ) ).astype( numpy.uint8 )
+        rgba[ : 3 ] = rgba[ 0 ]
+        colors = hzgfx.color.ColorAlpha.pack_many( rgba )
+        data   = hzgfx.png.encode( colors )
+        self.assertEqual( ( 13, 9 ), hzgfx.png.size( data ) )
+        self.assertTrue( ( colors == hzgfx.png.decode( data ) ).all() )
+        order  = hzgfx.color.ColorAlpha.ORDER_RGBA
+        colors = hzgfx.color.ColorAlpha.pack_many( rgba, order )
+        data   = hzgfx.png.encode( colors, order )
+        self.assertTrue( ( colors == hzgfx.png.decode( data, order ) ).all() )
+        with self.assertRaises( ValueError ):
+            hzgfx.png.encode( colors[ 0 ] )
+
+
+    #=========================================================================
+    def test_filters( self ):
+        """
+        Tests reversing every filter type.
+        """
+        numpy = hzgfx.png.numpy
+        rng   = numpy.random.RandomState( 11 )
+        rgba  = rng.randint( 0, 256, ( 10, 6, 4 ) ).astype( numpy.uint8 )
+        rows  = [ row.tobytes() for row in rgba.reshape( ( 10, 24 ) ) ]
+        data  = build( 6, 10, 8, 6, rows, [ 0, 1, 2, 3, 4, 4, 3, 2, 1, 0 ] )
+        actual = self.rgba( hzgfx.png.decode( data ) )
+        self.assertListEqual( rgba.tolist(), actual )
+        rgb  = rgba[ ..., : 3 ]
+        rows = [ row.tobytes() for row in rgb.reshape( ( 10, 18 ) ) ]
+        data = build( 6, 10, 8, 2, rows, [ 4, 3, 1, 4, 2, 3, 0, 4, 1, 3 ] )
+        actual = numpy.array( self.rgba( hzgfx.png.decode( data ) ) )
+        self.assertListEqual( rgb.tolist(), actual[ ..., : 3 ].tolist() )
+        self.assertTrue( ( actual[ ..., 3 ] == 255 ).all() )
+
+
+    #=========================================================================
+    def test_color_types( self ):
+        """
+        Tests decoding grayscale, palette, and 16-bit images.
+        """
+
+        # 2-bit grayscale with a transparent level
+        data = build(
+            5, 1, 2, 0, [ b'\x1b\x40' ],
+            extra = [ ( b'tRNS', b'\x00\x02' ) ]
+        )
+        self.assertListEqual(
+            [ [
+                [ 0, 0, 0, 255 ],
+                [ 85, 85, 85, 255 ],
+                [ 170, 170, 170, 0 ],
+                [ 255, 255, 255, 255 ],
+                [ 85, 85, 85, 255 ]
+            ] ],
+            self.rgba( hzgfx.png.decode( data ) )
+        )
+
+        # 1-bit palette with partial transparency
+        data = build(
+            3, 2, 1, 3, [ b'\xa0', b'\x40' ],
+            extra = [
+                ( b'PLTE', b'\x10\x20\x30\xf0\xe0\xd0' ),
+                ( b'tRNS', b'\x80' )
+            ]
+        )
+        self.assertListEqual(
+            [
+                [ [ 240, 224, 208, 255 ], [ 16, 32, 48, 128 ],
+                  [ 240, 224, 208, 255 ] ],
+                [ [ 16, 32, 48, 128 ], [ 240, 224, 208, 255 ],
+                  [ 16, 32, 48, 128 ] ]
+            ],
+            self.rgba( hzgfx.png.decode( data ) )
+        )
+
+        # 16-bit gray and alpha
+        row  = b'\x12\x34\xff\xff\xab\xcd\x80\x00'
+        data = build( 2, 1, 16, 4, [ row ], [ 4 ] )
+        self.assertListEqual(
+            [ [ [ 18, 18, 18, 255 ], [ 171, 171, 171, 128 ] ] ],
+            self.rgba( hzgfx.png.decode( data ) )
+        )
+
+
+    #=========================================================================
+    def test_errors( self ):
+        """
+        Tests rejecting invalid images.
+        """
+        row  = b'\x01\x02\x03\x04'
+        data = build( 1, 1, 8, 6, [ row ] )
+        with self.assertRaises( ValueError ):
+            hzgfx.png.decode( data[ 1 : ] )
+        with self.assertRaises( ValueError ):
+            hzgfx.png.decode( data[ : 40 ] + b'\x00' + data[ 41 : ] )
+        with self.assertRaises( ValueError ):
+            hzgfx.png.decode( build( 1, 1, 8, 6, [ row ], [ 5 ] ) )
+        with self.assertRaises( ValueError ):
+            hzgfx.png.decode( build( 1, 1, 4, 2, [ b'\x00\x00' ] ) )
+        with self.assertRaises( ValueError ):
+            hzgfx.png.decode( build( 1, 1, 8, 3, [ b'\x00' ] ) )
+
+
+# Run tests when run directly from the shell.
+if __name__ == '__main__':
+    unittest.main()